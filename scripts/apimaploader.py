@@ -0,0 +1,142 @@
+#!/usr/bin/env python3 -i
+#
+# Copyright 2013-2026 The Khronos Group Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Compact binary form of the API maps in the generated apimap.py.
+
+PyOutputGenerator writes apimap.bin alongside apimap.py. Importing
+apimap.py requires compiling its very large dictionary literals, unless
+cached bytecode is available; apimap.bin instead stores each map as a
+separately marshalled blob, which is only decoded when a tool first uses
+that map.
+
+loadApiMap() returns an object with the same attributes as the apimap
+module (typeCategory, alias, nonexistent, requiredBy, and so on), and
+falls back to importing apimap.py if apimap.bin is missing, was written in
+an unsupported format, or was not written together with the apimap.py
+next to it. The header of apimap.bin records a hash of that apimap.py for
+this check.
+
+genRef.py, makemanaliases.py and generators given a genpath load the maps
+this way. Other tools do not use apimap.py: the Antora build reads
+apimap.cjs, and add_validusage_pages.py only uses the xrefMap and pageMap
+modules."""
+
+import hashlib
+import marshal
+import os
+import struct
+import sys
+
+apiMapFile = 'apimap.bin'
+"""Name of the binary file, in the same directory as apimap.py"""
+
+apiMapModuleFile = 'apimap.py'
+"""Name of the Python module the binary file is written alongside"""
+
+apiMapMagic = b'VKAPIMAP'
+apiMapVersion = 2
+
+# Magic, format version, length of the marshalled index, and SHA-256 of
+# the apimap.py written with the file
+headerFormat = struct.Struct('<8sII32s')
+
+# marshal format version used to write the maps
+marshalVersion = 4
+
+
+def encodeApiMap(maps, module):
+    """Return the contents of apimap.bin for a dictionary of maps, keyed
+    by attribute name.
+
+    - maps - dictionary of maps
+    - module - contents of the apimap.py written with the maps, as bytes
+
+    The file is a header, then a marshalled index of (offset, length) for
+    each map relative to the end of the index, then the marshalled maps."""
+    index = {}
+    blobs = []
+    offset = 0
+    for (name, value) in maps.items():
+        blob = marshal.dumps(value, marshalVersion)
+        index[name] = (offset, len(blob))
+        blobs.append(blob)
+        offset += len(blob)
+
+    indexBlob = marshal.dumps(index, marshalVersion)
+    header = headerFormat.pack(apiMapMagic, apiMapVersion, len(indexBlob),
+                               hashlib.sha256(module).digest())
+    return b''.join([header, indexBlob] + blobs)
+
+
+class ApiMap:
+    """API maps read from apimap.bin. Each map is decoded the first time
+    it is accessed as an attribute."""
+
+    def __init__(self, filename, module=None):
+        """Constructor
+
+        - filename - path of apimap.bin
+        - module - if not None, contents of the apimap.py the file must
+          have been written with, as bytes
+
+        Raises OSError if the file cannot be read, and ValueError if it is
+        not in a supported format or does not match module."""
+        with open(filename, 'rb') as fp:
+            data = fp.read()
+
+        if len(data) < headerFormat.size:
+            raise ValueError(f'{filename} is truncated')
+        (magic, version, indexLength, moduleDigest) = headerFormat.unpack_from(data)
+        if magic != apiMapMagic or version != apiMapVersion:
+            raise ValueError(f'{filename} is not a version {apiMapVersion} API map')
+        if module is not None and hashlib.sha256(module).digest() != moduleDigest:
+            raise ValueError(f'{filename} was not written with {apiMapModuleFile}')
+
+        start = headerFormat.size
+        try:
+            self._index = marshal.loads(data[start:start + indexLength])
+        except (EOFError, TypeError) as e:
+            raise ValueError(f'{filename} has a corrupt index') from e
+        self._data = memoryview(data)[start + indexLength:]
+
+    def __getattr__(self, name):
+        # Only called for maps which have not been decoded yet
+        if name.startswith('_') or name not in self._index:
+            raise AttributeError(name)
+        (offset, length) = self._index[name]
+        value = marshal.loads(self._data[offset:offset + length])
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self._index))
+
+
+def loadApiMap(genpath=None):
+    """Return the generated API maps, or None if they cannot be found.
+
+    - genpath - directory containing apimap.bin and apimap.py. If None,
+      apimap.py is imported from the module search path.
+
+    The apimap module is returned if apimap.bin cannot be used, or if
+    apimap.py has been regenerated since it was written."""
+    if genpath is not None:
+        try:
+            with open(os.path.join(genpath, apiMapModuleFile), 'rb') as fp:
+                module = fp.read()
+        except OSError:
+            module = None
+        try:
+            return ApiMap(os.path.join(genpath, apiMapFile), module)
+        except (OSError, ValueError):
+            pass
+        sys.path.insert(0, genpath)
+
+    try:
+        import apimap
+        return apimap
+    except ImportError:
+        return None
@@ -6,8 +6,17 @@
 
 import pickle
 import os
+import re
+import sys
+import hashlib
 import tempfile
 import copy
+import time
+import traceback
+import multiprocessing
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from vulkan_object import (VulkanObject, CapabilityAlias, StructCapabilityAlias, ExtensionCapabilityAlias,
     Extension, Version, Legacy, Handle, FuncPointerParam, FuncPointer, Param, CommandScope, Command,
     EnumField, Enum, Flag, Bitmask, ExternSync, Flags, ExtendedFlag, Member, Struct,
@@ -51,6 +60,12 @@ def externSyncGet(elem):
     value = elem.get('externsync')
     if value is None:
         return (ExternSync.NONE, None)
+    return _parseExternSync(value)
+
+# The same few externsync strings recur across the registry, so each is only parsed once.
+# This does not use spec_tools, which is not shipped with Vulkan-Headers.
+@lru_cache(maxsize=None)
+def _parseExternSync(value: str) -> tuple[ExternSync, (str | None)]:
     if value == 'true':
         return (ExternSync.ALWAYS, None)
     if value == 'maybe':
@@ -70,11 +85,36 @@ def externSyncGet(elem):
         return (ExternSync.SUBTYPE_MAYBE, value.removeprefix('maybe:'))
     return (ExternSync.SUBTYPE, value)
 
+# Pickled VideoStd for each video.xml content hash and enabled APIs, see BaseGenerator.loadVideoStd()
+_videoStdCache: dict[str, bytes] = dict()
+
+# Hash of the code defining and parsing VideoStd, set by _videoStdCodeHash()
+_videoStdCodeDigest: (str | None) = None
+
+# A pickle written by a different version of the VideoStd dataclasses or of the parser may not
+# load, or may load into the wrong fields, so the code is part of the on-disk cache key
+def _videoStdCodeHash() -> str:
+    global _videoStdCodeDigest
+    if _videoStdCodeDigest is None:
+        digest = hashlib.sha256()
+        for module in (VideoStd.__module__, Registry.__module__, __name__):
+            with open(sys.modules[module].__file__, 'rb') as sourceFile:
+                digest.update(sourceFile.read())
+        _videoStdCodeDigest = digest.hexdigest()[:16]
+    return _videoStdCodeDigest
+
 # Shared object used by Sync elements that do not have ones
 maxSyncSupport = SyncSupport(None, None, True)
 maxSyncEquivalent = SyncEquivalent(None, None, True)
 
 # Helpers to set GeneratorOptions options globally
+# These only provide the defaults for BaseGeneratorOptions, everything after that reads
+# the per-run values from the options, so several generators can run in the same process
+globalFileName = None
+globalDirectory = None
+globalApiName = None
+mergedApiNames = None
+
 def SetOutputFileName(fileName: str) -> None:
     global globalFileName
     globalFileName = fileName
@@ -143,7 +183,8 @@ class BaseGeneratorOptions(GeneratorOptions):
                  customFileName = None,
                  customDirectory = None,
                  customApiName = None,
-                 videoXmlPath = None):
+                 videoXmlPath = None,
+                 videoStdCacheDirectory = None):
         apiName = customApiName if customApiName else globalApiName
         GeneratorOptions.__init__(self,
                 conventions = getConventionsForApi(apiName),
@@ -163,6 +204,118 @@ class BaseGeneratorOptions(GeneratorOptions):
 
         # This is used to provide the video.xml to the private video XML generator
         self.videoXmlPath = videoXmlPath
+        # If set, the VideoStd parsed from video.xml is also cached on disk here so other runs can reuse it
+        self.videoStdCacheDirectory = videoStdCacheDirectory
+
+        # Pickle the VulkanObject to the temp directory after generating
+        self.cachingEnabled = cachingEnabled
+
+# Which types each struct member and command param uses, so post processing passes
+# can find what they need without going through every struct and command again
+@dataclass
+class TypeUsageGraph:
+    # struct/command name -> type names of its members/params
+    uses: dict[str, set[str]]
+    # type name -> struct/command names that use it
+    usedBy: dict[str, set[str]]
+
+    @staticmethod
+    def build(vk: VulkanObject) -> 'TypeUsageGraph':
+        uses = dict()
+        usedBy = dict()
+        for name, members in [(x.name, x.members) for x in vk.structs.values()] + [(x.name, x.params) for x in vk.commands.values()]:
+            types = {x.type for x in members}
+            uses[name] = types
+            for typeName in types:
+                usedBy.setdefault(typeName, set()).add(name)
+        return TypeUsageGraph(uses, usedBy)
+
+# Keeps the requirement information BaseGenerator needs at endFile()
+#
+# Every <feature>/<extension> gets an integer ID the first time it is seen, which keeps the per-item
+# bookkeeping to a single dict per item name instead of one entry per (extension, item) pair.
+# It also keeps track of what has been added to the VulkanObject lists so making each list unique
+# does not need to compare every dataclass already in it, and indexes enum fields/flags by name so
+# each extension does not have to scan all of VkStructureType.
+class _RequirementEngine:
+    def __init__(self):
+        self.featureIds: dict[str, int] = dict()
+        self.featureNames: list[str] = []
+
+        # item name -> {feature ID : require section depends} for every feature whose
+        # require sections name the item directly (not via alias), in the order they were seen
+        self.itemFeatures: dict[str, dict[int, str | None]] = dict()
+
+        # id(alias map) -> {alias : canonical name}
+        self.dealiasCache: dict[int, dict[str, str]] = dict()
+        # id(list) -> (list, keys of the items already in the list)
+        self.uniqueCache: dict[int, tuple[list, set]] = dict()
+        # id(list) -> (list, {name : (position, item)}) for EnumField/Flag lists
+        # Both hold a reference to the list so its id cannot be reused, and are only valid while
+        # nothing else modifies the lists, so they are cleared by clearListCaches() after each pass
+        self.nameIndexCache: dict[int, tuple[list, dict]] = dict()
+
+    def featureId(self, featureName: str) -> int:
+        featureId = self.featureIds.get(featureName)
+        if featureId is None:
+            featureId = len(self.featureNames)
+            self.featureIds[featureName] = featureId
+            self.featureNames.append(featureName)
+        return featureId
+
+    def addRequire(self, featureName: str, itemName: str, depends: (str | None)) -> None:
+        features = self.itemFeatures.setdefault(itemName, dict())
+        featureId = self.featureId(featureName)
+        # The last require section with a depends wins
+        if featureId not in features or depends:
+            features[featureId] = depends
+
+    # Maps each feature that defines itemName to the depends of its require section
+    def definingRequirements(self, itemName: str, sort: bool = True) -> dict[str, str | None]:
+        features = self.itemFeatures.get(itemName)
+        if not features:
+            return {}
+        requirements = [(self.featureNames[x], depends) for x, depends in features.items()]
+        if sort and len(requirements) > 1:
+            requirements.sort(key = lambda x: x[0])
+        return dict(requirements)
+
+    # Same as BaseGenerator.dealias(), but remembers the answer
+    def dealias(self, name: str, aliasMap: dict) -> str:
+        cache = self.dealiasCache.setdefault(id(aliasMap), dict())
+        canonical = cache.get(name)
+        if canonical is None:
+            canonical = name
+            while canonical in aliasMap:
+                canonical = aliasMap[canonical]
+            cache[name] = canonical
+        return canonical
+
+    # Returns the items of the list with one of the names, in list order
+    def itemsNamed(self, items: list, names) -> list:
+        cached = self.nameIndexCache.get(id(items))
+        if cached is None:
+            cached = (items, {x.name : (i, x) for i, x in enumerate(items)})
+            self.nameIndexCache[id(items)] = cached
+        index = cached[1]
+        return [x[1] for x in sorted((index[x] for x in names if x in index), key = lambda x: x[0])]
+
+    # Appends the item if it is not already in the list
+    # Strings are compared by value, VulkanObject dataclasses by identity (each one is only created once)
+    def addUnique(self, items: list, item) -> None:
+        cached = self.uniqueCache.get(id(items))
+        if cached is None:
+            cached = (items, {x if isinstance(x, str) else id(x) for x in items})
+            self.uniqueCache[id(items)] = cached
+        seen = cached[1]
+        key = item if isinstance(item, str) else id(item)
+        if key not in seen:
+            seen.add(key)
+            items.append(item)
+
+    def clearListCaches(self) -> None:
+        self.uniqueCache.clear()
+        self.nameIndexCache.clear()
 
 #
 # This object handles all the parsing from reg.py generator scripts in the Vulkan-Headers
@@ -197,13 +350,25 @@ class BaseGenerator(OutputGenerator):
         self.enumFieldMap: dict[str, EnumField] = dict()
         self.flagMap: dict[str, Flag] = dict()
 
-        # Track (extension_name, item_name) -> require_section_depends for building extensionRequirement
-        # This maps (ext, type/command/enum name) pairs to their require section's depends string
-        self.itemRequireSectionDepends: dict[tuple[str, str], str] = dict()
-
-        # Track item_name -> list of extensions that DIRECTLY reference this exact name
-        # (not via alias). Used for building extensionRequirement accurately.
-        self.itemDefiningExtensions: dict[str, list[str]] = dict()
+        # Precomputed requirement data filled while visiting each feature and used in endFile()
+        self.requirements = _RequirementEngine()
+
+        # Post processing done at endFile() once everything is collected, in order
+        # Each pass is timed into postProcessTimes, and postProcessTimingHook(name, seconds) is called if set
+        self.postProcessPasses = [
+            ('extensionDependency', self.applyExtensionDependency),
+            # Build full extensionRequirement for all types after extensions list is populated
+            ('extensionRequirements', self.buildFullExtensionRequirements),
+            ('constants', self.addConstantsPass),
+            ('videoCodecs', self.addVideoCodecs),
+            ('headerVersion', self.headerVersionPass),
+            ('returnedOnly', self.returnedOnlyPass),
+            ('handleParents', self.handleParentsPass),
+            ('maxSync', self.maxSyncPass),
+        ]
+        self.postProcessTimes: dict[str, float] = dict()
+        self.postProcessTimingHook = None
+        self.typeUsageGraph: (TypeUsageGraph | None) = None
 
     # De-aliases a definition name based on the specified alias map.
     # There are aliases of aliases.
@@ -225,6 +390,7 @@ class BaseGenerator(OutputGenerator):
     def beginFile(self, genOpts):
         OutputGenerator.beginFile(self, genOpts)
         self.filename = genOpts.filename
+        self.targetApiName = genOpts.apiname
 
         # No gen*() command to get these, so do it manually
         for platform in self.registry.tree.findall('platforms/platform'):
@@ -237,11 +403,45 @@ class BaseGenerator(OutputGenerator):
         # If the video.xml path is provided then we need to load and parse it using
         # the private video std generator
         if genOpts.videoXmlPath is not None:
+            self.vk.videoStd = self.loadVideoStd(genOpts)
+
+    # video.xml rarely changes, so the VideoStd parsed from it is cached independently of vk.xml
+    # The key is the content hash of video.xml, a hash of the code defining and parsing VideoStd, and
+    # which of the APIs it supports are enabled, so the same cache is used by every API target that
+    # ends up with the same Video Std definitions.
+    # It is always cached in memory, and also in genOpts.videoStdCacheDirectory if set.
+    # The cache holds the pickled VideoStd so every VulkanObject gets its own copy.
+    def loadVideoStd(self, genOpts) -> VideoStd:
+        with open(genOpts.videoXmlPath, 'rb') as videoXmlFile:
+            videoXml = videoXmlFile.read()
+        supportedApis = {api for match in re.findall(rb'supported="([^"]*)"', videoXml) for api in match.decode().split(',')}
+        enabledApis = {genOpts.apiname} | (set() if genOpts.mergeApiNames is None else set(genOpts.mergeApiNames.split(',')))
+        cacheKey = f"{hashlib.sha256(videoXml).hexdigest()}_{_videoStdCodeHash()}_{'_'.join(sorted(supportedApis & enabledApis))}"
+
+        cachePath = None
+        if genOpts.videoStdCacheDirectory is not None:
+            cachePath = os.path.join(genOpts.videoStdCacheDirectory, f'vkvideostd_{cacheKey}.pickle')
+
+        if cacheKey not in _videoStdCache and cachePath is not None and os.path.isfile(cachePath):
+            with open(cachePath, 'rb') as cacheFile:
+                _videoStdCache[cacheKey] = cacheFile.read()
+
+        if cacheKey not in _videoStdCache:
             videoStdGenerator = _VideoStdGenerator()
             videoRegistry = Registry(videoStdGenerator, genOpts)
-            videoRegistry.loadElementTree(ElementTree.parse(genOpts.videoXmlPath))
+            videoRegistry.loadElementTree(ElementTree.ElementTree(ElementTree.fromstring(videoXml)))
             videoRegistry.apiGen()
-            self.vk.videoStd = videoStdGenerator.vk.videoStd
+            _videoStdCache[cacheKey] = pickle.dumps(videoStdGenerator.vk.videoStd)
+
+            if cachePath is not None:
+                # Write to a temporary file first so other processes never see a partial file
+                os.makedirs(genOpts.videoStdCacheDirectory, exist_ok = True)
+                (fd, tempPath) = tempfile.mkstemp(dir = genOpts.videoStdCacheDirectory)
+                with os.fdopen(fd, 'wb') as cacheFile:
+                    cacheFile.write(_videoStdCache[cacheKey])
+                os.replace(tempPath, cachePath)
+
+        return pickle.loads(_videoStdCache[cacheKey])
 
     # This function should be overloaded
     def generate(self):
@@ -257,9 +457,15 @@ class BaseGenerator(OutputGenerator):
     # self.featureDictionary is built for use in the reg.py framework
     # Details found in Vulkan-Docs/scripts/scriptgenerator.py
     def applyExtensionDependency(self):
+        engine = self.requirements
+        addUnique = engine.addUnique
+        enumFieldAliasMap = self.enumFieldAliasMap
+        flagAliasMap = self.flagAliasMap
+
         for extension in self.vk.extensions.values():
+            extName = extension.name
             # dict.key() can be None, so need to double loop
-            dict = self.featureDictionary[extension.name]['command']
+            dict = self.featureDictionary[extName]['command']
 
             # "required" == None
             #         or
@@ -278,11 +484,11 @@ class BaseGenerator(OutputGenerator):
 
                     command = self.vk.commands[commandName]
                     # Make sure list is unique
-                    command.extensions.extend([extension.name] if extension.name not in command.extensions else [])
-                    extension.commands.extend([command] if command not in extension.commands else [])
+                    addUnique(command.extensions, extName)
+                    addUnique(extension.commands, command)
 
             # While genGroup() will call twice with aliased value, it does not provide all the information we need
-            dict = self.featureDictionary[extension.name]['enumconstant']
+            dict = self.featureDictionary[extName]['enumconstant']
             for required in dict:
                 # group can be a Enum or Bitmask
                 for group in dict[required]:
@@ -291,46 +497,46 @@ class BaseGenerator(OutputGenerator):
                             extension.enumFields[group] = [] # Dict needs init
                         enum = self.vk.enums[group]
                         # Need to convert all alias so they match what is in EnumField
-                        enumList = list(map(lambda x: x if x not in self.enumFieldAliasMap else self.dealias(x, self.enumFieldAliasMap), dict[required][group]))
+                        enumNames = {engine.dealias(x, enumFieldAliasMap) for x in dict[required][group]}
 
-                        for enumField in [x for x in enum.fields if x.name in enumList]:
+                        for enumField in engine.itemsNamed(enum.fields, enumNames):
                             # Make sure list is unique
-                            enum.fieldExtensions.extend([extension.name] if extension.name not in enum.fieldExtensions else [])
-                            enumField.extensions.extend([extension.name] if extension.name not in enumField.extensions else [])
-                            extension.enumFields[group].extend([enumField] if enumField not in extension.enumFields[group] else [])
+                            addUnique(enum.fieldExtensions, extName)
+                            addUnique(enumField.extensions, extName)
+                            addUnique(extension.enumFields[group], enumField)
                     if group in self.vk.bitmasks:
                         if group not in extension.flagBits:
                             extension.flagBits[group] = [] # Dict needs init
                         bitmask = self.vk.bitmasks[group]
                         # Need to convert all alias so they match what is in Flags
-                        flagList = list(map(lambda x: x if x not in self.flagAliasMap else self.dealias(x, self.flagAliasMap), dict[required][group]))
+                        flagNames = {engine.dealias(x, flagAliasMap) for x in dict[required][group]}
 
-                        for flags in [x for x in bitmask.flags if x.name in flagList]:
+                        for flags in engine.itemsNamed(bitmask.flags, flagNames):
                             # Make sure list is unique
-                            bitmask.flagExtensions.extend([extension.name] if extension.name not in bitmask.flagExtensions else [])
-                            flags.extensions.extend([extension.name] if extension.name not in flags.extensions else [])
-                            extension.flagBits[group].extend([flags] if flags not in extension.flagBits[group] else [])
+                            addUnique(bitmask.flagExtensions, extName)
+                            addUnique(flags.extensions, extName)
+                            addUnique(extension.flagBits[group], flags)
 
-            dict = self.featureDictionary[extension.name]['bitmask']
+            dict = self.featureDictionary[extName]['bitmask']
             for required in dict:
                 for dep in dict[required]:
                     for group in dict[required][dep]:
                         if group in self.vk.flags:
                             flags = self.vk.flags[group]
                             # Make sure list is unique
-                            flags.extensions.extend([extension.name] if extension.name not in flags.extensions else [])
-                            extension.flags.extend([flags] if flags not in extension.flags else [])
+                            addUnique(flags.extensions, extName)
+                            addUnique(extension.flags, flags)
 
             # Because of union, things like VkTensorARM is both in the ARM extension and VK_EXT_descriptor_heap
-            dict = self.featureDictionary[extension.name]['handle']
+            dict = self.featureDictionary[extName]['handle']
             for required in dict:
                 for dep in dict[required]:
                     for group in dict[required][dep]:
                         if group in self.vk.handles:
                             handle = self.vk.handles[group]
                             # Make sure list is unique
-                            handle.extensions.extend([extension.name] if extension.name not in handle.extensions else [])
-                            extension.handles.extend([handle] if handle not in extension.handles else [])
+                            addUnique(handle.extensions, extName)
+                            addUnique(extension.handles, handle)
 
         # Need to do 'enum'/'bitmask' after 'enumconstant' has applied everything so we can add implicit extensions
         #
@@ -341,46 +547,47 @@ class BaseGenerator(OutputGenerator):
         # ex. VkAccelerationStructureTypeKHR where GENERIC_KHR is not allowed with just VK_NV_ray_tracing
         # This only works because the values are aliased as well, making the KHR a superset enum
         for extension in self.vk.extensions.values():
-            dict = self.featureDictionary[extension.name]['enum']
+            extName = extension.name
+            dict = self.featureDictionary[extName]['enum']
             for required in dict:
                 for group in dict[required]:
                     for enumName in dict[required][group]:
                         isAlias = enumName in self.enumAliasMap
-                        enumName = self.dealias(enumName, self.enumAliasMap)
+                        enumName = engine.dealias(enumName, self.enumAliasMap)
                         if enumName in self.vk.enums:
                             enum = self.vk.enums[enumName]
-                            enum.extensions.extend([extension.name] if extension.name not in enum.extensions else [])
-                            extension.enums.extend([enum] if enum not in extension.enums else [])
+                            addUnique(enum.extensions, extName)
+                            addUnique(extension.enums, enum)
                             # Update fields with implicit base extension
                             if isAlias:
                                 continue
-                            enum.fieldExtensions.extend([extension.name] if extension.name not in enum.fieldExtensions else [])
+                            addUnique(enum.fieldExtensions, extName)
                             for enumField in [x for x in enum.fields if (not x.extensions or (x.extensions and all(e in enum.extensions for e in x.extensions)))]:
-                                enumField.extensions.extend([extension.name] if extension.name not in enumField.extensions else [])
+                                addUnique(enumField.extensions, extName)
                                 if enumName not in extension.enumFields:
                                     extension.enumFields[enumName] = [] # Dict needs init
-                                extension.enumFields[enumName].extend([enumField] if enumField not in extension.enumFields[enumName] else [])
+                                addUnique(extension.enumFields[enumName], enumField)
 
-            dict = self.featureDictionary[extension.name]['bitmask']
+            dict = self.featureDictionary[extName]['bitmask']
             for required in dict:
                 for group in dict[required]:
                     for bitmaskName in dict[required][group]:
                         bitmaskName = bitmaskName.replace('Flags', 'FlagBits') # Works since Flags is not repeated in name
                         isAlias = bitmaskName in self.bitmaskAliasMap
-                        bitmaskName = self.dealias(bitmaskName, self.bitmaskAliasMap)
+                        bitmaskName = engine.dealias(bitmaskName, self.bitmaskAliasMap)
                         if bitmaskName in self.vk.bitmasks:
                             bitmask = self.vk.bitmasks[bitmaskName]
-                            bitmask.extensions.extend([extension.name] if extension.name not in bitmask.extensions else [])
-                            extension.bitmasks.extend([bitmask] if bitmask not in extension.bitmasks else [])
+                            addUnique(bitmask.extensions, extName)
+                            addUnique(extension.bitmasks, bitmask)
                             # Update flags with implicit base extension
                             if isAlias:
                                 continue
-                            bitmask.flagExtensions.extend([extension.name] if extension.name not in bitmask.flagExtensions else [])
+                            addUnique(bitmask.flagExtensions, extName)
                             for flag in [x for x in bitmask.flags if (not x.extensions or (x.extensions and all(e in bitmask.extensions for e in x.extensions)))]:
-                                flag.extensions.extend([extension.name] if extension.name not in flag.extensions else [])
+                                addUnique(flag.extensions, extName)
                                 if bitmaskName not in extension.flagBits:
                                     extension.flagBits[bitmaskName] = [] # Dict needs init
-                                extension.flagBits[bitmaskName].extend([flag] if flag not in extension.flagBits[bitmaskName] else [])
+                                addUnique(extension.flagBits[bitmaskName], flag)
 
         # Some structs (ex VkAttachmentSampleCountInfoAMD) can have multiple alias pointing to same extension
         for extension in self.vk.extensions.values():
@@ -388,12 +595,11 @@ class BaseGenerator(OutputGenerator):
             for required in dict:
                 for group in dict[required]:
                     for structName in dict[required][group]:
-                        isAlias = structName in self.structAliasMap
-                        structName = self.dealias(structName, self.structAliasMap)
+                        structName = engine.dealias(structName, self.structAliasMap)
                         if structName in self.vk.structs:
                             struct = self.vk.structs[structName]
-                            struct.extensions.extend([extension.name] if extension.name not in struct.extensions else [])
-                            extension.structs.extend([struct] if struct not in extension.structs else [])
+                            addUnique(struct.extensions, extension.name)
+                            addUnique(extension.structs, struct)
 
         # While we update struct alias inside other structs, the command itself might have the struct as a first level param.
         # We use this time to update params to have the promoted name
@@ -402,7 +608,7 @@ class BaseGenerator(OutputGenerator):
         for command in self.vk.commands.values():
             for member in command.params:
                 if member.type in self.structAliasMap:
-                    member.type = self.dealias(member.type, self.structAliasMap)
+                    member.type = engine.dealias(member.type, self.structAliasMap)
             # Replace string with Version class now we have all version created
             if command.legacy and command.legacy.version:
                 if command.legacy.version not in self.vk.versions:
@@ -416,162 +622,86 @@ class BaseGenerator(OutputGenerator):
         # Only append alias when the canonical (dealiased) entry exists in the target map; for APIs
         # like VulkanSC some extensions/versions are excluded so the canonical may never have been added.
         for key, value in self.structAliasMap.items():
-            canonical = self.dealias(value, self.structAliasMap)
+            canonical = engine.dealias(value, self.structAliasMap)
             if canonical in self.vk.structs:
                 self.vk.structs[canonical].aliases.append(key)
         for key, value in self.enumFieldAliasMap.items():
-            canonical = self.dealias(value, self.enumFieldAliasMap)
+            canonical = engine.dealias(value, self.enumFieldAliasMap)
             if canonical in self.enumFieldMap:
                 self.enumFieldMap[canonical].aliases.append(key)
         for key, value in self.enumAliasMap.items():
-            canonical = self.dealias(value, self.enumAliasMap)
+            canonical = engine.dealias(value, self.enumAliasMap)
             if canonical in self.vk.enums:
                 self.vk.enums[canonical].aliases.append(key)
         for key, value in self.flagAliasMap.items():
-            canonical = self.dealias(value, self.flagAliasMap)
+            canonical = engine.dealias(value, self.flagAliasMap)
             if canonical in self.flagMap:
                 self.flagMap[canonical].aliases.append(key)
         for key, value in self.bitmaskAliasMap.items():
-            canonical = self.dealias(value, self.bitmaskAliasMap)
+            canonical = engine.dealias(value, self.bitmaskAliasMap)
             if canonical in self.vk.bitmasks:
                 self.vk.bitmasks[canonical].aliases.append(key)
         for key, value in self.flagsAliasMap.items():
-            canonical = self.dealias(value, self.flagsAliasMap)
+            canonical = engine.dealias(value, self.flagsAliasMap)
             if canonical in self.vk.flags:
                 self.vk.flags[canonical].aliases.append(key)
         for key, value in self.handleAliasMap.items():
-            canonical = self.dealias(value, self.handleAliasMap)
+            canonical = engine.dealias(value, self.handleAliasMap)
             if canonical in self.vk.handles:
                 self.vk.handles[canonical].aliases.append(key)
 
-    def buildDefiningRequirements(self, itemName: str, extNames: list[str]) -> dict[str, str | None]:
-        if not extNames:
-            return {}
+        # Later passes may modify the lists, so do not keep what was recorded about them
+        engine.clearListCaches()
 
-        requirements = {}
-        for extName in sorted(extNames):
-            depends = self.itemRequireSectionDepends.get((extName, itemName))
-            requirements[extName] = depends
-
-        return requirements
+    # Maps each feature that defines itemName to the depends of its require section
+    # If extNames is given, only those features are included, sorted, with None for any that do not name the item
+    def buildDefiningRequirements(self, itemName: str, extNames: list[str] | None = None) -> dict[str, str | None]:
+        requirements = self.requirements.definingRequirements(itemName)
+        if extNames is None:
+            return requirements
+        return {extName : requirements.get(extName) for extName in sorted(extNames)}
 
     # Update all types with full definingRequirements
-    # Use itemDefiningExtensions (exact names from require sections) instead of obj.extensions
+    # Use the exact names from require sections instead of obj.extensions
     # This ensures aliases do not add their extension to the base type's requirement
     #
     # See thread for more details why added
     # https://gitlab.khronos.org/vulkan/vulkan/-/merge_requests/7872#note_591105
     def buildFullExtensionRequirements(self):
-        for cmdName, cmd in self.vk.commands.items():
-            definingExts = self.itemDefiningExtensions.get(cmdName, [])
-            cmd.definingRequirements = self.buildDefiningRequirements(cmdName, definingExts)
-
-        for structName, struct in self.vk.structs.items():
-            definingExts = self.itemDefiningExtensions.get(structName, [])
-            struct.definingRequirements = self.buildDefiningRequirements(structName, definingExts)
-
-        for enumName, enum in self.vk.enums.items():
-            definingExts = self.itemDefiningExtensions.get(enumName, [])
-            enum.definingRequirements = self.buildDefiningRequirements(enumName, definingExts)
+        engine = self.requirements
 
-        for bitmaskName, bitmask in self.vk.bitmasks.items():
-            definingExts = self.itemDefiningExtensions.get(bitmaskName, [])
-            bitmask.definingRequirements = self.buildDefiningRequirements(bitmaskName, definingExts)
-
-        for handleName, handle in self.vk.handles.items():
-            definingExts = self.itemDefiningExtensions.get(handleName, [])
-            handle.definingRequirements = self.buildDefiningRequirements(handleName, definingExts)
-
-        for flagsName, flags in self.vk.flags.items():
-            definingExts = self.itemDefiningExtensions.get(flagsName, [])
-            flags.definingRequirements = self.buildDefiningRequirements(flagsName, definingExts)
+        for items in (self.vk.commands, self.vk.structs, self.vk.enums, self.vk.bitmasks, self.vk.handles, self.vk.flags):
+            for name, item in items.items():
+                item.definingRequirements = engine.definingRequirements(name)
 
         # Also update enum fields and bitmask flags with definingRequirements
         # Separate base name requirements from alias requirements
+        # (These keep the order of the require sections instead of being sorted)
         for enum in self.vk.enums.values():
             for field in enum.fields:
-                # Base name requirements only
-                baseDefiningExts = []
-                if field.name in self.itemDefiningExtensions:
-                    baseDefiningExts.extend(self.itemDefiningExtensions[field.name])
-
-                # Build base name requirements
-                baseRequirements = {}
-                for extName in baseDefiningExts:
-                    depends = self.itemRequireSectionDepends.get((extName, field.name))
-                    baseRequirements[extName] = depends
-
-                field.definingRequirements = baseRequirements
-
-                # Alias requirements separately
+                field.definingRequirements = engine.definingRequirements(field.name, sort = False)
                 for alias in field.aliases:
-                    if alias in self.itemDefiningExtensions:
-                        aliasDefiningExts = self.itemDefiningExtensions[alias]
-                        # Build alias requirements
-                        aliasRequirements = {}
-                        for extName in aliasDefiningExts:
-                            depends = self.itemRequireSectionDepends.get((extName, alias))
-                            aliasRequirements[extName] = depends
-
-                        if aliasRequirements:
-                            self.vk.aliasFieldRequirements[alias] = aliasRequirements
+                    aliasRequirements = engine.definingRequirements(alias, sort = False)
+                    if aliasRequirements:
+                        self.vk.aliasFieldRequirements[alias] = aliasRequirements
 
         for bitmask in self.vk.bitmasks.values():
             for flag in bitmask.flags:
-                # Base name requirements only
-                baseDefiningExts = []
-                if flag.name in self.itemDefiningExtensions:
-                    baseDefiningExts.extend(self.itemDefiningExtensions[flag.name])
-
-                # Build base name requirements
-                baseRequirements = {}
-                for extName in baseDefiningExts:
-                    depends = self.itemRequireSectionDepends.get((extName, flag.name))
-                    baseRequirements[extName] = depends
-
-                flag.definingRequirements = baseRequirements
-
-                # Alias requirements separately
+                flag.definingRequirements = engine.definingRequirements(flag.name, sort = False)
                 for alias in flag.aliases:
-                    if alias in self.itemDefiningExtensions:
-                        aliasDefiningExts = self.itemDefiningExtensions[alias]
-                        # Build alias requirements
-                        aliasRequirements = {}
-                        for extName in aliasDefiningExts:
-                            depends = self.itemRequireSectionDepends.get((extName, alias))
-                            aliasRequirements[extName] = depends
-
-                        if aliasRequirements:
-                            self.vk.aliasFlagRequirements[alias] = aliasRequirements
+                    aliasRequirements = engine.definingRequirements(alias, sort = False)
+                    if aliasRequirements:
+                        self.vk.aliasFlagRequirements[alias] = aliasRequirements
 
         # Build definingRequirements for alias types (structs, handles, enums, bitmasks, flags)
         # Alias types do not have objects (they return early in genType), so we store their requirements separately
         # Note: Commands with aliases are still added to vk.commands (they do not return early),
         # so they are already handled in the normal flow above and do not need special handling here
-        for aliasName in self.structAliasMap.keys():
-            definingExts = self.itemDefiningExtensions.get(aliasName, [])
-            if definingExts:
-                self.vk.aliasTypeRequirements[aliasName] = self.buildDefiningRequirements(aliasName, definingExts)
-
-        for aliasName in self.handleAliasMap.keys():
-            definingExts = self.itemDefiningExtensions.get(aliasName, [])
-            if definingExts:
-                self.vk.aliasTypeRequirements[aliasName] = self.buildDefiningRequirements(aliasName, definingExts)
-
-        for aliasName in self.enumAliasMap.keys():
-            definingExts = self.itemDefiningExtensions.get(aliasName, [])
-            if definingExts:
-                self.vk.aliasTypeRequirements[aliasName] = self.buildDefiningRequirements(aliasName, definingExts)
-
-        for aliasName in self.bitmaskAliasMap.keys():
-            definingExts = self.itemDefiningExtensions.get(aliasName, [])
-            if definingExts:
-                self.vk.aliasTypeRequirements[aliasName] = self.buildDefiningRequirements(aliasName, definingExts)
-
-        for aliasName in self.flagsAliasMap.keys():
-            definingExts = self.itemDefiningExtensions.get(aliasName, [])
-            if definingExts:
-                self.vk.aliasTypeRequirements[aliasName] = self.buildDefiningRequirements(aliasName, definingExts)
+        for aliasMap in (self.structAliasMap, self.handleAliasMap, self.enumAliasMap, self.bitmaskAliasMap, self.flagsAliasMap):
+            for aliasName in aliasMap.keys():
+                aliasRequirements = engine.definingRequirements(aliasName)
+                if aliasRequirements:
+                    self.vk.aliasTypeRequirements[aliasName] = aliasRequirements
 
     def addConstants(self, constantNames: list[str]):
         for constantName in constantNames:
@@ -656,58 +786,89 @@ class BaseGenerator(OutputGenerator):
 
             self.vk.videoCodecs[name] = VideoCodec(name, value, profiles, capabilities, formats)
 
-    def endFile(self):
-        # This is the point were reg.py has ran, everything is collected
-        # We do some post processing now
-        self.applyExtensionDependency()
-
-        # Build full extensionRequirement for all types after extensions list is populated
-        self.buildFullExtensionRequirements()
-
+    def addConstantsPass(self):
         self.addConstants([k for k,v in self.registry.enumvaluedict.items() if v == 'API Constants'])
-        self.addVideoCodecs()
 
+    def headerVersionPass(self):
         self.vk.headerVersionComplete = APISpecific.createHeaderVersion(self.targetApiName, self.vk)
 
-        # Use structs and commands to find which things are returnedOnly
-        for struct in [x for x in self.vk.structs.values() if not x.returnedOnly]:
-            for enum in [self.vk.enums[x.type] for x in struct.members if x.type in self.vk.enums]:
-                enum.returnedOnly = False
-            for bitmask in [self.vk.bitmasks[x.type] for x in struct.members if x.type in self.vk.bitmasks]:
-                bitmask.returnedOnly = False
-            for flags in [self.vk.flags[x.type] for x in struct.members if x.type in self.vk.flags]:
-                flags.returnedOnly = False
-                if flags.bitmaskName is not None:
-                    self.vk.bitmasks[flags.bitmaskName].returnedOnly = False
-        for command in self.vk.commands.values():
-            for enum in [self.vk.enums[x.type] for x in command.params if x.type in self.vk.enums]:
-                enum.returnedOnly = False
-            for bitmask in [self.vk.bitmasks[x.type] for x in command.params if x.type in self.vk.bitmasks]:
-                bitmask.returnedOnly = False
-            for flags in [self.vk.flags[x.type] for x in command.params if x.type in self.vk.flags]:
+    # Use structs and commands to find which things are returnedOnly
+    def returnedOnlyPass(self):
+        graph = self.getTypeUsageGraph()
+        roots = [x.name for x in self.vk.structs.values() if not x.returnedOnly] + list(self.vk.commands.keys())
+        worklist = list({typeName for root in roots for typeName in graph.uses[root]})
+        while worklist:
+            typeName = worklist.pop()
+            if typeName in self.vk.enums:
+                self.vk.enums[typeName].returnedOnly = False
+            elif typeName in self.vk.bitmasks:
+                self.vk.bitmasks[typeName].returnedOnly = False
+            elif typeName in self.vk.flags:
+                flags = self.vk.flags[typeName]
                 flags.returnedOnly = False
                 if flags.bitmaskName is not None:
-                    self.vk.bitmasks[flags.bitmaskName].returnedOnly = False
+                    worklist.append(flags.bitmaskName)
 
-        # Turn handle parents into pointers to classes
+    # Turn handle parents into pointers to classes and search up the parent chain to see if instance or device
+    # Each handle is the same as its parent, so every handle is only visited once
+    def handleParentsPass(self):
         for handle in [x for x in self.vk.handles.values() if x.parent is not None]:
             handle.parent = self.vk.handles[handle.parent]
-        # search up parent chain to see if instance or device
-        for handle in [x for x in self.vk.handles.values()]:
-            next_parent = handle.parent
-            while (not handle.instance and not handle.device):
-                handle.instance = next_parent.name == 'VkInstance'
-                handle.device = next_parent.name == 'VkDevice'
-                next_parent = next_parent.parent
 
+        resolved = {x.name for x in self.vk.handles.values() if x.instance or x.device}
+        for handle in self.vk.handles.values():
+            # Walk up until we find an ancestor that is already known
+            worklist = []
+            current = handle
+            while current.name not in resolved:
+                worklist.append(current)
+                current = current.parent
+            for child in reversed(worklist):
+                child.instance = child.parent.instance
+                child.device = child.parent.device
+                resolved.add(child.name)
+
+    def maxSyncPass(self):
         maxSyncSupport.stages = self.vk.bitmasks['VkPipelineStageFlagBits2'].flags
         maxSyncEquivalent.accesses = self.vk.bitmasks['VkAccessFlagBits2'].flags
         maxSyncEquivalent.stages = self.vk.bitmasks['VkPipelineStageFlagBits2'].flags
 
+    # Built the first time a pass asks for it, after the extension dependencies have dealiased the param types
+    def getTypeUsageGraph(self) -> TypeUsageGraph:
+        if self.typeUsageGraph is None:
+            self.typeUsageGraph = TypeUsageGraph.build(self.vk)
+        return self.typeUsageGraph
+
+    # Add a pass to the end of the post processing at endFile(), or before an existing pass
+    # The pass is called with no arguments, it can use self.vk and getTypeUsageGraph() to avoid scanning everything again
+    def addPostProcessPass(self, name: str, function, before: (str | None) = None):
+        index = len(self.postProcessPasses)
+        if before is not None:
+            names = [passName for (passName, _) in self.postProcessPasses]
+            if before not in names:
+                raise ValueError(f'Cannot add post processing pass {name} before {before}, '
+                                 f'which is not one of {", ".join(names)}')
+            index = names.index(before)
+        self.postProcessPasses.insert(index, (name, function))
+
+    def runPostProcessPasses(self):
+        for (name, function) in self.postProcessPasses:
+            start = time.perf_counter()
+            function()
+            seconds = time.perf_counter() - start
+            self.postProcessTimes[name] = seconds
+            if self.postProcessTimingHook is not None:
+                self.postProcessTimingHook(name, seconds)
+
+    def endFile(self):
+        # This is the point were reg.py has ran, everything is collected
+        # We do some post processing now
+        self.runPostProcessPasses()
+
         # All inherited generators should run from here
         self.generate()
 
-        if cachingEnabled:
+        if self.genOpts.cachingEnabled:
             cachePath = os.path.join(tempfile.gettempdir(), f'vkobject_{os.getpid()}')
             if not os.path.isfile(cachePath):
                 cacheFile = open(cachePath, 'wb')
@@ -723,6 +884,7 @@ class BaseGenerator(OutputGenerator):
     def generateFromCache(self, cacheVkObjectData, genOpts):
         OutputGenerator.beginFile(self, genOpts)
         self.filename = genOpts.filename
+        self.targetApiName = genOpts.apiname
         self.vk = cacheVkObjectData
         self.generate()
         OutputGenerator.endFile(self)
@@ -746,39 +908,11 @@ class BaseGenerator(OutputGenerator):
                 featureName = feature.get('name')
                 featureRequirement.append(FeatureRequirement(featureStruct, featureName, requireDepends))
 
-            # Build mapping from (extension, item_name) to their require section depends
-            # AND track which exact item names are in each extension's require sections
-            # This is used for building extensionRequirement later
-            for cmd in require.findall('command'):
-                cmdName = cmd.get('name')
-                if cmdName:
-                    if requireDepends:
-                        self.itemRequireSectionDepends[(name, cmdName)] = requireDepends
-                    # Track exact name -> defining extensions
-                    if cmdName not in self.itemDefiningExtensions:
-                        self.itemDefiningExtensions[cmdName] = []
-                    if name not in self.itemDefiningExtensions[cmdName]:
-                        self.itemDefiningExtensions[cmdName].append(name)
-            for typeElem in require.findall('type'):
-                typeName = typeElem.get('name')
-                if typeName:
-                    if requireDepends:
-                        self.itemRequireSectionDepends[(name, typeName)] = requireDepends
-                    # Track exact name -> defining extensions
-                    if typeName not in self.itemDefiningExtensions:
-                        self.itemDefiningExtensions[typeName] = []
-                    if name not in self.itemDefiningExtensions[typeName]:
-                        self.itemDefiningExtensions[typeName].append(name)
-            for enum in require.findall('enum'):
-                enumName = enum.get('name')
-                if enumName:
-                    if requireDepends:
-                        self.itemRequireSectionDepends[(name, enumName)] = requireDepends
-                    # Track exact name -> defining extensions
-                    if enumName not in self.itemDefiningExtensions:
-                        self.itemDefiningExtensions[enumName] = []
-                    if name not in self.itemDefiningExtensions[enumName]:
-                        self.itemDefiningExtensions[enumName].append(name)
+            # Track which exact item names (not via alias) are in each feature's require sections
+            # and their require section depends. This is used for building definingRequirements later
+            for itemElem in require:
+                if itemElem.tag in ('command', 'type', 'enum') and itemElem.get('name'):
+                    self.requirements.addRequire(name, itemElem.get('name'), requireDepends)
 
         if interface.tag == 'extension':
             # Generator scripts built on BaseGenerator do not handle the `supported` attribute of extensions
@@ -787,7 +921,8 @@ class BaseGenerator(OutputGenerator):
             # reg.py parsed it. That broke the general behavior of reg.py for certain use cases so we now
             # filter extensions here instead (after parsing) in order to no longer need the filtering hack
             # in downstream `generate_source.py` scripts.
-            enabledApiList = [ globalApiName ] + ([] if mergedApiNames is None else mergedApiNames.split(','))
+            mergeApiNames = self.genOpts.mergeApiNames
+            enabledApiList = [ self.genOpts.apiname ] + ([] if mergeApiNames is None else mergeApiNames.split(','))
             if (sup := interface.get('supported')) is not None and all(api not in sup.split(',') for api in enabledApiList):
                 self.unsupportedExtension = True
                 return
@@ -1436,3 +1571,83 @@ class _VideoStdGenerator(BaseGenerator):
     def genSyncPipeline(self, sync):
         # video.xml should not contain any sync pipeline info
         assert False
+
+#
+# Runs many BaseGenerator subclasses against a single VulkanObject
+#
+# Projects built on the BaseGenerator tend to have dozens of generators, and running each one in
+# its own process means parsing vk.xml and building the VulkanObject over and over again.
+# RunGenerators() builds the VulkanObject once and hands it to a pool of worker processes, each
+# worker only calling generate() and writing out its own file.
+
+@dataclass
+class GeneratorResult:
+    name: str # class name of the generator
+    filename: str
+    seconds: float # time spent in the generator, not counting building the VulkanObject
+    error: (str | None) # formatted traceback if the generator failed, otherwise None
+
+# Only used to build the VulkanObject, it does not write anything
+class _VulkanObjectBuilder(BaseGenerator):
+    def __init__(self):
+        BaseGenerator.__init__(self)
+
+    def generate(self):
+        return
+
+def BuildVulkanObject(xmlPath: str, targetApiName: str, mergedApiNames: (str | None) = None,
+                      videoXmlPath: (str | None) = None) -> VulkanObject:
+    builder = _VulkanObjectBuilder()
+    options = BaseGeneratorOptions(customApiName = targetApiName, videoXmlPath = videoXmlPath)
+    options.mergeApiNames = mergedApiNames
+    options.cachingEnabled = False
+    reg = Registry(builder, options)
+    reg.loadElementTree(ElementTree.parse(xmlPath))
+    reg.apiGen()
+    return builder.vk
+
+# Set in each worker process by the pool initializer.
+# With the 'fork' start method the VulkanObject is inherited instead of pickled.
+_runnerVulkanObject = None
+
+def _initRunnerWorker(vk: VulkanObject) -> None:
+    global _runnerVulkanObject
+    _runnerVulkanObject = vk
+
+def _runGenerator(generatorClass, fileName: str, directory: str, targetApiName: str,
+                  mergedApiNames: (str | None)) -> GeneratorResult:
+    start = time.perf_counter()
+    error = None
+    try:
+        generator = generatorClass()
+        options = BaseGeneratorOptions(customFileName = fileName, customDirectory = directory,
+                                       customApiName = targetApiName)
+        options.mergeApiNames = mergedApiNames
+        options.cachingEnabled = False
+        generator.generateFromCache(_runnerVulkanObject, options)
+    except Exception:
+        error = traceback.format_exc()
+    return GeneratorResult(generatorClass.__name__, fileName, time.perf_counter() - start, error)
+
+# generators is a list of (BaseGenerator subclass, output file name)
+# A failing generator does not stop the others, check GeneratorResult.error for each one.
+# Set processes to 1 to run everything in the calling process (useful for debugging).
+def RunGenerators(generators: list[tuple[type, str]], xmlPath: str, directory: str, targetApiName: str,
+                  mergedApiNames: (str | None) = None, videoXmlPath: (str | None) = None,
+                  processes: (int | None) = None, vk: (VulkanObject | None) = None) -> list[GeneratorResult]:
+    if vk is None:
+        vk = BuildVulkanObject(xmlPath, targetApiName, mergedApiNames, videoXmlPath)
+    os.makedirs(directory, exist_ok = True)
+
+    if processes == 1:
+        _initRunnerWorker(vk)
+        return [_runGenerator(generatorClass, fileName, directory, targetApiName, mergedApiNames)
+                for (generatorClass, fileName) in generators]
+
+    context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+    with ProcessPoolExecutor(max_workers = processes, mp_context = context,
+                             initializer = _initRunnerWorker, initargs = (vk,)) as executor:
+        futures = [executor.submit(_runGenerator, generatorClass, fileName, directory, targetApiName, mergedApiNames)
+                   for (generatorClass, fileName) in generators]
+        # Results are returned in the same order as the generators were given
+        return [future.result() for future in futures]
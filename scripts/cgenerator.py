@@ -465,34 +465,54 @@ class COutputGenerator(OutputGenerator):
         if alias:
             body += f"typedef {alias} {typeName};\n"
         else:
-            (protect_begin, protect_end) = self.genProtectString(typeElem.get('protect'))
-            if protect_begin:
-                body += protect_begin
+            key = self.declCacheKey('struct', typeName,
+                                    tuple(member.get('deprecated')
+                                          for member in typeElem.iterfind('.//member')))
+            if key is None:
+                body += self.computeStructCDecl(typeinfo, typeName)
+            else:
+                decl = self.genOpts.declCache.get(key)
+                if decl is None:
+                    decl = self.computeStructCDecl(typeinfo, typeName)
+                    self.genOpts.declCache.set(key, decl)
+                body += decl
 
-            if self.genOpts.genStructExtendsComment:
-                structextends = typeElem.get('structextends')
-                body += f"// {typeName} extends {structextends}\n" if structextends else ''
+        self.appendSection('struct', body)
 
-            body += f"typedef {typeElem.get('category')}"
+    def computeStructCDecl(self, typeinfo, typeName):
+        """Return the C declaration of a struct or union type which is not
+        an alias, for genStruct()."""
+        typeElem = typeinfo.elem
+        body = ''
 
-            # This is an OpenXR-specific alternative where aliasing refers
-            # to an inheritance hierarchy of types rather than C-level type
-            # aliases.
-            if self.genOpts.genAliasMacro and self.typeMayAlias(typeName):
-                body += f" {self.genOpts.aliasMacro}"
+        (protect_begin, protect_end) = self.genProtectString(typeElem.get('protect'))
+        if protect_begin:
+            body += protect_begin
 
-            body += f" {typeName} {{\n"
+        if self.genOpts.genStructExtendsComment:
+            structextends = typeElem.get('structextends')
+            body += f"// {typeName} extends {structextends}\n" if structextends else ''
 
-            targetLen = self.getMaxCParamTypeLength(typeinfo)
-            for member in typeElem.findall('.//member'):
-                body += self.deprecationComment(member, indent = 4)
-                body += self.makeCParamDecl(member, targetLen + 4)
-                body += ';\n'
-            body += f"}} {typeName};\n"
-            if protect_end:
-                body += protect_end
+        body += f"typedef {typeElem.get('category')}"
 
-        self.appendSection('struct', body)
+        # This is an OpenXR-specific alternative where aliasing refers
+        # to an inheritance hierarchy of types rather than C-level type
+        # aliases.
+        if self.genOpts.genAliasMacro and self.typeMayAlias(typeName):
+            body += f" {self.genOpts.aliasMacro}"
+
+        body += f" {typeName} {{\n"
+
+        targetLen = self.getMaxCParamTypeLength(typeinfo)
+        for member in typeElem.findall('.//member'):
+            body += self.deprecationComment(member, indent = 4)
+            body += self.makeCParamDecl(member, targetLen + 4)
+            body += ';\n'
+        body += f"}} {typeName};\n"
+        if protect_end:
+            body += protect_end
+
+        return body
 
     def genGroup(self, groupinfo, groupName, alias=None):
         """Generate groups (e.g. C "enum" type).
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3 -i
+#
+# Copyright 2026 The Khronos Group Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import argparse
+import os
+import sys
+
+from base_generator import BaseGenerator, RunGenerators
+from lookuptables import bitsetInitializer, bitsetWords, buildPerfectHash, cStringHash, protected
+from vulkan_object import Command, VulkanObject
+
+# Dispatch levels, in the order of the DispatchLevel enum
+dispatchLevels = ('global', 'instance', 'device')
+
+# Commands which are not dispatched through a handle, and are queried
+# with a NULL instance in vkGetInstanceProcAddr
+globalCommands = ('vkCreateInstance', 'vkEnumerateInstanceExtensionProperties',
+                  'vkEnumerateInstanceLayerProperties', 'vkEnumerateInstanceVersion')
+
+# Name of the feature providing the Vulkan 1.0 commands, which have no
+# version in VulkanObject
+baseVersion = 'VK_VERSION_1_0'
+
+def commandLevel(command: Command) -> str:
+    """Return the dispatch level of command."""
+    if command.device:
+        return 'device'
+    return 'global' if command.name in globalCommands else 'instance'
+
+def commandFeatures(command: Command) -> list[str]:
+    """Return the names of the versions and extensions providing command."""
+    features = ([command.version.name] if command.version is not None else []) + command.extensions
+    return features or [baseVersion]
+
+class DispatchTable:
+    """Layout of the commands in dense dispatch tables, one for each
+    dispatch level, from which the C header is written.
+
+    - levelCommands - dict of level to the Commands with an index in it,
+      in index order. Aliases are not included, as they share the index
+      of the command they alias
+    - aliases - dict of command name to the Commands aliasing it
+    - commandIndex - dict of every command and alias name to its
+      (level, index)
+    - wordCounts - dict of level to the number of 32-bit words in its
+      bitsets
+    - features - names of the versions and extensions providing commands
+    - featureIndices - dict of feature name to dict of level to the set
+      of indices the feature enables
+    - commandHash, featureHash - (displacements, slots) of the perfect
+      hashes of command names and feature names"""
+
+    def __init__(self, vk: VulkanObject):
+        featureNames = [baseVersion, *vk.versions, *vk.extensions]
+        featureRank = {name: rank for (rank, name) in enumerate(featureNames)}
+        registryOrder = {name: order for (order, name) in enumerate(vk.commands)}
+
+        def target(command: Command) -> Command:
+            while command.alias is not None and command.alias in vk.commands:
+                command = vk.commands[command.alias]
+            return command
+
+        self.aliases = {}
+        for command in vk.commands.values():
+            if target(command) is not command:
+                self.aliases.setdefault(target(command).name, []).append(command)
+
+        def providers(command: Command) -> list[str]:
+            return [feature for provider in [command, *self.aliases.get(command.name, [])]
+                    for feature in commandFeatures(provider)]
+
+        self.levelCommands = {level: [] for level in dispatchLevels}
+        for command in vk.commands.values():
+            if target(command) is command:
+                self.levelCommands[commandLevel(command)].append(command)
+        for commands in self.levelCommands.values():
+            commands.sort(key = lambda command: (min(featureRank[feature] for feature in providers(command)),
+                                                 registryOrder[command.name]))
+        self.commandIndex = {command.name: (level, index)
+                             for (level, commands) in self.levelCommands.items()
+                             for (index, command) in enumerate(commands)}
+        for command in vk.commands.values():
+            self.commandIndex[command.name] = self.commandIndex[target(command).name]
+        self.wordCounts = {level: max(1, (len(commands) + 31) // 32) for (level, commands) in self.levelCommands.items()}
+
+        self.featureIndices = {}
+        for command in vk.commands.values():
+            (level, index) = self.commandIndex[command.name]
+            for feature in commandFeatures(command):
+                self.featureIndices.setdefault(feature, {level: set() for level in dispatchLevels})[level].add(index)
+        self.features = sorted(self.featureIndices, key = lambda feature: featureRank[feature])
+
+        self.commandHash = buildPerfectHash(list(vk.commands))
+        self.featureHash = buildPerfectHash(self.features)
+
+    def featureBits(self, feature: str, level: str) -> list[int]:
+        """Return the words of the bitset of the indices of level enabled
+        by feature."""
+        return bitsetWords(self.featureIndices[feature][level], self.wordCounts[level])
+
+class DispatchIndexGenerator(BaseGenerator):
+    """Generates a C header assigning every command a dense index within
+    its dispatch level, so that loader and layer dispatch tables can be
+    plain arrays of function pointers.
+
+    Global commands are those which are not dispatched through a handle,
+    and are queried with a NULL instance, such as vkCreateInstance. The
+    other commands are instance or device level, as in vk.commands.
+
+    An alias, such as vkGetPhysicalDeviceFeatures2KHR, shares the index of
+    the command it aliases, as both names resolve to the same function.
+    The alias has its own enumerant and is found by name, and the
+    extensions providing it enable the shared index.
+
+    Within a level, commands are ordered by the first feature providing
+    them, with the versions in order before the extensions in registry
+    order, then in registry order. The commands of a new extension are
+    therefore appended to their level without moving other commands, but
+    commands of a new version, or added to an existing version or
+    extension, shift the indices of the commands after them. Indices are
+    only meant to be used with tables built against the same header.
+
+    The header also contains a perfect hash from command names to their
+    level and index, and, for each version and extension providing
+    commands, bitsets of the indices it enables. Commands with a protect
+    macro keep their index, but are only found by name if the macro is
+    defined."""
+
+    def __init__(self):
+        BaseGenerator.__init__(self)
+
+    def generate(self):
+        table = DispatchTable(self.vk)
+
+        out = []
+        out.append(f'''// *** THIS FILE IS GENERATED - DO NOT EDIT ***
+// See {os.path.basename(__file__)} for modifications
+
+/*
+** Copyright 2026 The Khronos Group Inc.
+**
+** SPDX-License-Identifier: Apache-2.0
+*/
+
+#ifndef VK_DISPATCH_INDEX_TABLES_H_
+#define VK_DISPATCH_INDEX_TABLES_H_ 1
+
+// Dense indices of every command within its dispatch level, for dispatch
+// tables declared as PFN_vkVoidFunction table[<LEVEL>_DISPATCH_COUNT]:
+//   <LEVEL>_DISPATCH_<command> - index of command in its level, shared by
+//     the command and its aliases
+//   <LEVEL>_DISPATCH_PFN(table, command) - typed function pointer from table
+//   bool GetDispatchIndex(const char *name, DispatchLevel *level, uint32_t *index)
+//     - false if name is not a command, or is protected by a platform or
+//       beta macro which is not defined
+//   const DispatchFeature *GetDispatchFeature(const char *name)
+//     - bitsets of the indices enabled by a version or extension, or NULL
+//       if it provides no commands
+//   bool DispatchIndexEnabled(const uint32_t *bitset, uint32_t index)
+// Include the platform headers, or define the VK_USE_PLATFORM_* macros,
+// before this header to find platform-specific commands by name.
+
+#include <stdbool.h>
+#include <stdint.h>
+#include <string.h>
+#include <vulkan/vulkan.h>
+
+#ifdef __cplusplus
+extern "C" {{
+#endif
+
+typedef enum DispatchLevel {{
+    DISPATCH_LEVEL_GLOBAL = 0,
+    DISPATCH_LEVEL_INSTANCE = 1,
+    DISPATCH_LEVEL_DEVICE = 2
+}} DispatchLevel;
+
+''')
+        for level in dispatchLevels:
+            prefix = f'{level.upper()}_DISPATCH'
+            commands = table.levelCommands[level]
+            out.append(f'// {level.capitalize()} commands\n')
+            out.append(f'typedef enum {level.capitalize()}DispatchIndex {{\n')
+            out.extend(f'    {prefix}_{command.name} = {index},\n' for (index, command) in enumerate(commands))
+            aliases = [(alias, command) for command in commands for alias in table.aliases.get(command.name, [])]
+            if aliases:
+                out.append('    // Aliases share the index of the command they alias\n')
+                out.extend(f'    {prefix}_{alias.name} = {prefix}_{command.name},\n' for (alias, command) in aliases)
+            out.append(f'    {prefix}_COUNT = {len(commands)}\n')
+            out.append(f'}} {level.capitalize()}DispatchIndex;\n\n')
+            out.append(f'#define {prefix}_WORDS {table.wordCounts[level]}\n')
+            out.append(f'#define {prefix}_PFN(table, command) ((PFN_##command)(table)[{prefix}_##command])\n\n')
+            out.append(f'static const char *const {level.capitalize()}DispatchNames[{max(len(commands), 1)}] = {{\n')
+            out.extend(f'    "{command.name}",\n' for command in commands)
+            if not commands:
+                out.append('    NULL,\n')
+            out.append('};\n\n')
+
+        out.append(f'''typedef struct DispatchCommandEntry {{
+    const char *name;
+    uint16_t level;
+    uint16_t index;
+}} DispatchCommandEntry;
+
+typedef struct DispatchFeature {{
+    const char *name;
+    uint32_t global[GLOBAL_DISPATCH_WORDS];
+    uint32_t instance[INSTANCE_DISPATCH_WORDS];
+    uint32_t device[DEVICE_DISPATCH_WORDS];
+}} DispatchFeature;
+
+{cStringHash('DispatchName')}
+''')
+        (displacements, slots) = table.commandHash
+        out.append(f'static const struct {{ DispatchCommandEntry entries[{len(slots)}]; int32_t displacements[{len(slots)}]; }} DispatchCommandHash = {{\n')
+        out.append('    {\n')
+        for name in slots:
+            (level, index) = table.commandIndex[name]
+            out.extend(protected(self.vk.commands[name].protect,
+                                 [f'        {{"{name}", DISPATCH_LEVEL_{level.upper()}, {index}}},\n'],
+                                 ['        {NULL, 0, 0},\n']))
+        out.append('    },\n')
+        out.append('    {' + ', '.join(str(displacement) for displacement in displacements) + '},\n')
+        out.append('};\n\n')
+
+        (displacements, slots) = table.featureHash
+        out.append(f'static const struct {{ DispatchFeature entries[{len(slots)}]; int32_t displacements[{len(slots)}]; }} DispatchFeatureHash = {{\n')
+        out.append('    {\n')
+        for name in slots:
+            bitsets = ', '.join(bitsetInitializer(table.featureBits(name, level)) for level in dispatchLevels)
+            out.append(f'        {{"{name}", {bitsets}}},\n')
+        out.append('    },\n')
+        out.append('    {' + ', '.join(str(displacement) for displacement in displacements) + '},\n')
+        out.append('};\n\n')
+
+        out.append(f'''static inline bool GetDispatchIndex(const char *name, DispatchLevel *level, uint32_t *index) {{
+    const DispatchCommandEntry *entry = &DispatchCommandHash.entries[DispatchNameSlot(DispatchCommandHash.displacements, {len(self.vk.commands)}, name)];
+    if (entry->name == NULL || strcmp(entry->name, name) != 0) return false;
+    *level = (DispatchLevel)entry->level;
+    *index = entry->index;
+    return true;
+}}
+
+static inline const DispatchFeature *GetDispatchFeature(const char *name) {{
+    const DispatchFeature *feature = &DispatchFeatureHash.entries[DispatchNameSlot(DispatchFeatureHash.displacements, {len(table.features)}, name)];
+    return strcmp(feature->name, name) == 0 ? feature : NULL;
+}}
+
+static inline bool DispatchIndexEnabled(const uint32_t *bitset, uint32_t index) {{
+    return (bitset[index / 32] >> (index % 32)) & 1u;
+}}
+
+#ifdef __cplusplus
+}}
+#endif
+
+#endif // VK_DISPATCH_INDEX_TABLES_H_
+''')
+        self.write(''.join(out))
+
+if __name__ == '__main__':
+    defaultXml = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'xml', 'vk.xml'))
+
+    parser = argparse.ArgumentParser(description='Generate C dispatch table indices and command name lookups')
+    parser.add_argument('-o', default='.', help='directory to write the header to', dest='directory')
+    parser.add_argument('-filename', default='vk_dispatch_index_tables.h', help='name of the header to write')
+    parser.add_argument('-api', default='vulkan', choices=['vulkan', 'vulkansc', 'vulkanbase'],
+                        help='target API (default: vulkan)')
+    parser.add_argument('-xml', default=defaultXml, help='path to XML registry (default: xml/vk.xml)')
+    args = parser.parse_args()
+
+    (result,) = RunGenerators([(DispatchIndexGenerator, args.filename)], args.xml, args.directory,
+                              args.api, processes = 1)
+    if result.error is not None:
+        print(result.error, file=sys.stderr)
+        sys.exit(1)
@@ -67,6 +67,8 @@ class DocGeneratorOptions(GeneratorOptions):
                  expandEnumerants=True,
                  extEnumerantAdditions=False,
                  extEnumerantFormatString=" (Added by the {} extension)",
+                 processes=1,
+                 validUsageJson=False,
                  **kwargs):
         """Constructor.
 
@@ -102,6 +104,12 @@ class DocGeneratorOptions(GeneratorOptions):
         - extEnumerantFormatString - A format string for any additional message for
         enumerants from extensions if extEnumerantAdditions is True. The correctly-
         marked-up extension name will be passed.
+        - processes - number of worker processes used by generators which
+        can build their include files in parallel (currently only
+        ValidityOutputGenerator). 1 generates everything in this process.
+        - validUsageJson - if True, ValidityOutputGenerator writes the
+        implicit valid usage statements to filename as JSON, using the
+        validusage.json schema, instead of writing include files.
         """
         GeneratorOptions.__init__(self, **kwargs)
         self.prefixText = prefixText
@@ -139,6 +147,12 @@ class DocGeneratorOptions(GeneratorOptions):
         enumerants from extensions if extEnumerantAdditions is True. The correctly-
         marked-up extension name will be passed."""
 
+        self.processes = processes
+        """number of worker processes for parallel include generation"""
+
+        self.validUsageJson = validUsageJson
+        """if True, write implicit valid usage as JSON instead of include files"""
+
 
 class DocOutputGenerator(OutputGenerator):
     """DocOutputGenerator - subclass of OutputGenerator.
@@ -280,7 +294,7 @@ class DocOutputGenerator(OutputGenerator):
         # Create file
         filename = directory / (f"{basename}{self.file_suffix}")
         self.logMsg('diag', '# Generating include file:', str(filename))
-        fp = open(filename, 'w', encoding='utf-8')
+        fp = self.openOutput(filename, entities=[basename])
 
         # Asciidoc anchor
         write(self.genOpts.conventions.warning_comment, file=fp)
@@ -336,7 +350,7 @@ class DocOutputGenerator(OutputGenerator):
             # Create secondary no cross-reference include file
             filename = directory / f'{basename}.no-xref{self.file_suffix}'
             self.logMsg('diag', '# Generating include file:', filename)
-            fp = open(filename, 'w', encoding='utf-8')
+            fp = self.openOutput(filename, entities=[basename])
 
             # Asciidoc anchor
             write(self.genOpts.conventions.warning_comment, file=fp)
@@ -355,7 +369,7 @@ class DocOutputGenerator(OutputGenerator):
         filename = str(directory / f'{basename}.comments{self.file_suffix}')
         self.logMsg('diag', '# Generating include file:', filename)
 
-        with open(filename, 'w', encoding='utf-8') as fp:
+        with self.openOutput(filename, entities=[basename]) as fp:
             write(self.conventions.warning_comment, file=fp)
             write(_ENUM_TABLE_PREFIX, file=fp)
 
@@ -365,11 +379,11 @@ class DocOutputGenerator(OutputGenerator):
 
             write(_TABLE_SUFFIX, file=fp)
 
-    def writeBox(self, filename, prefix, items):
+    def writeBox(self, filename, prefix, items, entities=()):
         """Write a generalized block/box for some values."""
         self.logMsg('diag', '# Generating include file:', filename)
 
-        with open(filename, 'w', encoding='utf-8') as fp:
+        with self.openOutput(filename, entities=entities) as fp:
             write(self.conventions.warning_comment, file=fp)
             write(prefix, file=fp)
 
@@ -386,7 +400,8 @@ class DocOutputGenerator(OutputGenerator):
         filename = str(directory / f'{basename}.comments-box{self.file_suffix}')
         self.writeBox(filename, _ENUM_BLOCK_PREFIX,
                       (f"ename:{data['name']} -- {data['comment']}"
-                       for data in values))
+                       for data in values),
+                      entities=[basename])
 
     def writeFlagBox(self, basename, values):
         """Output a box of flag bit comments."""
@@ -396,7 +411,8 @@ class DocOutputGenerator(OutputGenerator):
         filename = str(directory / f'{basename}.comments{self.file_suffix}')
         self.writeBox(filename, _FLAG_BLOCK_PREFIX,
                       (f"ename:{data['name']} -- {data['comment']}"
-                       for data in values))
+                       for data in values),
+                      entities=[basename])
 
     def genType(self, typeinfo, name, alias):
         """Generate type."""
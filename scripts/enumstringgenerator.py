@@ -0,0 +1,272 @@
+#!/usr/bin/env python3 -i
+#
+# Copyright 2026 The Khronos Group Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import argparse
+import os
+import sys
+
+from base_generator import BaseGenerator, RunGenerators
+from lookuptables import buildPerfectHash, cStringHash, protected
+from vulkan_object import Bitmask, Enum
+
+# Enum values closer together than this share a dense name array, with
+# NULL entries for the values in between
+maxRangeGap = 8
+
+def buildRanges(values: list[int]) -> list[tuple[int, int, int]]:
+    """Return (first, count, index) for each run of sorted, unique values
+    with gaps of at most maxRangeGap, where index is the position of the
+    first value in the dense name array covering all runs."""
+    ranges = []
+    index = 0
+    for value in values:
+        if ranges and value - (ranges[-1][0] + ranges[-1][1]) < maxRangeGap:
+            (first, count, start) = ranges[-1]
+            index += value - (first + count) + 1
+            ranges[-1] = (first, value - first + 1, start)
+        else:
+            ranges.append((value, 1, index))
+            index += 1
+    return ranges
+
+class EnumStringGenerator(BaseGenerator):
+    """Generates a C header of lookup tables converting every enum and
+    flag bit in vk.enums and vk.bitmasks to and from its name.
+
+    Values are converted to names through dense arrays indexed by value,
+    or by bit position for flag bits. Names, including aliases, are
+    converted to values through a minimal perfect hash table. Entries and
+    functions are enclosed in #ifdef for their protect macro."""
+
+    def __init__(self):
+        BaseGenerator.__init__(self)
+
+    def nameEntries(self, entries: list[tuple[str, str, (str | None)]], parentProtect: (str | None)) -> list[str]:
+        """Return the lines of a perfect hash table of (name, value,
+        protect) entries, followed by its displacement table."""
+        (displacements, slots) = buildPerfectHash([name for (name, _, _) in entries])
+        entryMap = {name: (value, protect) for (name, value, protect) in entries}
+
+        out = ['    {\n']
+        for name in slots:
+            (value, protect) = entryMap[name]
+            entry = [f'        {{"{name}", {value}}},\n']
+            out.extend(protected(protect if protect != parentProtect else None, entry,
+                                      ['        {NULL, 0},\n']))
+        out.append('    },\n')
+        out.append('    {' + ', '.join(str(displacement) for displacement in displacements) + '},\n')
+        return out
+
+    def denseNames(self, names: dict[int, tuple[str, (str | None)]], length: int, parentProtect: (str | None)) -> list[str]:
+        """Return the lines of an array of length names, indexed by the
+        keys of names, with NULL for missing entries."""
+        out = []
+        for index in range(length):
+            if index not in names:
+                out.append('    NULL,\n')
+                continue
+            (name, protect) = names[index]
+            out.extend(protected(protect if protect != parentProtect else None,
+                                      [f'    "{name}",\n'], ['    NULL,\n']))
+        return out
+
+    def generateEnum(self, enum: Enum) -> list[str]:
+        # First name for each value, in declaration order
+        valueNames = {}
+        for field in enum.fields:
+            valueNames.setdefault(field.value, (field.name, field.protect))
+        values = sorted(valueNames)
+        ranges = buildRanges(values)
+
+        denseIndex = {}
+        for (first, count, index) in ranges:
+            for value in range(first, first + count):
+                if value in valueNames:
+                    denseIndex[index + value - first] = valueNames[value]
+        nameCount = ranges[-1][2] + ranges[-1][1]
+
+        entries = list({name: (name, field.value, field.protect)
+                        for field in enum.fields for name in [field.name, *field.aliases]}.values())
+
+        out = [f'// {enum.name}\n']
+        out.append(f'static const char *const EnumNames_{enum.name}[{nameCount}] = {{\n')
+        out.extend(self.denseNames(denseIndex, nameCount, enum.protect))
+        out.append('};\n')
+        out.append(f'static const EnumStringRange EnumRanges_{enum.name}[{len(ranges)}] = {{\n')
+        out.extend(f'    {{{first}, {count}, {index}}},\n' for (first, count, index) in ranges)
+        out.append('};\n')
+        out.append(f'static const struct {{ EnumNameEntry entries[{len(entries)}]; int32_t displacements[{len(entries)}]; }} EnumHash_{enum.name} = {{\n')
+        out.extend(self.nameEntries(entries, enum.protect))
+        out.append('};\n')
+        out.append(f'''static inline const char *EnumToString_{enum.name}({enum.name} value) {{
+    return EnumStringFromRanges(EnumRanges_{enum.name}, {len(ranges)}, EnumNames_{enum.name}, (int64_t)value);
+}}
+static inline bool EnumFromString_{enum.name}(const char *name, {enum.name} *value) {{
+    const EnumNameEntry *entry = &EnumHash_{enum.name}.entries[EnumStringSlot(EnumHash_{enum.name}.displacements, {len(entries)}, name)];
+    if (entry->name == NULL || strcmp(entry->name, name) != 0) return false;
+    *value = ({enum.name})entry->value;
+    return true;
+}}
+''')
+        return protected(enum.protect, out)
+
+    def generateBitmask(self, bitmask: Bitmask) -> list[str]:
+        # Single bits by position, and zero or multiple bit values by value
+        bitNames = {}
+        otherNames = {}
+        for flag in bitmask.flags:
+            if flag.bitpos is not None and not flag.multiBit:
+                bitNames.setdefault(flag.bitpos, (flag.name, flag.protect))
+            else:
+                otherNames.setdefault(flag.value, (flag.name, flag.protect))
+        bitCount = max(bitNames) + 1 if bitNames else 0
+
+        entries = list({name: (name, f'{flag.value}ULL', flag.protect)
+                        for flag in bitmask.flags for name in [flag.name, *flag.aliases]}.values())
+
+        out = [f'// {bitmask.name}\n']
+        out.append(f'static const char *const FlagBitNames_{bitmask.name}[{max(bitCount, 1)}] = {{\n')
+        out.extend(self.denseNames(bitNames, max(bitCount, 1), bitmask.protect))
+        out.append('};\n')
+        out.append(f'static const FlagNameEntry FlagValueNames_{bitmask.name}[{max(len(otherNames), 1)}] = {{\n')
+        for (value, (name, protect)) in sorted(otherNames.items()):
+            out.extend(protected(protect if protect != bitmask.protect else None,
+                                      [f'    {{"{name}", {value}ULL}},\n'], ['    {NULL, 0},\n']))
+        if not otherNames:
+            out.append('    {NULL, 0},\n')
+        out.append('};\n')
+        out.append(f'static const struct {{ FlagNameEntry entries[{len(entries)}]; int32_t displacements[{len(entries)}]; }} FlagHash_{bitmask.name} = {{\n')
+        out.extend(self.nameEntries(entries, bitmask.protect))
+        out.append('};\n')
+        out.append(f'''static inline const char *FlagBitToString_{bitmask.name}({bitmask.name} value) {{
+    return FlagStringFromBits(FlagBitNames_{bitmask.name}, {bitCount}, FlagValueNames_{bitmask.name}, {len(otherNames)}, (uint64_t)value);
+}}
+static inline bool FlagBitFromString_{bitmask.name}(const char *name, {bitmask.name} *value) {{
+    const FlagNameEntry *entry = &FlagHash_{bitmask.name}.entries[EnumStringSlot(FlagHash_{bitmask.name}.displacements, {len(entries)}, name)];
+    if (entry->name == NULL || strcmp(entry->name, name) != 0) return false;
+    *value = ({bitmask.name})entry->value;
+    return true;
+}}
+''')
+        return protected(bitmask.protect, out)
+
+    def generate(self):
+        out = []
+        out.append(f'''// *** THIS FILE IS GENERATED - DO NOT EDIT ***
+// See {os.path.basename(__file__)} for modifications
+
+/*
+** Copyright 2026 The Khronos Group Inc.
+**
+** SPDX-License-Identifier: Apache-2.0
+*/
+
+#ifndef VK_ENUM_STRING_TABLES_H_
+#define VK_ENUM_STRING_TABLES_H_ 1
+
+// Conversions between the names and values of every enum and flag bit:
+//   const char *EnumToString_<enum>(<enum> value) - NULL if unknown
+//   bool EnumFromString_<enum>(const char *name, <enum> *value)
+//   const char *FlagBitToString_<bits>(<bits> value) - NULL if unknown
+//   bool FlagBitFromString_<bits>(const char *name, <bits> *value)
+// Aliases are accepted when converting from names. Include the platform
+// headers, or define the VK_USE_PLATFORM_* macros, before this header to
+// enable the tables of platform-specific types.
+
+#include <stdbool.h>
+#include <stdint.h>
+#include <string.h>
+#include <vulkan/vulkan.h>
+
+#ifdef __cplusplus
+extern "C" {{
+#endif
+
+typedef struct EnumStringRange {{
+    int64_t first;
+    uint32_t count;
+    uint32_t index;
+}} EnumStringRange;
+
+typedef struct EnumNameEntry {{
+    const char *name;
+    int32_t value;
+}} EnumNameEntry;
+
+typedef struct FlagNameEntry {{
+    const char *name;
+    uint64_t value;
+}} FlagNameEntry;
+
+{cStringHash('EnumString')}
+static inline const char *EnumStringFromRanges(const EnumStringRange *ranges, uint32_t rangeCount,
+                                               const char *const *names, int64_t value) {{
+    // Last range starting at or before value
+    uint32_t low = 0, high = rangeCount;
+    while (low < high) {{
+        uint32_t mid = low + (high - low) / 2;
+        if (ranges[mid].first <= value) {{
+            low = mid + 1;
+        }} else {{
+            high = mid;
+        }}
+    }}
+    if (low == 0) return NULL;
+    const EnumStringRange *range = &ranges[low - 1];
+    if ((uint64_t)(value - range->first) >= range->count) return NULL;
+    return names[range->index + (value - range->first)];
+}}
+
+static inline const char *FlagStringFromBits(const char *const *bitNames, uint32_t bitCount,
+                                             const FlagNameEntry *values, uint32_t valueCount, uint64_t value) {{
+    if (value != 0 && (value & (value - 1)) == 0) {{
+        uint32_t bit = 0;
+        while (!(value & 1)) {{
+            value >>= 1;
+            ++bit;
+        }}
+        return bit < bitCount ? bitNames[bit] : NULL;
+    }}
+    for (uint32_t i = 0; i < valueCount; ++i) {{
+        if (values[i].name != NULL && values[i].value == value) return values[i].name;
+    }}
+    return NULL;
+}}
+
+''')
+        for enum in sorted(self.vk.enums.values()):
+            if enum.fields:
+                out.extend(self.generateEnum(enum))
+                out.append('\n')
+        for bitmask in sorted(self.vk.bitmasks.values()):
+            if bitmask.flags:
+                out.extend(self.generateBitmask(bitmask))
+                out.append('\n')
+
+        out.append('''#ifdef __cplusplus
+}
+#endif
+
+#endif // VK_ENUM_STRING_TABLES_H_
+''')
+        self.write(''.join(out))
+
+if __name__ == '__main__':
+    defaultXml = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'xml', 'vk.xml'))
+
+    parser = argparse.ArgumentParser(description='Generate C enum and flag bit string conversion tables')
+    parser.add_argument('-o', default='.', help='directory to write the header to', dest='directory')
+    parser.add_argument('-filename', default='vk_enum_string_tables.h', help='name of the header to write')
+    parser.add_argument('-api', default='vulkan', choices=['vulkan', 'vulkansc', 'vulkanbase'],
+                        help='target API (default: vulkan)')
+    parser.add_argument('-xml', default=defaultXml, help='path to XML registry (default: xml/vk.xml)')
+    args = parser.parse_args()
+
+    (result,) = RunGenerators([(EnumStringGenerator, args.filename)], args.xml, args.directory,
+                              args.api, processes = 1)
+    if result.error is not None:
+        print(result.error, file=sys.stderr)
+        sys.exit(1)
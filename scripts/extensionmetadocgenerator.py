@@ -263,7 +263,7 @@ class Extension:
         else:
             filename = self.filename
 
-        fp = self.generator.newFile(filename)
+        fp = self.generator.newFile(filename, entities=[self.name])
 
         if not isRefpage:
             write('<<<', file=fp)
@@ -487,9 +487,9 @@ class ExtensionMetaDocOutputGenerator(OutputGenerator):
         # SPIR-V dependencies, generated in beginFile()
         self.SPV_deps = {}
 
-    def newFile(self, filename):
+    def newFile(self, filename, entities=()):
         self.logMsg('diag', '# Generating include file:', filename)
-        fp = open(filename, 'w', encoding='utf-8')
+        fp = self.openOutput(filename, entities=entities)
         write(self.genOpts.conventions.warning_comment, file=fp)
         return fp
 
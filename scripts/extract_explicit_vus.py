@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# Copyright 2026 The Khronos Group Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Extract explicit Valid Usage statements from the spec sources as JSON,
+without building the HTML specification.
+
+Usage: `extract_explicit_vus.py [-o file] [-j N] [paths]`
+
+- `-o` specifies the JSON file to write, default standard output
+- `-j` specifies the number of worker processes, default one per CPU
+- `paths` are asciidoc source files, or directories searched recursively
+  for them. Default is the `chapters` and `appendices` directories.
+
+Each statement is reported with its VUID, the entity the VUID names, the
+refpage it appears in, its AsciiDoc source text, and the ifdef::/ifndef::
+conditions surrounding it. Statements included from
+chapters/commonvalidity are reported at each include site, with
+attributes such as {refpage} substituted and the chain of include sites
+recorded in `includedFrom`.
+
+This uses doctransformer.py to recognize Valid Usage blocks, so it accepts
+the same markup as reflow.py.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import sys
+from reflib import loadFile, logWarn, logErr
+import doctransformer
+
+# Vulkan-specific - will consolidate into scripts/ like OpenXR soon
+sys.path.insert(0, 'xml')
+
+from apiconventions import APIConventions
+conventions = APIConventions()
+
+# Explicit Valid Usage statement, with the anchor captured
+vuStartPat = re.compile(r'^  [*] +\[\[(?P<vuid>VUID-[^\]]+)\]\] *(?P<tail>.*)$', re.DOTALL)
+
+# Explicit Valid Usage statement without an anchor
+vuUntaggedPat = re.compile(r'^  [*] ')
+
+# Conditional directives
+ifdefPat = re.compile(r'^(?P<directive>ifdef|ifndef)::(?P<attributes>[^\[]+)\[\]$')
+endifPat = re.compile(r'^endif::[^\[]*\[\]$')
+
+# Attribute definitions, such as ':refpage: vkCmdDraw'
+attributePat = re.compile(r'^:(?P<name>[\w-]+):( +(?P<value>.*))?$')
+
+# Refpage open block attributes
+refpagePat = re.compile(r'^\[open,(.*,)?refpage=\'(?P<refpage>[^\']+)\'')
+
+# Include of a file of common Valid Usage statements
+commonIncludePat = re.compile(r'^include::\{chapters\}/(?P<path>(.*/)?commonvalidity/[\w.-]+)\[\]$')
+
+# Attribute reference
+attributeRefPat = re.compile(r'\{(?P<name>[\w-]+)\}')
+
+
+class ExplicitVUCallbacks:
+    """Transformer callback object collecting explicit Valid Usage
+    statements.
+
+    Used with VUExtractor, which also reports the lines ending paragraphs
+    (directives, attributes and includes) through onLine()."""
+
+    def __init__(self, filename):
+        self.filename = filename
+        """name of the file being read"""
+
+        self.items = []
+        """list of ('vu', dict) for each statement and ('include', dict)
+        for each include of common Valid Usage, in file order"""
+
+        self.conditions = []
+        """stack of {'directive', 'attributes'} for enclosing conditionals"""
+
+        self.attributes = {}
+        """attributes defined so far in this file"""
+
+        self.refpage = None
+        """refpage of the current open block, if any"""
+
+        self.currentVU = None
+        """statement whose text is still being accumulated"""
+
+        self.paraLine = None
+        """line number of the first line of the current paragraph"""
+
+    def transformParagraph(self, para, state):
+        if state.isVU:
+            self.addVUParagraph(para, state)
+        else:
+            self.currentVU = None
+        return para
+
+    def onEmbeddedVUConditional(self, state):
+        pass
+
+    def addVUParagraph(self, para, state):
+        lines = [line.strip() for line in para]
+        match = vuStartPat.match(para[0])
+        if match is not None:
+            lines[0] = match.group('tail').strip()
+            self.currentVU = {
+                'vuid': match.group('vuid'),
+                'refpage': self.refpage,
+                'text': [line for line in lines if line],
+                'conditions': list(self.conditions),
+                'attributes': dict(self.attributes),
+                'file': self.filename,
+                'line': self.paraLine,
+            }
+            self.items.append(('vu', self.currentVU))
+        elif vuUntaggedPat.match(para[0]):
+            logWarn(f'{self.filename}:{self.paraLine}:',
+                    'Valid Usage statement without a VUID found')
+            self.currentVU = None
+        elif self.currentVU is not None:
+            # Nested bullet point or continuation after a conditional
+            self.currentVU['text'].extend(lines)
+
+    def onLine(self, line, state):
+        """Track a line which ended a paragraph."""
+        text = line.rstrip('\n')
+
+        match = ifdefPat.match(text)
+        if match is not None:
+            self.conditions.append({'directive': match.group('directive'),
+                                    'attributes': match.group('attributes')})
+        elif endifPat.match(text):
+            if self.conditions:
+                self.conditions.pop()
+            else:
+                logWarn(f'{self.filename}:{state.lineNumber}: unmatched {text}')
+
+        match = attributePat.match(text)
+        if match is not None:
+            self.attributes[match.group('name')] = match.group('value') or ''
+
+        match = refpagePat.match(text)
+        if match is not None:
+            self.refpage = match.group('refpage')
+        elif state.isOpenBlockDelimiter(text) and state.blockStack[-1] == line:
+            # The refpage ends with its open block. This is called before
+            # the transformer pops the block, as for its apiName.
+            self.refpage = None
+
+        # Conditionals and comments inside a statement are part of its text
+        if self.currentVU is not None and state.vuStack[-1]:
+            if ifdefPat.match(text) or endifPat.match(text):
+                self.currentVU['text'].append(text)
+            elif doctransformer.blockTransform.match(text) or text == doctransformer.blockCommonTransform.rstrip('\n'):
+                self.currentVU = None
+        else:
+            self.currentVU = None
+
+        match = commonIncludePat.match(text)
+        if match is not None and state.vuStack[-1]:
+            self.currentVU = None
+            self.items.append(('include', {
+                'path': match.group('path'),
+                'attributes': dict(self.attributes),
+                'refpage': self.refpage,
+                'conditions': list(self.conditions),
+                'file': self.filename,
+                'line': state.lineNumber,
+            }))
+
+
+class VUExtractor(doctransformer.DocTransformer):
+    """DocTransformer which reports every line ending a paragraph to the
+    callback, so conditionals and attributes can be tracked, and the line
+    starting each paragraph.
+
+    The paragraph is transformed once the following line is read, or at
+    the end of the file, so its first line cannot be derived from the
+    current line number."""
+
+    def addLine(self, line):
+        super().addLine(line)
+        if len(self.state.para) == 1:
+            self.callback.paraLine = self.state.lineNumber
+
+    def endPara(self, line):
+        super().endPara(line)
+        if line:
+            self.callback.onLine(line, self.state)
+
+
+def extractFile(filename):
+    """Return the list of items found in one file by ExplicitVUCallbacks."""
+    lines, _ = loadFile(filename)
+    if lines is None:
+        return []
+
+    callback = ExplicitVUCallbacks(filename)
+    transformer = VUExtractor(filename, outfile = None, callback = callback)
+    transformer.transformFile(lines)
+    return callback.items
+
+
+def substituteAttributes(text, attributes):
+    """Replace references to known attributes in text."""
+    return attributeRefPat.sub(lambda match: attributes.get(match.group('name'), match.group(0)), text)
+
+
+def expandItems(items, fileItems, commonPrefix, attributes = None, conditions = (), refpage = None, includeStack = (), includeSites = ()):
+    """Yield the statements for a list of file items, expanding includes of
+    common Valid Usage files in place.
+
+    - items - list of items from extractFile()
+    - fileItems - dictionary of items for every file, keyed by path
+    - commonPrefix - path which the {chapters} attribute refers to
+    - attributes, conditions, refpage - state at the include site when
+      expanding a common Valid Usage file
+    - includeStack - paths being expanded, to detect recursive includes
+    - includeSites - file and line of each include being expanded"""
+    for (kind, item) in items:
+        if kind == 'vu':
+            vu = dict(item)
+            vuAttributes = dict(attributes or {})
+            vuAttributes.update(vu.pop('attributes'))
+            vu['vuid'] = substituteAttributes(vu['vuid'], vuAttributes)
+            vu['text'] = substituteAttributes('\n'.join(vu['text']), vuAttributes)
+            vu['conditions'] = list(conditions) + vu['conditions']
+            if attributes is not None:
+                vu['refpage'] = refpage
+            vu['entity'] = vu['vuid'].split('-')[1]
+            vu['includedFrom'] = list(includeSites)
+            yield vu
+        else:
+            path = os.path.normpath(os.path.join(commonPrefix, item['path']))
+            if path in includeStack:
+                logWarn(f"{item['file']}:{item['line']}: recursive include of {path}")
+                continue
+            if path not in fileItems:
+                fileItems[path] = extractFile(path)
+            siteAttributes = dict(attributes or {})
+            siteAttributes.update(item['attributes'])
+            yield from expandItems(fileItems[path], fileItems, commonPrefix,
+                                   siteAttributes,
+                                   list(conditions) + item['conditions'],
+                                   item['refpage'] if attributes is None else refpage,
+                                   includeStack + (path,),
+                                   includeSites + ({'file': item['file'], 'line': item['line']},))
+
+
+def findSourceFiles(paths):
+    """Return a sorted list of asciidoc files in paths."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, subdirs, names in os.walk(path):
+                subdirs[:] = sorted(subdir for subdir in subdirs
+                                    if subdir.lower() not in conventions.spec_no_reflow_dirs)
+                files.extend(os.path.join(root, name) for name in names
+                             if name.endswith(conventions.file_suffix))
+        else:
+            files.append(path)
+    return sorted(os.path.normpath(file) for file in files)
+
+
+def extractVUs(paths, commonPrefix = 'chapters', processes = None):
+    """Return the list of explicit Valid Usage statements in paths.
+
+    Files are parsed in parallel across processes worker processes, and
+    the statements returned in file order.
+
+    - paths - asciidoc files, or directories to search for them
+    - commonPrefix - directory the {chapters} attribute refers to
+    - processes - number of worker processes, default one per CPU"""
+    files = findSourceFiles(paths)
+
+    if processes == 1:
+        results = map(extractFile, files)
+        fileItems = dict(zip(files, results))
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            fileItems = dict(zip(files, pool.imap(extractFile, files, chunksize = 4)))
+
+    commonDir = os.path.normpath(os.path.join(commonPrefix, 'commonvalidity'))
+    vus = []
+    for file in files:
+        # Common Valid Usage files are only reported where they are included
+        if os.path.dirname(file) == commonDir:
+            continue
+        vus.extend(expandItems(fileItems[file], fileItems, commonPrefix))
+    return vus
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('-o', action='store', dest='outFile',
+                        default=None,
+                        help='Write JSON to the specified file instead of standard output')
+    parser.add_argument('-j', action='store', dest='processes', type=int,
+                        default=None,
+                        help='Number of worker processes (default: one per CPU)')
+    parser.add_argument('-chapters', action='store', dest='chapters',
+                        default='chapters',
+                        help='Directory the {chapters} attribute refers to (default: chapters)')
+    parser.add_argument('paths', metavar='path', nargs='*',
+                        default=['chapters', 'appendices'],
+                        help='asciidoc files or directories to extract Valid Usage from')
+
+    args = parser.parse_args()
+
+    for path in args.paths:
+        if not os.path.exists(path):
+            logErr('No such file or directory:', path)
+
+    vus = extractVUs(args.paths, commonPrefix = args.chapters, processes = args.processes)
+
+    output = json.dumps({'validation': vus}, indent = 2) + '\n'
+    if args.outFile is None:
+        sys.stdout.write(output)
+    else:
+        with open(args.outFile, 'w', encoding='utf-8') as fp:
+            fp.write(output)
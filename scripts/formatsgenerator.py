@@ -5,7 +5,6 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from generator import OutputGenerator, write
-from parse_dependency import evaluateDependency
 from spec_tools.util import getElemName
 
 import pdb
@@ -42,18 +41,15 @@ class FormatsOutputGenerator(OutputGenerator):
 
     def evaluateFormatCondition(self, format_name):
         """Evaluate condition under which a format should be emitted.
-           Returns (condition, result) where condition is the dependency
-           string, result is a Boolean
+           Returns the Condition from the condition table, or None if the
+           format has no condition and is always emitted.
 
            - format_name - format name"""
 
-        if format_name in self.format_conditions and self.format_conditions[format_name] is not None:
-            condition = self.format_conditions[format_name]
-            result = evaluateDependency(condition, lambda name: name in self.registry.genFeatures.keys())
-            return (condition, result)
-        else:
-            # No condition, so always include this format
-            return (None, True)
+        condition = self.format_conditions.get(format_name)
+        if condition is None:
+            return None
+        return self.evaluateCondition(condition)
 
     def endFile(self):
 
@@ -85,9 +81,10 @@ class FormatsOutputGenerator(OutputGenerator):
             # Evaluate class condition if present
             class_condition_result = True
             if class_condition != None:
-                class_condition_result = evaluateDependency(class_condition, lambda name: name in self.registry.genFeatures.keys())
+                class_evaluated = self.evaluateCondition(class_condition)
+                class_condition_result = class_evaluated.result
                 if not class_condition_result:
-                    compatibility_table.append(f'// {class_condition} -> {class_condition_result}, not emitting class {class_name}')
+                    compatibility_table.append(f'{class_evaluated.comment}, not emitting class {class_name}')
 
             if class_condition_result:
                 def tableHeader(continued):
@@ -113,11 +110,11 @@ class FormatsOutputGenerator(OutputGenerator):
                 # First pass: determine which formats will be emitted
                 emitted_formats = []
                 for format in info['formats']:
-                    (condition, result) = self.evaluateFormatCondition(format)
-                    if result:
+                    condition = self.evaluateFormatCondition(format)
+                    if condition is None or condition.result:
                         emitted_formats.append(format)
                     else:
-                        compatibility_table.append(f'// {condition} -> {result}, not emitting ename:{format}')
+                        compatibility_table.append(f'{condition.comment}, not emitting ename:{format}')
 
                 num_emitted = len(emitted_formats)
 
@@ -148,11 +145,11 @@ class FormatsOutputGenerator(OutputGenerator):
             packed_table.append(f'  * <<formats-packed-{packed_size}-bit,Packed into {packed_size}-bit data types>>:')
             # Evaluate each format's condition and only emit if satisfied
             for format in formats:
-                (condition, result) = self.evaluateFormatCondition(format)
-                if result:
+                condition = self.evaluateFormatCondition(format)
+                if condition is None or condition.result:
                     packed_table.append(f'  ** ename:{format}')
                 else:
-                    packed_table.append(f'// {condition} -> {result}, not emitting ** ename:{format}')
+                    packed_table.append(f'{condition.comment}, not emitting ** ename:{format}')
         self.writeBlock(f'packed{self.file_suffix}', packed_table)
 
         # Generate SPIR-V Image Format Compatibility
@@ -165,9 +162,9 @@ class FormatsOutputGenerator(OutputGenerator):
         # Generate Plane Format Compatibility Table
         plane_format_table = []
         for format_name, plane_infos in self.plane_format.items():
-            (condition, result) = self.evaluateFormatCondition(format_name)
+            condition = self.evaluateFormatCondition(format_name)
 
-            if result:
+            if condition is None or condition.result:
                 plane_format_table.append(f'4+| *ename:{format_name}*')
                 for plane_info in plane_infos:
                     width_divisor = 'w'
@@ -182,7 +179,7 @@ class FormatsOutputGenerator(OutputGenerator):
                                                                                      width_divisor,
                                                                                      height_divisor))
             else:
-                plane_format_table.append(f'// {condition} -> {result}, not emitting 4+| *ename:{format_name}*')
+                plane_format_table.append(f'{condition.comment}, not emitting 4+| *ename:{format_name}*')
         self.writeBlock(f'planeformat{self.file_suffix}', plane_format_table)
 
         # Finish processing in superclass
@@ -197,7 +194,7 @@ class FormatsOutputGenerator(OutputGenerator):
 
         filename = f"{self.genOpts.directory}/{basename}"
         self.logMsg('diag', '# Generating include file:', filename)
-        with open(filename, 'w', encoding='utf-8') as fp:
+        with self.openOutput(filename) as fp:
             write(self.genOpts.conventions.warning_comment, file=fp)
 
             if len(contents) > 0:
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3 -i
+#
+# Copyright 2026 The Khronos Group Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import argparse
+import json
+import os
+import sys
+
+from base_generator import BaseGenerator, RunGenerators
+from lookuptables import buildValueBlocks, extensionBase, extensionBlockSize, protected, valueIndex
+from vulkan_object import Format, VulkanObject
+
+class FormatTable:
+    """Layout of the VkFormat values in a dense table, shared by the C and
+    JSON forms.
+
+    - entries - dict of table index to (value, name, protect, format),
+      where format is the Format of vk.formats, or None for values such
+      as VK_FORMAT_UNDEFINED which have no <format> element
+    - size - length of the table, including unused entries
+    - coreCount, blockStarts, blockCounts - as returned by
+      buildValueBlocks()
+    - classNames - sorted list of format class names, where formats of
+      the same class are compatible"""
+
+    def __init__(self, vk: VulkanObject):
+        fields = {}
+        for field in vk.enums['VkFormat'].fields:
+            fields.setdefault(field.value, field)
+
+        (self.coreCount, self.blockStarts, self.blockCounts) = buildValueBlocks(list(fields))
+        self.size = self.blockStarts[-1] + self.blockCounts[-1] if self.blockStarts else self.coreCount
+        self.entries = {valueIndex(value, self.blockStarts): (value, field.name, field.protect, vk.formats.get(field.name))
+                        for (value, field) in fields.items()}
+        self.classNames = sorted({format.className for format in vk.formats.values()})
+
+# Initializers of the unused components and planes of an entry. Every
+# member is initialized, so C++ compilers do not warn.
+emptyComponent = '{FORMAT_COMPONENT_NONE, 0, FORMAT_NUMERIC_NONE, 0}'
+emptyPlane = '{VK_FORMAT_UNDEFINED, 0, 0}'
+
+def blockExtent(format: Format) -> list[int]:
+    """Return the width, height and depth of a texel block of format."""
+    return [int(extent) for extent in format.blockExtent] or [1, 1, 1]
+
+class FormatTableGenerator(BaseGenerator):
+    """Generates a C header with a table of the properties of every
+    VkFormat from vk.formats, indexed by the VkFormat value in the same
+    way as the struct metadata tables, so lookups take two array
+    accesses. Entries of formats with a protect macro are only filled in
+    if the macro is defined."""
+
+    def __init__(self):
+        BaseGenerator.__init__(self)
+
+    def enumerants(self, prefix: str, names: list[str]) -> str:
+        """Return the enumerants of an enum with a NONE enumerant, then
+        one for each of names."""
+        return ''.join(f'    {prefix}_{name.upper().replace(" ", "_")} = {value},\n'
+                       for (value, name) in enumerate(['NONE', *names]))
+
+    def emptyEntry(self, name: (str | None), maxComponents: int, maxPlanes: int) -> str:
+        """Return the initializer of an unused table entry if name is None,
+        or of the entry of a value with no format properties."""
+        name = 'NULL' if name is None else f'"{name}"'
+        return (f'    {{{name}, NULL, 0, 0, 0, {{0, 0, 0}}, 0, 0, FORMAT_COMPRESSION_NONE, 0, 0, '
+                f'{{{", ".join([emptyComponent] * maxComponents)}}}, {{{", ".join([emptyPlane] * maxPlanes)}}}, NULL}},\n')
+
+    def formatEntry(self, name: str, format: (Format | None), table: FormatTable,
+                    maxComponents: int, maxPlanes: int) -> str:
+        """Return the initializer of the table entry of format."""
+        if format is None:
+            return self.emptyEntry(name, maxComponents, maxPlanes)
+
+        components = []
+        for component in format.components:
+            bits = 0 if component.bits == 'compressed' else int(component.bits)
+            plane = -1 if component.planeIndex is None else component.planeIndex
+            components.append(f'{{FORMAT_COMPONENT_{component.type}, {bits}, '
+                              f'FORMAT_NUMERIC_{component.numericFormat}, {plane}}}')
+        components += [emptyComponent] * (maxComponents - len(components))
+        planes = [f'{{{plane.compatible}, {plane.widthDivisor}, {plane.heightDivisor}}}' for plane in format.planes]
+        planes += [emptyPlane] * (maxPlanes - len(planes))
+        compression = 'NONE' if format.compressed is None else format.compressed.upper().replace(' ', '_')
+        spirvImageFormat = 'NULL' if format.spirvImageFormat is None else f'"{format.spirvImageFormat}"'
+
+        return (f'    {{"{name}", "{format.className}", {table.classNames.index(format.className)}, '
+                f'{format.blockSize}, {format.texelsPerBlock}, {{{", ".join(str(extent) for extent in blockExtent(format))}}}, '
+                f'{format.packed or 0}, {format.chroma or 0}, FORMAT_COMPRESSION_{compression}, '
+                f'{len(format.components)}, {len(format.planes)}, '
+                f'{{{", ".join(components)}}}, {{{", ".join(planes)}}}, {spirvImageFormat}}},\n')
+
+    def generate(self):
+        table = FormatTable(self.vk)
+        formats = list(self.vk.formats.values())
+        maxComponents = max((len(format.components) for format in formats), default = 1)
+        maxPlanes = max(1, max((len(format.planes) for format in formats), default = 1))
+        componentTypes = sorted({component.type for format in formats for component in format.components})
+        numericFormats = sorted({component.numericFormat for format in formats for component in format.components})
+        compressions = sorted({format.compressed for format in formats if format.compressed is not None})
+
+        out = []
+        out.append(f'''// *** THIS FILE IS GENERATED - DO NOT EDIT ***
+// See {os.path.basename(__file__)} for modifications
+
+/*
+** Copyright 2026 The Khronos Group Inc.
+**
+** SPDX-License-Identifier: Apache-2.0
+*/
+
+#ifndef VK_FORMAT_TABLES_H_
+#define VK_FORMAT_TABLES_H_ 1
+
+// Properties of every VkFormat, looked up by its value:
+//   const FormatInfo *GetFormatInfo(VkFormat format)
+//     - NULL if format is unknown, or is protected by a platform or beta
+//       macro which is not defined
+//   bool FormatsCompatible(VkFormat a, VkFormat b)
+//     - true if both formats belong to the same format class
+// Include the platform headers, or define the VK_USE_PLATFORM_* macros,
+// before this header to enable the entries of platform-specific formats.
+
+#include <stdbool.h>
+#include <stdint.h>
+#include <vulkan/vulkan.h>
+
+#ifdef __cplusplus
+extern "C" {{
+#endif
+
+#define FORMAT_MAX_COMPONENTS {maxComponents}
+#define FORMAT_MAX_PLANES {maxPlanes}
+
+typedef enum FormatComponentType {{
+{self.enumerants('FORMAT_COMPONENT', componentTypes)}}} FormatComponentType;
+
+typedef enum FormatNumericFormat {{
+{self.enumerants('FORMAT_NUMERIC', numericFormats)}}} FormatNumericFormat;
+
+typedef enum FormatCompression {{
+{self.enumerants('FORMAT_COMPRESSION', compressions)}}} FormatCompression;
+
+typedef struct FormatComponentInfo {{
+    uint8_t type;                 // FormatComponentType
+    uint8_t bits;                 // 0 if compressed
+    uint8_t numericFormat;        // FormatNumericFormat
+    int8_t planeIndex;            // -1 if not multi-planar
+}} FormatComponentInfo;
+
+typedef struct FormatPlaneInfo {{
+    VkFormat compatible;
+    uint8_t widthDivisor;
+    uint8_t heightDivisor;
+}} FormatPlaneInfo;
+
+typedef struct FormatInfo {{
+    const char *name;             // NULL for unused entries
+    const char *className;        // NULL if the format has no properties, such as VK_FORMAT_UNDEFINED
+    uint16_t classIndex;          // Index of className in FormatClassNames
+    uint8_t blockSize;            // Bytes per texel block
+    uint8_t texelsPerBlock;
+    uint8_t blockExtent[3];       // {{1, 1, 1}} if not block-compressed
+    uint8_t packed;               // Bits per packed element, 0 if not packed
+    uint16_t chroma;              // 420, 422 or 444, 0 if not subsampled
+    uint8_t compression;          // FormatCompression
+    uint8_t componentCount;
+    uint8_t planeCount;
+    FormatComponentInfo components[FORMAT_MAX_COMPONENTS];
+    FormatPlaneInfo planes[FORMAT_MAX_PLANES];
+    const char *spirvImageFormat; // NULL if none
+}} FormatInfo;
+
+static const char *const FormatClassNames[{len(table.classNames)}] = {{
+''')
+        out.extend(f'    "{className}",\n' for className in table.classNames)
+        out.append('};\n\n')
+
+        out.append(f'static const FormatInfo FormatInfoTable[{max(table.size, 1)}] = {{\n')
+        for index in range(max(table.size, 1)):
+            if index not in table.entries:
+                out.append(self.emptyEntry(None, maxComponents, maxPlanes))
+                continue
+            (_, name, protect, format) = table.entries[index]
+            out.extend(protected(protect, [self.formatEntry(name, format, table, maxComponents, maxPlanes)],
+                                 [self.emptyEntry(None, maxComponents, maxPlanes)]))
+        out.append('};\n\n')
+
+        blockTotal = len(table.blockStarts)
+        out.append(f'static const uint32_t FormatInfoBlockStart[{max(blockTotal, 1)}] = {{\n')
+        out.extend(f'    {start},\n' for start in table.blockStarts or [0])
+        out.append('};\n')
+        out.append(f'static const uint16_t FormatInfoBlockCount[{max(blockTotal, 1)}] = {{\n')
+        out.extend(f'    {count},\n' for count in table.blockCounts or [0])
+        out.append('};\n\n')
+
+        out.append(f'''static inline const FormatInfo *GetFormatInfo(VkFormat format) {{
+    const FormatInfo *info;
+    uint32_t value = (uint32_t)format;
+    if (value < {table.coreCount}u) {{
+        info = &FormatInfoTable[value];
+    }} else if (value >= {extensionBase}u) {{
+        uint32_t block = (value - {extensionBase}u) / {extensionBlockSize}u;
+        uint32_t offset = (value - {extensionBase}u) % {extensionBlockSize}u;
+        if (block >= {blockTotal}u || offset >= FormatInfoBlockCount[block]) return NULL;
+        info = &FormatInfoTable[FormatInfoBlockStart[block] + offset];
+    }} else {{
+        return NULL;
+    }}
+    return info->name != NULL ? info : NULL;
+}}
+
+static inline bool FormatsCompatible(VkFormat a, VkFormat b) {{
+    const FormatInfo *infoA = GetFormatInfo(a);
+    const FormatInfo *infoB = GetFormatInfo(b);
+    if (infoA == NULL || infoB == NULL || infoA->className == NULL || infoB->className == NULL) return false;
+    return infoA->classIndex == infoB->classIndex;
+}}
+
+#ifdef __cplusplus
+}}
+#endif
+
+#endif // VK_FORMAT_TABLES_H_
+''')
+        self.write(''.join(out))
+
+class FormatJsonGenerator(BaseGenerator):
+    """Generates the table of FormatTableGenerator as compact JSON, for
+    tools not written in C. 'formats' is indexed in the same way as the C
+    table, with null for unused entries:
+
+    - values below 'extensionBase' index 'formats' directly
+    - other values index it at blockStarts[block] + offset, where block
+      and offset are the quotient and remainder of (value -
+      extensionBase) / extensionBlockSize, if offset < blockCounts[block]"""
+
+    def __init__(self):
+        BaseGenerator.__init__(self)
+
+    def formatRecord(self, value: int, name: str, protect: (str | None), format: (Format | None)) -> dict:
+        record = {'name': name, 'value': value}
+        if protect is not None:
+            record['protect'] = protect
+        if format is None:
+            return record
+        record.update({
+            'className': format.className,
+            'blockSize': format.blockSize,
+            'texelsPerBlock': format.texelsPerBlock,
+            'blockExtent': blockExtent(format),
+            'packed': format.packed,
+            'chroma': format.chroma,
+            'compressed': format.compressed,
+            'components': [{'type': component.type,
+                            'bits': component.bits if component.bits == 'compressed' else int(component.bits),
+                            'numericFormat': component.numericFormat,
+                            'planeIndex': component.planeIndex} for component in format.components],
+            'planes': [{'index': plane.index,
+                        'widthDivisor': plane.widthDivisor,
+                        'heightDivisor': plane.heightDivisor,
+                        'compatible': plane.compatible} for plane in format.planes],
+            'spirvImageFormat': format.spirvImageFormat,
+        })
+        return record
+
+    def generate(self):
+        table = FormatTable(self.vk)
+        formats = [None] * table.size
+        for (index, entry) in table.entries.items():
+            formats[index] = self.formatRecord(*entry)
+
+        self.write(json.dumps({
+            'extensionBase': extensionBase,
+            'extensionBlockSize': extensionBlockSize,
+            'coreCount': table.coreCount,
+            'blockStarts': table.blockStarts,
+            'blockCounts': table.blockCounts,
+            'formats': formats,
+        }, separators = (',', ':')))
+
+if __name__ == '__main__':
+    defaultXml = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'xml', 'vk.xml'))
+
+    parser = argparse.ArgumentParser(description='Generate C and JSON tables of VkFormat properties')
+    parser.add_argument('-o', default='.', help='directory to write the tables to', dest='directory')
+    parser.add_argument('-filename', default='vk_format_tables.h', help='name of the C header to write')
+    parser.add_argument('-json', default='vk_format_tables.json', help='name of the JSON file to write')
+    parser.add_argument('-api', default='vulkan', choices=['vulkan', 'vulkansc', 'vulkanbase'],
+                        help='target API (default: vulkan)')
+    parser.add_argument('-xml', default=defaultXml, help='path to XML registry (default: xml/vk.xml)')
+    args = parser.parse_args()
+
+    results = RunGenerators([(FormatTableGenerator, args.filename), (FormatJsonGenerator, args.json)],
+                            args.xml, args.directory, args.api, processes = 1)
+    errors = [result.error for result in results if result.error is not None]
+    for error in errors:
+        print(error, file=sys.stderr)
+    if errors:
+        sys.exit(1)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3 -i
+#
+# Copyright 2013-2026 The Khronos Group Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+from generator import GeneratorOptions, OutputGenerator
+
+# Registry callbacks forwarded to every sink of a FusedOutputGenerator
+fusedCallbacks = (
+    'genType',
+    'genGroup',
+    'genEnum',
+    'genCmd',
+    'genSpirv',
+    'genFormat',
+    'genSyncStage',
+    'genSyncAccess',
+    'genSyncPipeline',
+)
+
+
+class FusedGeneratorOptions(GeneratorOptions):
+    """FusedGeneratorOptions - subclass of GeneratorOptions.
+
+    The options of the fused generator itself control how the registry is
+    tagged and traversed, so the versions and extensions they select must
+    be the same as those of each sink. If requireCommandAliases is set,
+    sinks whose own options do not set it are shielded from the commands
+    it adds. Output options such as directory and filename are taken from
+    the options of each sink."""
+
+    def __init__(self, sinks=(), **kwargs):
+        """Constructor.
+
+        - sinks - list of (OutputGenerator subclass, GeneratorOptions)
+          pairs, one for each target generated from the traversal
+
+        Additional parameters are as for GeneratorOptions."""
+
+        GeneratorOptions.__init__(self, **kwargs)
+
+        self.sinks = list(sinks)
+        """list of (generator class, options) pairs"""
+
+
+class FusedOutputGenerator(OutputGenerator):
+    """FusedOutputGenerator - subclass of OutputGenerator.
+    Generates several targets from a single traversal of the registry, by
+    forwarding every callback to one generator per target. Each sink
+    writes its own files, as it would when run on its own.
+
+    The sinks share the feature dictionary built by the registry and the
+    registry-derived type information and conditions cached by
+    OutputGenerator, so that is only computed once.
+
+    ---- methods ----
+    FusedOutputGenerator(errFile, warnFile, diagFile) - args as for
+      OutputGenerator. Sinks are created from genOpts.sinks.
+    ---- methods overriding base class ----
+    setRegistry(registry)
+    beginFile(genOpts)
+    endFile()
+    beginFeature(interface, emit)
+    endFeature()
+    gen*(...) for each registry callback"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sinkArgs = (args, kwargs)
+        self.sinks = None
+        """list of (generator, options) pairs, created from genOpts.sinks"""
+        self.aliasRequiredCmds = set()
+        """names of commands only required through command aliases"""
+
+    def makeSinks(self):
+        """Create the sink generators, if not done already."""
+        if self.sinks is None:
+            (args, kwargs) = self.sinkArgs
+            self.sinks = [(createGenerator(*args, **kwargs), options)
+                          for (createGenerator, options) in self.genOpts.sinks]
+
+    def shareState(self):
+        """Point every sink at the registry, feature dictionary, type
+        information caches and condition table of this generator."""
+        for (gen, options) in self.sinks:
+            gen.registry = self.registry
+            gen.featureDictionary = self.featureDictionary
+            gen.typeCategoryCache = self.typeCategoryCache
+            gen.handleAncestorsCache = self.handleAncestorsCache
+            gen.structAlwaysValidCache = self.structAlwaysValidCache
+            gen.conditionTable = self.conditionTable
+            options.registry = self.registry
+
+    def setRegistry(self, registry):
+        OutputGenerator.setRegistry(self, registry)
+        if self.genOpts is not None:
+            self.makeSinks()
+            for (gen, _) in self.sinks:
+                gen.setRegistry(registry)
+            self.shareState()
+
+    def forward(self, name, *args):
+        """Call the method name of each sink.
+
+        Sinks whose options do not set requireCommandAliases do not see
+        commands which are only required because one of their aliases is:
+        such commands are not passed to them, and are tagged as not
+        required while they are called."""
+        for (gen, options) in self.sinks:
+            hidden = () if options.requireCommandAliases else self.aliasRequiredCmds
+            if name == 'genCmd' and args[1] in hidden:
+                continue
+            for cmdname in hidden:
+                self.registry.cmddict[cmdname].required = False
+            try:
+                if name == 'beginFile':
+                    gen.beginFile(options)
+                else:
+                    getattr(gen, name)(*args)
+            finally:
+                for cmdname in hidden:
+                    self.registry.cmddict[cmdname].required = True
+
+    def beginFile(self, genOpts):
+        # Only the state of the base class is set up, since the fused
+        # generator writes no files of its own.
+        self.genOpts = genOpts
+        self.conventions = genOpts.conventions
+        self.clearRegistryCaches()
+
+        # Commands which the registry only tagged as required because
+        # the fused options set requireCommandAliases
+        self.aliasRequiredCmds = set()
+        if genOpts.requireCommandAliases:
+            self.aliasRequiredCmds = {name for (name, info) in self.registry.cmddict.items()
+                                      if info.required and not info.requiredWithoutAliases}
+
+        self.makeSinks()
+        for (gen, _) in self.sinks:
+            gen.registry = self.registry
+        self.forward('beginFile')
+        self.shareState()
+
+    def endFile(self):
+        self.forward('endFile')
+
+    def abortFile(self):
+        self.forward('abortFile')
+
+    def beginFeature(self, interface, emit):
+        OutputGenerator.beginFeature(self, interface, emit)
+        self.forward('beginFeature', interface, emit)
+
+    def endFeature(self):
+        self.forward('endFeature')
+        OutputGenerator.endFeature(self)
+
+
+def makeFusedCallback(name):
+    """Return a method forwarding the registry callback name to each
+    sink."""
+    def callback(self, *args):
+        self.forward(name, *args)
+    callback.__name__ = name
+    return callback
+
+
+for name in fusedCallbacks:
+    setattr(FusedOutputGenerator, name, makeFusedCallback(name))
@@ -12,6 +12,7 @@ import os
 import re
 import sys
 from collections import OrderedDict, namedtuple
+from apimaploader import loadApiMap
 from reflib import (findRefs, fixupRefs, loadFile, logDiag, logWarn, logErr,
                     printPageInfo, setLogFile, importFileModule)
 from reg import Registry
@@ -1138,9 +1139,10 @@ if __name__ == '__main__':
     setLogFile(True, False, results.diagFile)
     setLogFile(False, True, results.warnFile)
 
-    # Load the generated apimap module
-    sys.path.insert(0, results.genpath)
-    import apimap as api
+    # Load the generated API maps
+    api = loadApiMap(results.genpath)
+    if api is None:
+        logErr('Cannot load apimap.py or apimap.bin from', results.genpath)
 
     # Generate an inverse map from api.alias, which contains (alias =>
     # aliased API), to (aliased API, set(aliases of that API)).
@@ -7,18 +7,23 @@
 
 from __future__ import unicode_literals
 
+import hashlib
 import io
+import json
 import os
 import pdb
+import pickle
 import re
-import shutil
 import sys
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 try:
     from pathlib import Path
 except ImportError:
     from pathlib2 import Path  # type: ignore
 
+from parse_dependency import compileDependency, evaluateStack, protectLanguageC
 from spec_tools.util import getElemName, getElemType
 
 
@@ -77,7 +82,6 @@ def genProtectDirective(protect_str):
     # Check if this is a boolean expression (contains operators, parens, or negation)
     if any(c in protect_str for c in [',', '+', '(', ')', '!']):
         # Use the dependency parser to handle complex expressions
-        from parse_dependency import protectLanguageC
         try:
             protect_condition = protectLanguageC(protect_str)
             return (f'#if {protect_condition}', '#endif')
@@ -135,6 +139,369 @@ def regSortFeatures(orderedFeatureNames, features):
     # Sort by sortorder attribute
     orderedFeatureNames.sort(key=lambda name: features[name].sortorder)
 
+# Permission bits applied to newly created output files, matching what
+# open(filename, 'w') would produce. Read once, since os.umask() can only
+# be queried by changing it, and restored exactly as it was read.
+_umask = os.umask(0)
+os.umask(_umask)
+_newFileMode = 0o666 & ~_umask
+
+
+def encodeOutput(contents, newline=None):
+    """Return the bytes written for a generated file's contents.
+
+    - contents - string to encode
+    - newline - line ending to translate '\\n' to, as for open().
+      None uses the platform line ending."""
+    if newline is None:
+        newline = os.linesep
+    if newline not in ('', '\n'):
+        contents = contents.replace('\n', newline)
+    return contents.encode('utf-8')
+
+
+def replaceFileIfChanged(filename, contents, newline=None, touch=False):
+    """Write contents to a file only if they differ from what is already there.
+
+    Unchanged files are left alone so their modification time is
+    preserved, and build systems do not rebuild everything depending on
+    them. Changed files are written to a temporary file in the same
+    directory and moved over the target, so a reader never sees a
+    partially written file.
+
+    - filename - path of the file to write
+    - contents - string to write, or bytes already returned by
+      encodeOutput()
+    - newline - line ending to translate '\\n' to, as for open().
+      None (the default) uses the platform line ending. Ignored if
+      contents are bytes.
+    - touch - if True, update the modification time of an unchanged file.
+      Used for proxy targets like timeMarker, which build systems
+      compare against their dependencies.
+
+    Returns True if the file was written, False if it was unchanged."""
+    if isinstance(contents, bytes):
+        data = contents
+    else:
+        data = encodeOutput(contents, newline)
+
+    filename = os.fspath(filename)
+    try:
+        # Cheap size check first, only read the old contents if it matches
+        if os.path.getsize(filename) == len(data):
+            with open(filename, 'rb') as fp:
+                if fp.read() == data:
+                    if touch:
+                        os.utime(filename)
+                    return False
+        mode = os.stat(filename).st_mode & 0o7777
+    except OSError:
+        mode = _newFileMode
+
+    directory, basename = os.path.split(os.path.abspath(filename))
+    (fd, tempName) = tempfile.mkstemp(prefix=f'.{basename}.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(data)
+        os.chmod(tempName, mode)
+        os.replace(tempName, filename)
+    except BaseException:
+        if os.path.exists(tempName):
+            os.remove(tempName)
+        raise
+    return True
+
+
+class FileWriterError(RuntimeError):
+    """Error raised by AsyncFileWriter.flush() when writing files failed."""
+
+    def __init__(self, errors):
+        """Constructor
+
+        - errors - list of (filename, exception) tuples, in the order the
+          files were submitted"""
+        self.errors = errors
+        lines = [f'{filename}: {error}' for (filename, error) in errors]
+        super().__init__(f'Failed to write {len(errors)} file(s):\n' + '\n'.join(lines))
+
+
+class AsyncFileWriter:
+    """Write-behind service for generated files.
+
+    Files submitted with submit() are written by replaceFileIfChanged() on
+    a small pool of background threads, so generation does not wait on the
+    latency of each open/write/rename. Parent directories are created as
+    needed and remembered, so each directory is only created once.
+
+    Writes of the same file are completed in the order they were
+    submitted, so the last contents submitted are the ones left on disk.
+    flush() is the barrier: it waits for every pending write and reports
+    failures in the order the files were submitted, independent of which
+    thread finished first."""
+
+    def __init__(self, maxWorkers=4, maxPending=256, madeDirs=None):
+        """Constructor
+
+        - maxWorkers - number of writer threads
+        - maxPending - maximum number of files queued and not yet written.
+          submit() blocks once this is reached, bounding memory use.
+        - madeDirs - dictionary of directories already created, shared
+          with OutputGenerator.makeDir()"""
+        self.executor = ThreadPoolExecutor(max_workers=maxWorkers,
+                                           thread_name_prefix='AsyncFileWriter')
+        self.slots = threading.BoundedSemaphore(maxPending)
+        self.madeDirs = {} if madeDirs is None else madeDirs
+        self.pending = []
+        """List of (filename, Future) in submission order"""
+        self.lastWrite = {}
+        """Future of the most recent write of each file, by absolute path"""
+
+    def makeDir(self, path):
+        """Create a directory and its parents, if not already done."""
+        if path not in self.madeDirs:
+            os.makedirs(path, exist_ok=True)
+            self.madeDirs[path] = None
+
+    def write(self, filename, contents, newline, touch, previous):
+        if previous is not None:
+            # Earlier writes are always running or done by now, as the
+            # executor starts work in submission order
+            wait([previous])
+        self.makeDir(os.path.dirname(os.path.abspath(filename)))
+        return replaceFileIfChanged(filename, contents, newline=newline, touch=touch)
+
+    def submit(self, filename, contents, newline=None, touch=False):
+        """Queue contents to be written to filename.
+
+        Arguments are as for replaceFileIfChanged(). Returns a Future
+        whose result is the return value of replaceFileIfChanged()."""
+        path = os.path.abspath(filename)
+        self.slots.acquire()
+        try:
+            future = self.executor.submit(self.write, filename, contents, newline, touch,
+                                          self.lastWrite.get(path))
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        self.pending.append((filename, future))
+        self.lastWrite[path] = future
+        return future
+
+    def flush(self):
+        """Wait for all queued writes to complete.
+
+        Raises FileWriterError listing every failed write, in submission
+        order."""
+        pending = self.pending
+        self.pending = []
+        self.lastWrite = {}
+        errors = []
+        for (filename, future) in pending:
+            error = future.exception()
+            if error is not None:
+                errors.append((os.fspath(filename), error))
+        if errors:
+            raise FileWriterError(errors)
+
+    def shutdown(self):
+        """Flush queued writes and stop the writer threads."""
+        try:
+            self.flush()
+        finally:
+            self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+        return False
+
+
+class MemoryFileWriter:
+    """Stand-in for AsyncFileWriter which collects files in a dictionary
+    instead of writing them, for GeneratorOptions.outputFiles."""
+
+    def __init__(self, outputFiles, directory):
+        """Constructor
+
+        - outputFiles - dictionary receiving file contents, keyed by path
+          relative to directory. Text files are stored as strings and
+          binary files as bytes.
+        - directory - the generator's output directory"""
+        self.outputFiles = outputFiles
+        self.directory = directory
+
+    def makeDir(self, path):
+        pass
+
+    def submit(self, filename, contents, newline='\n', touch=False):
+        if isinstance(contents, bytes):
+            try:
+                contents = contents.decode('utf-8')
+            except UnicodeDecodeError:
+                pass  # Binary files, such as apimap.bin, are kept as bytes
+        path = Path(os.path.relpath(filename, self.directory)).as_posix()
+        self.outputFiles[path] = contents
+
+    def flush(self):
+        pass
+
+    def shutdown(self):
+        pass
+
+
+class ChangedFileWriter(io.StringIO):
+    """In-memory text file which is written out by replaceFileIfChanged()
+    when closed.
+
+    Used in place of open(filename, 'w') by generators writing include
+    files, so that regenerating unchanged files does not touch them.
+    Output is discarded if the `with` block exits with an exception."""
+
+    def __init__(self, filename, newline=None, touch=False, writer=None, onClose=None):
+        """Constructor
+
+        - filename - path of the file to write when closed
+        - newline, touch - passed to replaceFileIfChanged()
+        - writer - if not None, an AsyncFileWriter the file is handed to
+          when closed, instead of being written immediately
+        - onClose - if not None, called as onClose(filename, data) with
+          the encoded contents before they are written"""
+        super().__init__()
+        self.name = filename
+        self.newline = newline
+        self.touch = touch
+        self.writer = writer
+        self.onClose = onClose
+        self.changed = None
+        """True if closing wrote the file, False if it was unchanged.
+        Left as None when the write is queued on writer."""
+
+    def close(self):
+        if not self.closed:
+            data = encodeOutput(self.getvalue(), self.newline)
+            if self.onClose is not None:
+                self.onClose(self.name, data)
+            if self.writer is not None:
+                self.writer.submit(self.name, data, touch=self.touch)
+            else:
+                self.changed = replaceFileIfChanged(self.name, data, touch=self.touch)
+        super().close()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            # Drop partial output rather than writing it
+            super().close()
+        else:
+            self.close()
+        return False
+
+
+class DeclCache:
+    """Cache of rendered C declarations, shared by the generators of
+    several targets.
+
+    Keys are made by OutputGenerator.declCacheKey() from the element
+    rendered, the registry state it depends on, and the generator options
+    which affect formatting, so targets with different options do not share
+    entries. Element contents are not part of the key; instead a cache is
+    tied to one loaded registry by its fingerprint, which is checked when
+    loading a saved cache."""
+
+    def __init__(self, fingerprint):
+        """Constructor
+
+        - fingerprint - string identifying the registry contents and the
+          options it was loaded with, and the generator code"""
+        self.fingerprint = fingerprint
+        self.entries = {}
+        """rendered declarations, keyed by declCacheKey()"""
+        self.added = {}
+        """entries added since the cache was created or loaded"""
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, value):
+        self.entries[key] = value
+        self.added[key] = value
+
+    def update(self, entries):
+        """Add entries, such as those added by another process."""
+        self.entries.update(entries)
+        self.added.update(entries)
+
+    @classmethod
+    def load(cls, filename, fingerprint):
+        """Return the cache saved in filename, or an empty cache if the file
+        does not exist or was saved for a different fingerprint."""
+        cache = cls(fingerprint)
+        try:
+            with open(filename, 'rb') as fp:
+                (savedFingerprint, entries) = pickle.load(fp)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+            return cache
+        if savedFingerprint == fingerprint:
+            cache.entries = entries
+        return cache
+
+    def save(self, filename):
+        """Save the cache to filename, if anything was added to it."""
+        if self.added:
+            replaceFileIfChanged(filename, pickle.dumps((self.fingerprint, self.entries),
+                                                        protocol=pickle.HIGHEST_PROTOCOL))
+            self.added = {}
+
+
+class Condition:
+    """A dependency expression evaluated against the versions and
+    extensions being generated.
+
+    - condition - the dependency expression
+    - result - True if the expression is satisfied
+    - comment - comment recording the result, for items not emitted"""
+
+    __slots__ = ('condition', 'result', 'comment')
+
+    def __init__(self, condition, result):
+        self.condition = condition
+        self.result = result
+        self.comment = f'// {condition} -> {result}'
+
+
+class ConditionTable:
+    """Conditions of the items of one generated file, such as formats and
+    synchronization stages, many of which share the same dependency
+    expression.
+
+    Each expression is parsed and evaluated only once. Evaluation tests
+    names for membership in the set of versions and extensions being
+    generated, which is taken from the registry on the first lookup,
+    after the registry has tagged them."""
+
+    def __init__(self):
+        self.supported = None
+        """frozenset of the names of versions and extensions generated"""
+        self.conditions = {}
+        """Condition for each expression"""
+
+    def lookup(self, condition, registry):
+        """Return the Condition for a dependency expression.
+
+        - condition - the dependency expression
+        - registry - Registry whose genFeatures are being generated"""
+        entry = self.conditions.get(condition)
+        if entry is None:
+            if self.supported is None:
+                self.supported = frozenset(registry.genFeatures)
+            result = evaluateStack(list(compileDependency(condition)), self.supported.__contains__)
+            entry = Condition(condition, result)
+            self.conditions[condition] = entry
+        return entry
+
+
 class MissingGeneratorOptionsError(RuntimeError):
     """Error raised when a Generator tries to do something that requires GeneratorOptions but it is None."""
 
@@ -192,6 +559,13 @@ class GeneratorOptions:
                  sortProcedure=regSortFeatures,
                  requireCommandAliases=False,
                  requireDepends=True,
+                 touchUnchanged=False,
+                 writerThreads=4,
+                 manifestFile=None,
+                 outputFiles=None,
+                 emitEntities=None,
+                 emitScope=None,
+                 declCache=None,
                 ):
         """Constructor.
 
@@ -239,6 +613,28 @@ class GeneratorOptions:
         as required dependencies.
         - requireDepends - whether to follow API dependencies when emitting
         APIs.
+        - touchUnchanged - whether to update the modification time of
+        filename when its regenerated contents are unchanged. Needed when
+        filename is a proxy build target, such as timeMarker.
+        - writerThreads - number of background threads used to write
+        additional files opened with OutputGenerator.openOutput(). 0
+        writes each file synchronously when it is closed.
+        - manifestFile - if not None, basename of a JSON manifest to write
+        in directory, listing every file generated with its content hash
+        and the registry entities it was generated from.
+        - outputFiles - if not None, a dictionary which receives every
+        generated file instead of writing it to disk, keyed by path
+        relative to directory. Nothing is written and no directories are
+        created.
+        - emitEntities - if not None, names of the commands, types and
+        enums to actually emit. All requested versions and extensions are
+        still processed, so everything else is tagged as it would be
+        without this option, but not emitted.
+        - emitScope - if not None, names of extensions or API versions.
+        Everything they require is added to emitEntities.
+        - declCache - if not None, a DeclCache of rendered C declarations,
+        which may be shared with other targets generated from the same
+        registry.
 
         Default is
           - core API versions
@@ -333,6 +729,30 @@ class GeneratorOptions:
         self.requireDepends = requireDepends
         """True if dependencies of API tags are transitively required."""
 
+        self.touchUnchanged = touchUnchanged
+        """True if filename is touched even when its contents are unchanged."""
+
+        self.writerThreads = writerThreads
+        """Number of background threads writing files opened with
+        OutputGenerator.openOutput(), or 0 to write synchronously."""
+
+        self.manifestFile = manifestFile
+        """basename of the output manifest to write, or None."""
+
+        self.outputFiles = outputFiles
+        """dictionary receiving generated file contents instead of the
+        filesystem, or None."""
+
+        self.emitEntities = emitEntities
+        """names of the only commands, types and enums to emit, or None."""
+
+        self.emitScope = emitScope
+        """names of extensions or versions whose required entities are
+        the only ones to emit, together with emitEntities, or None."""
+
+        self.declCache = declCache
+        """DeclCache of rendered C declarations, or None."""
+
     def emptyRegex(self, pat):
         """Substitute a regular expression which matches no version
         or extension names for None or the empty string."""
@@ -360,6 +780,21 @@ class OutputGenerator:
         'basetype': 'basetypes',
     }
 
+    # declFormatOptions - GeneratorOptions attributes which affect the
+    # formatting of C declarations, and so are part of DeclCache keys
+    declFormatOptions = (
+        'apicall',
+        'apientry',
+        'apientryp',
+        'alignFuncParam',
+        'misracstyle',
+        'misracppstyle',
+        'codeGenerator',
+        'genStructExtendsComment',
+        'genAliasMacro',
+        'aliasMacro',
+    )
+
     def breakName(self, name, msg):
         """Break into debugger if this is a special name"""
 
@@ -377,6 +812,11 @@ class OutputGenerator:
         - errFile, warnFile, diagFile - file handles to write errors,
           warnings, diagnostics to. May be None to not write."""
         self.outFile = None
+        self.fileWriter = None
+        """AsyncFileWriter used by openOutput(), or None."""
+        self.outputManifest = {}
+        """Manifest entries for files generated so far, keyed by path
+        relative to GeneratorOptions.directory."""
         self.errFile = errFile
         self.warnFile = warnFile
         self.diagFile = diagFile
@@ -398,6 +838,8 @@ class OutputGenerator:
         self.extBlockSize = 1000
         self.madeDirs = {}
 
+        self.clearRegistryCaches()
+
         # API dictionary, which may be loaded by the beginFile method of
         # derived generators.
         self.apidict = None
@@ -405,6 +847,9 @@ class OutputGenerator:
         # File suffix for generated files, set in beginFile below.
         self.file_suffix = ''
 
+        # Formatting part of DeclCache keys, set by declCacheKey().
+        self.declFormat = None
+
     def logMsg(self, level, *args):
         """Write a message of different categories to different
         destinations.
@@ -631,6 +1076,24 @@ class OutputGenerator:
             exit(1)
 
     def buildEnumCDecl(self, expand, groupinfo, groupName):
+        """Generate the C declaration for an enum, reusing it from
+        GeneratorOptions.declCache if possible"""
+        if self.genOpts is None:
+            raise MissingGeneratorOptionsError()
+
+        key = self.declCacheKey('enum', groupName, expand,
+                                tuple((elem.get('required'), elem.get('deprecated'))
+                                      for elem in groupinfo.elem.findall('enum')))
+        if key is None:
+            return self.computeEnumCDecl(expand, groupinfo, groupName)
+
+        decl = self.genOpts.declCache.get(key)
+        if decl is None:
+            decl = self.computeEnumCDecl(expand, groupinfo, groupName)
+            self.genOpts.declCache.set(key, decl)
+        return decl
+
+    def computeEnumCDecl(self, expand, groupinfo, groupName):
         """Generate the C declaration for an enum"""
         if self.genOpts is None:
             raise MissingGeneratorOptionsError()
@@ -932,14 +1395,77 @@ class OutputGenerator:
         """Create a directory, if not already done.
 
         Generally called from derived generators creating hierarchies."""
-        self.logMsg('diag', 'OutputGenerator::makeDir(', path, ')')
+        if self.genOpts is not None and self.genOpts.outputFiles is not None:
+            return
         if path not in self.madeDirs:
-            # This can get race conditions with multiple writers, see
+            self.logMsg('diag', 'OutputGenerator::makeDir(', path, ')')
+            # exist_ok avoids race conditions with multiple writers, see
             # https://stackoverflow.com/questions/273192/
-            if not os.path.exists(path):
-                os.makedirs(path)
+            os.makedirs(path, exist_ok=True)
             self.madeDirs[path] = None
 
+    def isEmitFiltered(self):
+        """Return True if only some entities are emitted, because of the
+        emitEntities or emitScope generator options.
+
+        Summary files covering every entity cannot be generated correctly
+        in that case, and should be left as they are."""
+        return self.genOpts.emitEntities is not None or self.genOpts.emitScope is not None
+
+    def openOutput(self, filename, entities=()):
+        """Open an additional output file, such as an include file.
+
+        Returns a ChangedFileWriter, which only replaces filename if its
+        contents change. When GeneratorOptions.writerThreads is nonzero,
+        the file is written in the background after it is closed; all
+        such writes are complete once endFile() returns.
+
+        - filename - path of the file to write
+        - entities - names of the registry entities the file is generated
+          from, recorded in the output manifest. Empty for files derived
+          from the registry as a whole."""
+        onClose = None
+        if self.genOpts.manifestFile is not None:
+            def onClose(name, data):
+                self.recordOutput(name, data, entities)
+        # Keep '\n' line endings for in-memory output on all platforms
+        newline = '\n' if self.genOpts.outputFiles is not None else None
+        return ChangedFileWriter(filename, newline=newline, writer=self.fileWriter, onClose=onClose)
+
+    def writeOutput(self, filename, data, touch=False):
+        """Write a complete output file, or store it in
+        GeneratorOptions.outputFiles if that is set.
+
+        - filename - path of the file to write
+        - data - bytes returned by encodeOutput()
+        - touch - passed to replaceFileIfChanged()"""
+        if self.genOpts.outputFiles is not None:
+            MemoryFileWriter(self.genOpts.outputFiles, self.genOpts.directory).submit(filename, data)
+        else:
+            replaceFileIfChanged(filename, data, touch=touch)
+
+    def recordOutput(self, filename, data, entities=()):
+        """Add a generated file to the output manifest.
+
+        - filename - path of the generated file
+        - data - bytes written to the file
+        - entities - names of the registry entities the file is generated from"""
+        path = Path(os.path.relpath(filename, self.genOpts.directory)).as_posix()
+        self.outputManifest[path] = {
+            'sha256': hashlib.sha256(data).hexdigest(),
+            'entities': sorted(set(entities)),
+        }
+
+    def writeManifest(self):
+        """Write the output manifest requested by GeneratorOptions.manifestFile."""
+        manifest = {
+            'generator': type(self).__name__,
+            'filename': self.genOpts.filename,
+            'files': self.outputManifest,
+        }
+        self.writeOutput(Path(self.genOpts.directory) / self.genOpts.manifestFile,
+                         encodeOutput(json.dumps(manifest, indent=2, sort_keys=True) + '\n', '\n'))
+
     def beginFile(self, genOpts):
         """Start a new interface file
 
@@ -953,27 +1479,56 @@ class OutputGenerator:
         self.should_insert_may_alias_macro = \
             self.genOpts.conventions.should_insert_may_alias_macro(self.genOpts)
         self.file_suffix = self.genOpts.conventions.file_suffix
+        self.declFormat = None
 
-        # Try to import the API dictionary, apimap.py, if it exists. Nothing
-        # in apimap.py cannot be extracted directly from the XML, and in the
-        # future we should do that.
+        # Try to load the API dictionary, apimap.py or its binary form, if it
+        # exists. Nothing in apimap.py cannot be extracted directly from the
+        # XML, and in the future we should do that.
         if self.genOpts.genpath is not None:
-            try:
-                sys.path.insert(0, self.genOpts.genpath)
-                import apimap
-                self.apidict = apimap
-            except ImportError:
-                self.apidict = None
+            from apimaploader import loadApiMap
+            self.apidict = loadApiMap(self.genOpts.genpath)
 
         self.conventions = genOpts.conventions
+        self.outputManifest = {}
+        self.clearRegistryCaches()
+
+        if self.genOpts.outputFiles is not None:
+            self.fileWriter = MemoryFileWriter(self.genOpts.outputFiles, self.genOpts.directory)
+        elif self.genOpts.writerThreads:
+            self.fileWriter = AsyncFileWriter(maxWorkers=self.genOpts.writerThreads,
+                                              madeDirs=self.madeDirs)
 
-        # Open a temporary file for accumulating output.
+        # Accumulate output in memory, it is only written to the target
+        # file by endFile() if it differs from the existing contents.
         if self.genOpts.filename is not None:
-            self.outFile = tempfile.NamedTemporaryFile(mode='w', encoding='utf-8', newline='\n', delete=False)
+            self.outFile = io.StringIO()
         else:
             self.outFile = sys.stdout
 
+    def abortFile(self):
+        """Clean up after generating the current file failed.
+
+        Called by Registry.apiGen() in place of, or after a failed,
+        endFile(). Files already queued on the writer threads are written
+        and the threads stopped, but the main output file is not written,
+        so the build system will try to generate it again."""
+        if self.fileWriter is not None:
+            fileWriter = self.fileWriter
+            self.fileWriter = None
+            try:
+                fileWriter.shutdown()
+            except FileWriterError as error:
+                # Report, but do not replace, the error which stopped generation
+                self.logMsg('warn', str(error))
+
     def endFile(self):
+        # Wait for additional output files before writing the main output
+        # file, which may be the build system's proxy for all of them.
+        if self.fileWriter is not None:
+            fileWriter = self.fileWriter
+            self.fileWriter = None
+            fileWriter.shutdown()
+
         if self.errFile:
             self.errFile.flush()
         if self.warnFile:
@@ -982,21 +1537,26 @@ class OutputGenerator:
             self.diagFile.flush()
         if self.outFile:
             self.outFile.flush()
-            if self.outFile != sys.stdout and self.outFile != sys.stderr:
-                self.outFile.close()
 
             if self.genOpts is None:
                 raise MissingGeneratorOptionsError()
 
-            # On successfully generating output, move the temporary file to the
-            # target file.
+            # On successfully generating output, replace the target file if
+            # its contents changed.
             if self.genOpts.filename is not None:
                 directory = Path(self.genOpts.directory)
-                if sys.platform == 'win32':
-                    if not Path.exists(directory):
-                        os.makedirs(directory)
-                shutil.copy(self.outFile.name, directory / self.genOpts.filename)
-                os.remove(self.outFile.name)
+                self.makeDir(self.genOpts.directory)
+                data = encodeOutput(self.outFile.getvalue(), '\n')
+                self.writeOutput(directory / self.genOpts.filename, data,
+                                 touch=self.genOpts.touchUnchanged)
+                if self.genOpts.manifestFile is not None:
+                    self.recordOutput(directory / self.genOpts.filename, data)
+
+            if self.genOpts.manifestFile is not None:
+                self.writeManifest()
+
+            if self.outFile != sys.stdout and self.outFile != sys.stderr:
+                self.outFile.close()
         self.genOpts = None
 
     def beginFeature(self, interface, emit):
@@ -1254,33 +1814,97 @@ class OutputGenerator:
 
         return None
 
+    def handleAncestors(self, typename):
+        """Return a tuple of the ancestors of a handle type, nearest first.
+        Cached per registry."""
+        ancestors = self.handleAncestorsCache.get(typename)
+        if ancestors is None:
+            parent = self.getHandleParent(typename)
+            if parent is None:
+                ancestors = ()
+            else:
+                ancestors = (parent,) + self.handleAncestors(parent)
+            self.handleAncestorsCache[typename] = ancestors
+        return ancestors
+
     def iterateHandleAncestors(self, typename):
         """Iterate through the ancestors of a handle type."""
-        current = self.getHandleParent(typename)
-        while current is not None:
-            yield current
-            current = self.getHandleParent(current)
+        yield from self.handleAncestors(typename)
 
     def getHandleAncestors(self, typename):
         """Get the ancestors of a handle object."""
-        return list(self.iterateHandleAncestors(typename))
+        return list(self.handleAncestors(typename))
 
     def getTypeCategory(self, typename):
         """Get the category of a type."""
+        try:
+            return self.typeCategoryCache[typename]
+        except KeyError:
+            pass
+
         if self.registry is None:
             raise MissingRegistryError()
 
+        category = None
         info = self.registry.typedict.get(typename)
-        if info is None:
+        if info is not None and info.elem is not None:
+            category = info.elem.get('category')
+        self.typeCategoryCache[typename] = category
+        return category
+
+    def declCacheKey(self, kind, name, *state):
+        """Return the GeneratorOptions.declCache key for a C declaration,
+        or None if there is no cache.
+
+        - kind - kind of declaration, such as 'struct'
+        - name - name of the element declared
+        - state - anything else the declaration depends on which may differ
+          between targets, such as 'required' attributes set by the
+          registry while generating"""
+        if self.genOpts.declCache is None:
             return None
-
-        elem = info.elem
-        if elem is not None:
-            return elem.get('category')
-        return None
+        if self.declFormat is None:
+            self.declFormat = (type(self).__name__,
+                               type(self.genOpts.conventions).__name__,
+                               self.should_insert_may_alias_macro,
+                               tuple(getattr(self.genOpts, option, None)
+                                     for option in self.declFormatOptions))
+        return (kind, name, self.declFormat, *state)
+
+    def clearRegistryCaches(self):
+        """Discard type information cached from the registry.
+
+        Called when the registry is set and at the start of each file,
+        since the registry is only complete once it has been loaded, and
+        isStructAlwaysValid() also depends on the conventions object.
+        Conditions are evaluated against the versions and extensions
+        tagged for the file being generated."""
+        self.typeCategoryCache = {}
+        self.handleAncestorsCache = {}
+        self.structAlwaysValidCache = {}
+        self.conditionTable = ConditionTable()
+
+    def evaluateCondition(self, condition):
+        """Return the Condition for a dependency expression, evaluated
+        against the versions and extensions being generated. Cached per
+        file.
+
+        - condition - the dependency expression"""
+        return self.conditionTable.lookup(condition, self.registry)
 
     def isStructAlwaysValid(self, structname):
-        """Try to do check if a structure is always considered valid (i.e. there is no rules to its acceptance)."""
+        """Try to do check if a structure is always considered valid (i.e. there is no rules to its acceptance).
+
+        Results are cached per registry, since this recurses through
+        member structures and is called for most parameters and members."""
+        alwaysValid = self.structAlwaysValidCache.get(structname)
+        if alwaysValid is None:
+            alwaysValid = self.computeStructAlwaysValid(structname)
+            self.structAlwaysValidCache[structname] = alwaysValid
+        return alwaysValid
+
+    def computeStructAlwaysValid(self, structname):
+        """Uncached implementation of isStructAlwaysValid()."""
         # A conventions object is required for this call.
         if not self.conventions:
             raise RuntimeError("To use isStructAlwaysValid, be sure your options include a Conventions object.")
@@ -1378,10 +2002,29 @@ class OutputGenerator:
         `<command>` or `type category="funcpointer"` Element, as a
         two-element list of strings [prototype, typedef].
 
+        These are reused from GeneratorOptions.declCache if possible.
+
         - cmd - Element containing a command or funcpointer tag"""
         if self.genOpts is None:
             raise MissingGeneratorOptionsError()
 
+        key = self.declCacheKey('cdecls', cmd.tag, cmd.findtext('proto/name'))
+        if key is None:
+            return self.computeCDecls(cmd)
+
+        decls = self.genOpts.declCache.get(key)
+        if decls is None:
+            decls = tuple(self.computeCDecls(cmd))
+            self.genOpts.declCache.set(key, decls)
+        return list(decls)
+
+    def computeCDecls(self, cmd):
+        """Return C prototype and function pointer typedef for a
+        `<command>` or `type category="funcpointer"` Element, as
+        for makeCDecls(), without using the cache."""
+        if self.genOpts is None:
+            raise MissingGeneratorOptionsError()
+
         isfuncpointer = (cmd.tag == 'type')
 
         proto = cmd.find('proto')
@@ -1476,3 +2119,4 @@ class OutputGenerator:
 
     def setRegistry(self, registry):
         self.registry = registry
+        self.clearRegistryCaches()
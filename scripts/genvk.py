@@ -5,6 +5,8 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import argparse
+import hashlib
+import multiprocessing
 import os
 import pdb
 import re
@@ -12,14 +14,24 @@ import sys
 import copy
 import time
 import xml.etree.ElementTree as etree
+from pathlib import Path
 
 sys.path.append(os.path.abspath(os.path.dirname(__file__)))
 
 from cgenerator import CGeneratorOptions, COutputGenerator
+from generator import DeclCache, OutputGenerator
 from reflib import logDiag, logWarn, logErr, setLogFile
 from reg import Registry
 from apiconventions import APIConventions
 
+# Target sets, each a list of targets generated together by genTargetSet()
+targetSets = {}
+
+# Error/warning and diagnostic files for generators created by genTarget().
+# Replaced from the command line when run as a script.
+errWarn = sys.stderr
+diag = None
+
 # Simple timer functions
 startTime = None
 
@@ -53,8 +65,9 @@ def makeGenOpts(args):
     parameters:
 
     args is a parsed argument object; see below for the fields that are used."""
-    global genOpts
+    global genOpts, targetSets
     genOpts = {}
+    targetSets = {}
 
     # Default class of extensions to include, or None
     defaultExtensions = args.defaultExtensions
@@ -95,6 +108,9 @@ def makeGenOpts(args):
     # Generate MISRA C++-friendly headers
     misracppstyle = args.misracppstyle
 
+    # Number of worker processes for generators supporting them
+    processes = args.processes
+
     # Descriptive names for various regexp patterns used to select
     # versions and extensions
     allFormats = allSpirv = allFeatures = allExtensions = r'.*'
@@ -150,12 +166,14 @@ def makeGenOpts(args):
         from jsgenerator import JSOutputGenerator
         from pygenerator import PyOutputGenerator
         from rubygenerator import RubyOutputGenerator
+        from scriptgenerator import ScriptMapsOutputGenerator
         from validitygenerator import ValidityOutputGenerator
         from hostsyncgenerator import HostSynchronizationOutputGenerator
         from extensionmetadocgenerator import (ExtensionMetaDocGeneratorOptions,
                                             ExtensionMetaDocOutputGenerator)
         from interfacedocgenerator import InterfaceDocGenerator
         from featurerequirementsgenerator import FeatureRequirementsDocGenerator
+        from fusedgenerator import FusedGeneratorOptions, FusedOutputGenerator
         from spirvcapgenerator import SpirvCapabilityOutputGenerator
         from formatsgenerator import FormatsOutputGenerator
         from syncgenerator import SyncOutputGenerator
@@ -172,6 +190,7 @@ def makeGenOpts(args):
             DocGeneratorOptions(
                 conventions       = conventions,
                 filename          = 'timeMarker',
+                touchUnchanged    = True,
                 directory         = directory,
                 genpath           = genpath,
                 apiname           = defaultAPIName,
@@ -250,6 +269,28 @@ def makeGenOpts(args):
                 reparentEnums     = False)
             ]
 
+        # apimap.py, apimap.cjs, and apimap.rb written from a single
+        # traversal of the registry
+        genOpts['apimaps'] = [
+            ScriptMapsOutputGenerator,
+            FusedGeneratorOptions(
+                conventions       = conventions,
+                sinks             = [genOpts[target] for target in
+                                     ('apimap.py', 'apimap.cjs', 'apimap.rb')],
+                filename          = None,
+                directory         = directory,
+                genpath           = None,
+                apiname           = defaultAPIName,
+                mergeInternalApis = mergeInternalApis,
+                profile           = None,
+                versions          = featuresPat,
+                emitversions      = featuresPat,
+                defaultExtensions = None,
+                addExtensions     = addExtensionsPat,
+                removeExtensions  = removeExtensionsPat,
+                emitExtensions    = emitExtensionsPat)
+            ]
+
         # API validity files for spec
         #
         # requireCommandAliases is set to True because we need validity files
@@ -260,6 +301,7 @@ def makeGenOpts(args):
             DocGeneratorOptions(
                 conventions       = conventions,
                 filename          = 'timeMarker',
+                touchUnchanged    = True,
                 directory         = directory,
                 genpath           = None,
                 apiname           = defaultAPIName,
@@ -272,6 +314,31 @@ def makeGenOpts(args):
                 removeExtensions  = removeExtensionsPat,
                 emitExtensions    = emitExtensionsPat,
                 requireCommandAliases = True,
+                processes         = processes,
+                )
+            ]
+
+        # Implicit valid usage statements as JSON, in the same schema as the
+        # validusage.json produced by the HTML spec build.
+        genOpts['implicitvalidusage.json'] = [
+            ValidityOutputGenerator,
+            DocGeneratorOptions(
+                conventions       = conventions,
+                filename          = 'implicitvalidusage.json',
+                directory         = directory,
+                genpath           = None,
+                apiname           = defaultAPIName,
+                mergeInternalApis = mergeInternalApis,
+                profile           = None,
+                versions          = featuresPat,
+                emitversions      = featuresPat,
+                defaultExtensions = None,
+                addExtensions     = addExtensionsPat,
+                removeExtensions  = removeExtensionsPat,
+                emitExtensions    = emitExtensionsPat,
+                requireCommandAliases = True,
+                processes         = processes,
+                validUsageJson    = True,
                 )
             ]
 
@@ -281,6 +348,7 @@ def makeGenOpts(args):
             DocGeneratorOptions(
                 conventions       = conventions,
                 filename          = 'timeMarker',
+                touchUnchanged    = True,
                 directory         = directory,
                 genpath           = None,
                 apiname           = defaultAPIName,
@@ -304,6 +372,7 @@ def makeGenOpts(args):
             ExtensionMetaDocGeneratorOptions(
                 conventions       = conventions,
                 filename          = 'timeMarker',
+                touchUnchanged    = True,
                 directory         = directory,
                 genpath           = None,
                 apiname           = defaultAPIName,
@@ -324,6 +393,7 @@ def makeGenOpts(args):
             DocGeneratorOptions(
                 conventions       = conventions,
                 filename          = 'timeMarker',
+                touchUnchanged    = True,
                 directory         = directory,
                 genpath           = None,
                 apiname           = defaultAPIName,
@@ -338,6 +408,39 @@ def makeGenOpts(args):
                 reparentEnums     = False)
             ]
 
+        # apiinc, validinc, hostsyncinc, and interfaceinc generated from a
+        # single traversal of the registry, each in the subdirectory of
+        # the output directory used by xml/Makefile.
+        # Command aliases are required for all of them, as for validinc.
+        docincSinks = []
+        for (target, subdirectory) in (('apiinc', 'api'),
+                                       ('validinc', 'validity'),
+                                       ('hostsyncinc', 'hostsynctable'),
+                                       ('interfaceinc', 'interfaces')):
+            sinkOptions = copy.copy(genOpts[target][1])
+            sinkOptions.directory = os.path.join(directory, subdirectory)
+            docincSinks.append((genOpts[target][0], sinkOptions))
+
+        genOpts['docinc'] = [
+            FusedOutputGenerator,
+            FusedGeneratorOptions(
+                conventions       = conventions,
+                sinks             = docincSinks,
+                filename          = None,
+                directory         = directory,
+                genpath           = None,
+                apiname           = defaultAPIName,
+                mergeInternalApis = mergeInternalApis,
+                profile           = None,
+                versions          = featuresPat,
+                emitversions      = featuresPat,
+                defaultExtensions = None,
+                addExtensions     = addExtensionsPat,
+                removeExtensions  = removeExtensionsPat,
+                emitExtensions    = emitExtensionsPat,
+                requireCommandAliases = True)
+            ]
+
         # Feature requirements for versions/extensions
         # Includes all extensions by default.
         genOpts['requirementsinc'] = [
@@ -363,6 +466,7 @@ def makeGenOpts(args):
             DocGeneratorOptions(
                 conventions       = conventions,
                 filename          = 'timeMarker',
+                touchUnchanged    = True,
                 directory         = directory,
                 genpath           = None,
                 apiname           = defaultAPIName,
@@ -384,6 +488,7 @@ def makeGenOpts(args):
             DocGeneratorOptions(
                 conventions       = conventions,
                 filename          = 'timeMarker',
+                touchUnchanged    = True,
                 directory         = directory,
                 genpath           = None,
                 apiname           = defaultAPIName,
@@ -405,6 +510,7 @@ def makeGenOpts(args):
             DocGeneratorOptions(
                 conventions       = conventions,
                 filename          = 'timeMarker',
+                touchUnchanged    = True,
                 directory         = directory,
                 genpath           = None,
                 apiname           = defaultAPIName,
@@ -866,6 +972,169 @@ def makeGenOpts(args):
             alignFuncParam    = 36)
         ]
 
+    # Sets of targets generated together by genTargetSet(), matching the
+    # HEADERS generated by xml/Makefile for each VULKAN_API.
+    platformHeaders = [platform[0] for platform in platforms if platform[0] != 'vulkan_sci.h']
+    targetSets['vulkan_headers'] = ['vulkan_core.h'] + platformHeaders
+    targetSets['vulkanbase_headers'] = ['vulkan_base_core.h'] + platformHeaders
+    targetSets['vulkansc_headers'] = ['vulkan_sc_core.h'] + platformHeaders + [
+        'vulkan_sci.h', 'vulkan_sc_core.hpp' ]
+
+
+def makeDeclCache(args, options):
+    """Return a DeclCache for C header targets generated with options,
+    loaded from the args.declCache file if there is one.
+
+    The cache fingerprint covers the registry XML, the options used to load
+    it, and the generator and conventions scripts, so a saved cache is
+    discarded when any of them change."""
+    codeClasses = (Registry, OutputGenerator, COutputGenerator, *type(options.conventions).__mro__)
+    codeFiles = dict.fromkeys(sys.modules[cls.__module__].__file__ for cls in codeClasses
+                              if cls.__module__ not in sys.stdlib_module_names)
+    fingerprint = hashlib.sha256()
+    for filename in (args.registry, *codeFiles):
+        with open(filename, 'rb') as fp:
+            fingerprint.update(fp.read())
+    fingerprint.update(repr((options.apiname,
+                             options.mergeApiNames,
+                             getattr(options, 'mergeInternalApis', True))).encode())
+
+    if args.declCache:
+        return DeclCache.load(args.declCache, fingerprint.hexdigest())
+    return DeclCache(fingerprint.hexdigest())
+
+
+# Targets which write a separate include file for each entity, so that
+# -entities and -extensionScope can regenerate only some of them. Other
+# targets write files covering many entities, which would be truncated.
+emitFilterTargets = ('apiinc', 'validinc', 'hostsyncinc')
+
+
+def setTargetOptions(args, target, options):
+    """Apply command line options which are not handled by makeGenOpts()
+    to the generator options for target."""
+    if args.manifest:
+        options.manifestFile = f'{target}.manifest.json'
+    if args.entities is not None or args.extensionScope is not None:
+        if target not in emitFilterTargets:
+            logErr('-entities and -extensionScope only apply to the targets',
+                   ', '.join(emitFilterTargets), 'and not to', target)
+        options.emitEntities = args.entities
+        options.emitScope = args.extensionScope
+
+    # Each sink of a fused target writes its own manifest, in its own
+    # output directory
+    for (_, sinkOptions) in getattr(options, 'sinks', ()):
+        setTargetOptions(args, target, sinkOptions)
+
+
+# Registry loaded by genTargetSet(), inherited by its worker processes
+# through fork
+_setRegistry = None
+
+
+def _genSetTarget(target):
+    """Generate one target of a target set in a worker process, using the
+    registry loaded by genTargetSet(). Generation modifies the registry, so
+    each worker process only generates a single target."""
+    (createGenerator, options) = genOpts[target]
+    gen = createGenerator(errFile=errWarn,
+                          warnFile=errWarn,
+                          diagFile=diag)
+
+    if options.declCache is not None:
+        # Only new declarations need to be returned to the parent process
+        options.declCache.added = {}
+
+    reg = _setRegistry
+    reg.genOpts = options
+    options.registry = reg
+    gen.genOpts = options
+    reg.setGenerator(gen)
+    reg.apiGen()
+
+    # Return new declarations to share with later targets
+    added = options.declCache.added if options.declCache is not None else {}
+    return (options.filename, added)
+
+
+def genTargetSet(args):
+    """Generate every target in the target set args.target, such as all
+    the C headers for an API.
+
+    The registry XML is parsed and loaded once for all targets which load
+    it the same way (the same API and API merging options), rather than
+    once per target as when each is generated separately. Each target is
+    then generated in a process forked from the loaded registry, using up
+    to args.processes processes at once. Where fork is unavailable, the
+    registry is loaded again for each target.
+
+    makeGenOpts(args) must have been called first.
+
+    The MISRA C style (-misracstyle) only applies to .h targets of the set,
+    and the MISRA C++ style (-misracppstyle) only to .hpp targets, so both
+    can be given in the same run.
+
+    C header targets share a DeclCache of rendered declarations, loaded
+    from and saved to args.declCache if it is set. The first target of each
+    group is generated before the others are started, so they can reuse
+    its declarations."""
+    global _setRegistry
+
+    # Group targets by how they load the registry
+    groups = {}
+    for target in targetSets[args.target]:
+        options = genOpts[target][1]
+        setTargetOptions(args, target, options)
+        if options.filename.endswith('.hpp'):
+            options.misracstyle = False
+        else:
+            options.misracppstyle = False
+
+        key = (options.apiname, options.mergeApiNames, getattr(options, 'mergeInternalApis', True))
+        groups.setdefault(key, []).append(target)
+
+    useFork = 'fork' in multiprocessing.get_all_start_methods()
+    if not useFork and args.processes > 1:
+        logWarn(f'Cannot use {args.processes} processes without fork, generating', args.target, 'serially')
+    for targets in groups.values():
+        declCache = makeDeclCache(args, genOpts[targets[0]][1])
+        for target in targets:
+            if issubclass(genOpts[target][0], COutputGenerator):
+                genOpts[target][1].declCache = declCache
+
+        if not useFork:
+            for target in targets:
+                (createGenerator, options) = genOpts[target]
+                gen = createGenerator(errFile=errWarn,
+                                      warnFile=errWarn,
+                                      diagFile=diag)
+                reg = Registry(gen, options)
+                reg.loadElementTree(etree.parse(args.registry))
+                reg.apiGen()
+        else:
+            # Load the registry with the options of the first target in the group
+            (createGenerator, options) = genOpts[targets[0]]
+            _setRegistry = Registry(createGenerator(errFile=errWarn,
+                                                    warnFile=errWarn,
+                                                    diagFile=diag), options)
+            _setRegistry.loadElementTree(etree.parse(args.registry))
+
+            context = multiprocessing.get_context('fork')
+            try:
+                for batch in (targets[:1], targets[1:]):
+                    if not batch:
+                        continue
+                    with context.Pool(processes=max(1, args.processes), maxtasksperchild=1) as pool:
+                        for (filename, added) in pool.imap(_genSetTarget, batch):
+                            declCache.update(added)
+                            logDiag('* Generated', filename)
+            finally:
+                _setRegistry = None
+
+        if args.declCache:
+            declCache.save(args.declCache)
+
 
 def genTarget(args):
     """Create an API generator and corresponding generator options based on
@@ -878,7 +1147,10 @@ def genTarget(args):
     - target - target to generate
     - directory - directory to generate it in
     - protect - True if re-inclusion wrappers should be created
-    - extensions - list of additional extensions to include in generated interfaces"""
+    - extensions - list of additional extensions to include in generated interfaces
+    - manifest - True if a manifest of the generated files should be written
+    - entities, extensionScope - if not None, lists of entity and
+      extension or version names restricting what is emitted"""
 
     # Create generator options with parameters specified on command line
     makeGenOpts(args)
@@ -899,6 +1171,10 @@ def genTarget(args):
         logDiag('* options.emitSpirv         =', options.emitSpirv)
         logDiag('* options.emitFormats       =', options.emitFormats)
 
+        setTargetOptions(args, args.target, options)
+        if args.declCache and issubclass(createGenerator, COutputGenerator):
+            options.declCache = makeDeclCache(args, options)
+
         gen = createGenerator(errFile=errWarn,
                               warnFile=errWarn,
                               diagFile=diag)
@@ -912,7 +1188,8 @@ def genTarget(args):
 # -extension name
 # For both, "name" may be a single name, or a space-separated list
 # of names, or a regular expression.
-if __name__ == '__main__':
+def makeArgParser():
+    """Return the argparse.ArgumentParser for the genvk command line."""
     parser = argparse.ArgumentParser()
 
     parser.add_argument('-apiname', action='store',
@@ -963,11 +1240,23 @@ if __name__ == '__main__':
                         help='Enable timing')
     parser.add_argument('-genpath', action='store', default='gen',
                         help='Path to generated files')
+    parser.add_argument('-processes', action='store', type=int, default=1,
+                        help='Number of worker processes for targets which support parallel generation (validinc, header sets)')
+    parser.add_argument('-manifest', action='store_true',
+                        help='Write <target>.manifest.json in the output directory, listing each generated file with its content hash and source registry entities')
+    parser.add_argument('-entities', action='append',
+                        default=None,
+                        help='Only emit the specified command, type, or enum name or names, e.g. to regenerate validity includes for them. Only for the apiinc, validinc, and hostsyncinc targets')
+    parser.add_argument('-extensionScope', action='append',
+                        default=None,
+                        help='Only emit the entities required by the specified extension or version name or names. Only for the apiinc, validinc, and hostsyncinc targets')
+    parser.add_argument('-declCache', action='store', default=None,
+                        help='Load and save rendered C declarations in the specified file, to reuse them in later runs generating C headers')
     parser.add_argument('-o', action='store', dest='directory',
                         default='.',
                         help='Create target and related files in specified directory')
     parser.add_argument('target', metavar='target', nargs='?',
-                        help='Specify target')
+                        help='Specify target, or a set of targets such as vulkan_headers')
     parser.add_argument('-quiet', action='store_true', default=True,
                         help='Suppress script output during normal execution.')
     parser.add_argument('-verbose', action='store_false', dest='quiet', default=True,
@@ -980,11 +1269,73 @@ if __name__ == '__main__':
                         default=True,
                         help='Disable merging of internal APIs into public APIs')
 
-    args = parser.parse_args()
 
-    # This splits arguments which are space-separated lists
+    return parser
+
+
+def splitListArgs(args):
+    """Split arguments which are space-separated lists into single names."""
     args.feature = [name for arg in args.feature for name in arg.split()]
     args.extension = [name for arg in args.extension for name in arg.split()]
+    if args.entities is not None:
+        args.entities = [name for arg in args.entities for name in arg.split()]
+    if args.extensionScope is not None:
+        args.extensionScope = [name for arg in args.extensionScope for name in arg.split()]
+
+
+def genTargetInMemory(target, arguments=()):
+    """Generate a target without touching the filesystem.
+
+    All files the target would write, including the main output file and
+    any include files, are returned instead. The registry is still read
+    from disk, as is apimap.py from -genpath if a generator needs it.
+
+    - target - target to generate, as on the command line
+    - arguments - other command line options, e.g. ['-registry', path]
+
+    Returns a dictionary mapping paths relative to the output directory
+    (using '/' separators) to file contents: strings for text files, and
+    bytes for binary files such as apimap.bin."""
+    args = makeArgParser().parse_args([*arguments, target])
+    splitListArgs(args)
+
+    targetInfo = genTarget(args)
+    if targetInfo is None:
+        raise ValueError(f'Unknown target: {target}')
+    (gen, options) = targetInfo
+    setOutputFiles(options)
+
+    reg = Registry(gen, options)
+    reg.loadElementTree(etree.parse(args.registry))
+    reg.apiGen()
+    return collectOutputFiles(options)
+
+
+def setOutputFiles(options):
+    """Make options, and the options of each sink of a fused target,
+    collect output files in memory."""
+    options.outputFiles = {}
+    for (_, sinkOptions) in getattr(options, 'sinks', ()):
+        setOutputFiles(sinkOptions)
+
+
+def collectOutputFiles(options):
+    """Return the files collected by setOutputFiles(), keyed by path
+    relative to the output directory of options. Sinks of fused targets
+    may write to subdirectories of it."""
+    outputFiles = dict(options.outputFiles)
+    for (_, sinkOptions) in getattr(options, 'sinks', ()):
+        prefix = Path(os.path.relpath(sinkOptions.directory, options.directory))
+        for (path, contents) in collectOutputFiles(sinkOptions).items():
+            outputFiles[(prefix / path).as_posix()] = contents
+    return outputFiles
+
+
+if __name__ == '__main__':
+    args = makeArgParser().parse_args()
+
+    # This splits arguments which are space-separated lists
+    splitListArgs(args)
 
     # create error/warning & diagnostic files
     if args.errfile:
@@ -1001,6 +1352,14 @@ if __name__ == '__main__':
         # Log diagnostics and warnings
         setLogFile(setDiag = True, setWarn = True, filename = '-')
 
+    # Generate a set of targets, such as all C headers, from one registry load
+    makeGenOpts(args)
+    if args.target in targetSets:
+        startTimer(args.time)
+        genTargetSet(args)
+        endTimer(args.time, f'* Time to generate {args.target} =')
+        sys.exit(0)
+
     # Create the API generator & generator options
     (gen, options) = genTarget(args)
 
@@ -1030,5 +1389,8 @@ if __name__ == '__main__':
         reg.apiGen()
         endTimer(args.time, f"* Time to generate {options.filename} =")
 
+    if options.declCache is not None:
+        options.declCache.save(args.declCache)
+
     if not args.quiet:
         logDiag('* Generated', options.filename)
@@ -21,18 +21,24 @@ class HostSynchronizationOutputGenerator(OutputGenerator):
     HostSynchronizationOutputGenerator(errFile, warnFile, diagFile) - args as for
       OutputGenerator. Defines additional internal state.
     ---- methods overriding base class ----
+    beginFile(genOpts)
     genCmd(cmdinfo)
     genType(typeinfo)
     endFile()"""
     # Generate Host Synchronized Parameters in a table at the top of the spec
 
-    threadsafety = {
-        'parameters': ValidityCollection(),
-        'members': ValidityCollection(),
-        'parameterlists': ValidityCollection(),
-        'memberlists': ValidityCollection(),
-        'implicit': ValidityCollection()
-    }
+    def beginFile(self, genOpts):
+        OutputGenerator.beginFile(self, genOpts)
+
+        # Collected for each file, so that generating more than once in a
+        # process does not add entries twice
+        self.threadsafety = {
+            'parameters': ValidityCollection(),
+            'members': ValidityCollection(),
+            'parameterlists': ValidityCollection(),
+            'memberlists': ValidityCollection(),
+            'implicit': ValidityCollection()
+        }
 
     def makeParameterName(self, name):
         return f"pname:{name}"
@@ -52,7 +58,7 @@ class HostSynchronizationOutputGenerator(OutputGenerator):
         assert self.genOpts
         filename = Path(self.genOpts.directory) / basename
         self.logMsg('diag', '# Generating include file:', filename)
-        with open(filename, 'w', encoding='utf-8') as fp:
+        with self.openOutput(filename) as fp:
             write(self.genOpts.conventions.warning_comment, file=fp)
 
             if contents:
@@ -183,6 +189,10 @@ endif::VK_KHR_internally_synchronized_queues[]"""
         self.makeThreadSafetyBlocks(typeinfo.elem, 'member')
 
     def endFile(self):
-        self.writeInclude()
+        # The tables cover every command and struct, so would be incomplete
+        if self.isEmitFiltered():
+            self.logMsg('diag', '# Not generating tables, only some entities were emitted')
+        else:
+            self.writeInclude()
 
         OutputGenerator.endFile(self)
@@ -119,7 +119,7 @@ class InterfaceDocGenerator(OutputGenerator):
         - feature - name of the feature being generated"""
 
         filename = feature + self.genOpts.conventions.file_suffix
-        fp = open(f'{self.genOpts.directory}/{filename}', 'w', encoding='utf-8')
+        fp = self.openOutput(f'{self.genOpts.directory}/{filename}', entities=[feature])
 
         # Write out the lists of new interfaces added by the feature
         self.writeNewInterfaces(feature, 'define',      'New Macros',           'dlink:',   fp)
@@ -50,8 +50,9 @@ class JSOutputGenerator(ScriptOutputGenerator):
         self.writeDict(l, name, printValues = False)
 
     def endFile(self):
-        # Creates the inverse mapping of nonexistent APIs to their aliases.
-        super().createInverseMap()
+        # Completes the inverse mapping of nonexistent APIs to their aliases,
+        # and the reverse mapping from APIs to requiring features.
+        self.finishMaps()
 
         # Print out all the dictionaries as JavaScript strings.
         # Could just print(dict) but that is not human-readable
@@ -84,10 +85,6 @@ class JSOutputGenerator(ScriptOutputGenerator):
         # List of included feature names
         self.writeList(sorted(self.features), 'features')
 
-        # Generate feature <-> interface mappings
-        for feature in self.features:
-            self.mapInterfaces(feature)
-
         # Write out the reverse map from APIs to requiring features
         write(self.beginDict('requiredBy'), file=self.outFile)
         for api in sorted(self.apimap):
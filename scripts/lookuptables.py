@@ -0,0 +1,172 @@
+#!/usr/bin/env python3 -i
+#
+# Copyright 2026 The Khronos Group Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Helpers shared by the generators of C lookup table headers.
+
+- stringHash() and buildPerfectHash() build minimal perfect hash tables
+  of names, which cStringHash() looks up in C.
+- buildValueBlocks() and valueIndex() lay out enum values, such as
+  VkStructureType or VkFormat values, in a dense array.
+- protected(), bitsetWords() and bitsetInitializer() format parts of the
+  tables."""
+
+import os
+
+# Seeds tried for each bucket of the perfect hash before giving up
+maxHashSeed = 1 << 20
+
+# Enum values assigned to extensions start at this value, in blocks of
+# extensionBlockSize values for each extension number
+extensionBase = 1000000000
+extensionBlockSize = 1000
+
+def stringHash(seed: int, name: str) -> int:
+    """32-bit FNV-1a hash of name, with the offset basis perturbed by
+    seed, and the MurmurHash3 finalizer applied so that every bit of the
+    result depends on the seed. Must match the C function written by
+    cStringHash()."""
+    value = 0x811C9DC5 ^ seed
+    for byte in name.encode():
+        value = ((value ^ byte) * 0x01000193) & 0xFFFFFFFF
+    value ^= value >> 16
+    value = (value * 0x85EBCA6B) & 0xFFFFFFFF
+    value ^= value >> 13
+    value = (value * 0xC2B2AE35) & 0xFFFFFFFF
+    value ^= value >> 16
+    return value
+
+def buildPerfectHash(names: list[str]) -> tuple[list[int], list[str]]:
+    """Return (displacements, slots) for a minimal perfect hash of names,
+    using hash and displace.
+
+    A name is looked up by taking d = displacements[stringHash(0, name) % n].
+    If d is negative, the name is in slots[-d - 1], otherwise it is in
+    slots[stringHash(d, name) % n]. Names not in the table also map to a
+    slot, so the slot must be compared with the name looked up."""
+    size = len(names)
+    buckets = [[] for _ in range(size)]
+    for name in names:
+        buckets[stringHash(0, name) % size].append(name)
+
+    displacements = [0] * size
+    slots = [None] * size
+    order = sorted(range(size), key = lambda bucket: -len(buckets[bucket]))
+
+    # Find a seed placing all the names of each bucket with collisions in
+    # free slots, starting with the largest buckets
+    for bucket in order:
+        keys = buckets[bucket]
+        if len(keys) < 2:
+            break
+        seed = 1
+        while True:
+            positions = [stringHash(seed, key) % size for key in keys]
+            if len(set(positions)) == len(keys) and all(slots[position] is None for position in positions):
+                break
+            seed += 1
+            if seed == maxHashSeed:
+                raise RuntimeError(f'No perfect hash seed found for {keys}')
+        displacements[bucket] = seed
+        for (key, position) in zip(keys, positions):
+            slots[position] = key
+
+    # Names alone in their bucket go directly into the remaining slots
+    freeSlots = (position for position in range(size) if slots[position] is None)
+    for bucket in order:
+        if len(buckets[bucket]) == 1:
+            position = next(freeSlots)
+            slots[position] = buckets[bucket][0]
+            displacements[bucket] = -position - 1
+
+    return (displacements, slots)
+
+def perfectHashSlot(displacements: list[int], name: str) -> int:
+    """Return the slot of name in a table built by buildPerfectHash()."""
+    displacement = displacements[stringHash(0, name) % len(displacements)]
+    if displacement < 0:
+        return -displacement - 1
+    return stringHash(displacement, name) % len(displacements)
+
+def cStringHash(prefix: str) -> str:
+    """Return the C functions <prefix>Hash(seed, name), matching
+    stringHash(), and <prefix>Slot(displacements, size, name), matching
+    perfectHashSlot()."""
+    return f'''// Must match stringHash() in {os.path.basename(__file__)}
+static inline uint32_t {prefix}Hash(uint32_t seed, const char *name) {{
+    uint32_t hash = 0x811C9DC5u ^ seed;
+    for (; *name; ++name) {{
+        hash = (hash ^ (unsigned char)*name) * 0x01000193u;
+    }}
+    hash ^= hash >> 16;
+    hash *= 0x85EBCA6Bu;
+    hash ^= hash >> 13;
+    hash *= 0xC2B2AE35u;
+    hash ^= hash >> 16;
+    return hash;
+}}
+
+static inline uint32_t {prefix}Slot(const int32_t *displacements, uint32_t size, const char *name) {{
+    int32_t displacement = displacements[{prefix}Hash(0, name) % size];
+    if (displacement < 0) return (uint32_t)(-displacement - 1);
+    return {prefix}Hash((uint32_t)displacement, name) % size;
+}}
+'''
+
+def buildValueBlocks(values: list[int]) -> tuple[int, list[int], list[int]]:
+    """Return (coreCount, blockStarts, blockCounts) laying out the
+    non-negative enum values in a dense array.
+
+    The core values, below extensionBase, come first and index the array
+    directly. They are followed by the values of each extension block in
+    order, each block covering the offsets up to the largest one used;
+    blockStarts and blockCounts give the array index of the first offset
+    and the number of offsets of each block."""
+    coreCount = 1 + max((value for value in values if value < extensionBase), default = -1)
+    counts = {}
+    for value in values:
+        if value >= extensionBase:
+            (block, offset) = divmod(value - extensionBase, extensionBlockSize)
+            counts[block] = max(counts.get(block, 0), offset + 1)
+
+    blockStarts = []
+    blockCounts = []
+    start = coreCount
+    for block in range(1 + max(counts, default = -1)):
+        blockStarts.append(start)
+        blockCounts.append(counts.get(block, 0))
+        start += blockCounts[-1]
+    return (coreCount, blockStarts, blockCounts)
+
+def valueIndex(value: int, blockStarts: list[int]) -> int:
+    """Return the index of value in the dense array laid out by
+    buildValueBlocks()."""
+    if value < extensionBase:
+        return value
+    (block, offset) = divmod(value - extensionBase, extensionBlockSize)
+    return blockStarts[block] + offset
+
+def protected(protect: (str | None), lines: list[str], fallback: (list[str] | None) = None) -> list[str]:
+    """Return lines enclosed in #ifdef protect, with fallback lines in
+    the #else branch if given."""
+    if protect is None:
+        return lines
+    out = [f'#ifdef {protect}\n', *lines]
+    if fallback is not None:
+        out.extend(['#else\n', *fallback])
+    out.append(f'#endif // {protect}\n')
+    return out
+
+def bitsetWords(indices: set[int], wordCount: int) -> list[int]:
+    """Return the wordCount 32-bit words of a bitset with the bits of
+    indices set."""
+    words = [0] * wordCount
+    for index in indices:
+        words[index // 32] |= 1 << (index % 32)
+    return words
+
+def bitsetInitializer(words: list[int]) -> str:
+    """Return the C initializer of an array of 32-bit words."""
+    return '{' + ', '.join(f'0x{word:08X}u' for word in words) + '}'
@@ -9,6 +9,7 @@
 import argparse
 import os
 import sys
+from apimaploader import loadApiMap
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
@@ -22,10 +23,11 @@ if __name__ == '__main__':
 
     args = parser.parse_args()
 
-    # Look for apimap.py in the specified directory
-    if args.genpath is not None:
-        sys.path.insert(0, args.genpath)
-    import apimap as api
+    # Look for apimap.bin or apimap.py in the specified directory
+    api = loadApiMap(args.genpath)
+    if api is None:
+        print('Cannot load apimap.py or apimap.bin', file=sys.stderr)
+        sys.exit(1)
 
     # Change to refpage directory
     try:
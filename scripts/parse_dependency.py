@@ -223,11 +223,19 @@ def evaluateDependency(dependency, isSupported):
      - isSupported - function taking a version or extension name string and
        returning True or False if that name is supported or not."""
 
+    return evaluateStack(list(compileDependency(dependency)), isSupported)
+
+def compileDependency(dependency):
+    """Parse a dependency expression, returning its expression stack as a
+    tuple. A copy of the stack, as a list, may be passed to
+    evaluateStack() any number of times.
+
+     - dependency - the expression"""
+
     global exprStack
     exprStack = []
-    results = dependencyBNF().parse_string(dependency, parse_all=True)
-    val = evaluateStack(exprStack[:], isSupported)
-    return val
+    dependencyBNF().parse_string(dependency, parse_all=True)
+    return tuple(exprStack)
 
 def evalDependencyLanguage(stack, leafMarkup, opMarkup, parenthesize, root, parent_op = None):
     """Evaluate an expression stack, returning an English equivalent
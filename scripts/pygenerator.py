@@ -4,18 +4,25 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
-from generator import OutputGenerator, enquote, write
+from apimaploader import apiMapFile, encodeApiMap
+from generator import OutputGenerator, encodeOutput, enquote, write
 from scriptgenerator import ScriptOutputGenerator
+from pathlib import Path
 import pprint
 
 class PyOutputGenerator(ScriptOutputGenerator):
     """PyOutputGenerator - subclass of ScriptOutputGenerator.
     Generates Python data structures describing API names and
-    relationships."""
+    relationships, and the same data in the binary form read by
+    apimaploader.loadApiMap()."""
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+        # Values of each dictionary written, as read back from the Python
+        # source, keyed by dictionary name
+        self.apiMaps = {}
+
     def beginDict(self, name):
         """String starting definition of a named dictionary"""
         return f'{name} = {{'
@@ -28,12 +35,15 @@ class PyOutputGenerator(ScriptOutputGenerator):
         """Write dictionary as a Python dictionary with the given name.
            If printValues is False, just output keys with None values."""
 
+        apiMap = self.apiMaps[name] = {}
         write(self.beginDict(name), file=self.outFile)
         for key in sorted(dict):
             if printValues:
                 value = enquote(dict[key])
+                apiMap[key] = dict[key] or None
             else:
                 value = 'None'
+                apiMap[key] = None
             write(f'{enquote(key)} : {value},', file=self.outFile)
         write(self.endDict(), file=self.outFile)
 
@@ -43,8 +53,9 @@ class PyOutputGenerator(ScriptOutputGenerator):
         self.writeDict(l, name, printValues = False)
 
     def endFile(self):
-        # Creates the inverse mapping of nonexistent APIs to their aliases.
-        super().createInverseMap()
+        # Completes the inverse mapping of nonexistent APIs to their aliases,
+        # and the reverse mapping from APIs to requiring features.
+        self.finishMaps()
 
         # Print out all the dictionaries as Python strings.
         # Could just print(dict) but that is not human-readable
@@ -74,21 +85,30 @@ class PyOutputGenerator(ScriptOutputGenerator):
             write('{} : {},'.format(enquote(baseType),
                 pprint.pformat(self.mapDict[baseType])), file=self.outFile)
         write(self.endDict(), file=self.outFile)
+        self.apiMaps['mapDict'] = { baseType: self.mapDict[baseType]
+                                    for baseType in sorted(self.mapDict.keys()) }
 
         # List of included feature names
         self.writeList(sorted(self.features), 'features')
 
-        # Generate feature <-> interface mappings
-        for feature in self.features:
-            self.mapInterfaces(feature)
-
         # Write out the reverse map from APIs to requiring features
+        requiredBy = self.apiMaps['requiredBy'] = {}
         write(self.beginDict('requiredBy'), file=self.outFile)
         for api in sorted(self.apimap):
             # Sort requirements by first feature in each one
             deps = sorted(self.apimap[api], key = lambda dep: dep[0])
             reqs = ', '.join(f'({enquote(dep[0])}, {enquote(dep[1])})' for dep in deps)
             write(f'{enquote(api)} : [{reqs}],', file=self.outFile)
+            requiredBy[api] = [(dep[0] or None, dep[1] or None) for dep in deps]
         write(self.endDict(), file=self.outFile)
 
+        # Write the binary form of the same dictionaries
+        if self.genOpts.filename is not None:
+            self.makeDir(self.genOpts.directory)
+            filename = Path(self.genOpts.directory) / apiMapFile
+            data = encodeApiMap(self.apiMaps, encodeOutput(self.outFile.getvalue(), '\n'))
+            self.writeOutput(filename, data)
+            if self.genOpts.manifestFile is not None:
+                self.recordOutput(filename, data)
+
         super().endFile()
@@ -388,6 +388,7 @@ class TypeInfo(BaseInfo):
         BaseInfo.resetState(self)
         self.additionalValidity = []
         self.removedValidity = []
+        self.requiredWithoutAliases = False
 
 
 class GroupInfo(BaseInfo):
@@ -417,6 +418,8 @@ class CmdInfo(BaseInfo):
         BaseInfo.__init__(self, elem)
         self.additionalValidity = []
         self.removedValidity = []
+        self.requiredWithoutAliases = False
+        "would be required if GeneratorOptions.requireCommandAliases were False"
 
     def getParams(self):
         """Get a collection of all param elements for this command, if any."""
@@ -426,6 +429,7 @@ class CmdInfo(BaseInfo):
         BaseInfo.resetState(self)
         self.additionalValidity = []
         self.removedValidity = []
+        self.requiredWithoutAliases = False
 
 
 class FeatureInfo(BaseInfo):
@@ -595,6 +599,10 @@ class Registry:
         """True to actually emit features for a version / extension,
         or False to just treat them as emitted"""
 
+        self.emitEntities = None
+        """set of the only entity names to emit, or None to emit everything
+        in emitted features. See GeneratorOptions.emitEntities."""
+
         self.breakPat = None
         "regexp pattern to break on when generating names"
         # self.breakPat     = re.compile('VkFenceImportFlagBits.*')
@@ -1206,15 +1214,18 @@ class Registry:
         else:
             self.gen.logMsg('warn', f'markEnumRequired: {enumname} IS NOT DEFINED')
 
-    def markCmdRequired(self, cmdname, required):
+    def markCmdRequired(self, cmdname, required, viaAlias=False):
         """Mark a command as required or not.
 
         - cmdname - name of command
-        - required - boolean (to tag features as required or not)"""
+        - required - boolean (to tag features as required or not)
+        - viaAlias - True if tagged only because an alias of it was"""
         self.gen.logMsg('diag', 'tagging command:', cmdname, '-> required =', required)
         cmd = self.lookupElementInfo(cmdname, self.cmddict)
         if cmd is not None:
             cmd.required = required
+            if not viaAlias:
+                cmd.requiredWithoutAliases = required
 
             # Tag command dependencies in 'alias' attribute as required
             #
@@ -1230,7 +1241,7 @@ class Registry:
                 if depname:
                     self.gen.logMsg('diag', 'Generating dependent command',
                                     depname, 'for alias', cmdname)
-                    self.markCmdRequired(depname, required)
+                    self.markCmdRequired(depname, required, viaAlias=True)
 
             # Tag all parameter types of this command as required.
             # This does not remove types of commands in a <remove>
@@ -1753,7 +1764,7 @@ class Registry:
             genProc = self.gen.genEnum
 
         # Actually generate the type only if emitting declarations
-        if self.emitFeatures:
+        if self.emitFeatures and (self.emitEntities is None or fname in self.emitEntities):
             self.gen.logMsg('diag', 'Emitting', ftype, 'decl for', fname)
             if genProc is None:
                 raise RuntimeError("genProc is None when we should be emitting")
@@ -2086,37 +2097,87 @@ class Registry:
         #   <enable extension="VK_KHR_shader_draw_parameters"/>
         #   <enable property="VkPhysicalDeviceVulkan12Properties" member="shaderDenormPreserveFloat16" value="VK_TRUE" requires="VK_VERSION_1_2,VK_KHR_shader_float_controls"/>
 
+        # Restrict emission to the requested entities, if any
+        self.emitEntities = self.getEmitEntities()
+
         # Pass 3: loop over specified API versions and extensions printing
         #   declarations for required things which have not already been
         #   generated.
         self.gen.logMsg('diag', 'PASS 3: GENERATE INTERFACES FOR FEATURES')
         self.gen.beginFile(self.genOpts)
-        for f in (self.genFeatures[name] for name in orderedFeatures):
-            self.gen.logMsg('diag', 'PASS 3: Generating interface for',
-                            f.name)
-            emit = self.emitFeatures = f.emit
-            if not emit:
-                self.gen.logMsg('diag', 'PASS 3: NOT declaring feature',
-                                f.elem.get('name'), 'because it is not tagged for emission')
-            # Generate the interface (or just tag its elements as having been
-            # emitted, if they have not been).
-            self.gen.beginFeature(f.elem, emit)
-            self.generateRequiredInterface(f.elem)
-            self.gen.endFeature()
-        # Generate spirv elements
-        for s in spirvexts:
-            self.generateSpirv(s, self.spirvextdict)
-        for s in spirvcaps:
-            self.generateSpirv(s, self.spirvcapdict)
-        for s in formats:
-            self.generateFormat(s, self.formatsdict)
-        for s in self.syncstagedict:
-            self.generateSyncStage(self.syncstagedict[s])
-        for s in self.syncaccessdict:
-            self.generateSyncAccess(self.syncaccessdict[s])
-        for s in self.syncpipelinedict:
-            self.generateSyncPipeline(self.syncpipelinedict[s])
-        self.gen.endFile()
+        try:
+            for f in (self.genFeatures[name] for name in orderedFeatures):
+                self.gen.logMsg('diag', 'PASS 3: Generating interface for',
+                                f.name)
+                emit = self.emitFeatures = f.emit
+                if not emit:
+                    self.gen.logMsg('diag', 'PASS 3: NOT declaring feature',
+                                    f.elem.get('name'), 'because it is not tagged for emission')
+                # Generate the interface (or just tag its elements as having been
+                # emitted, if they have not been).
+                self.gen.beginFeature(f.elem, emit)
+                self.generateRequiredInterface(f.elem)
+                self.gen.endFeature()
+            # Generate spirv elements
+            for s in spirvexts:
+                self.generateSpirv(s, self.spirvextdict)
+            for s in spirvcaps:
+                self.generateSpirv(s, self.spirvcapdict)
+            for s in formats:
+                self.generateFormat(s, self.formatsdict)
+            for s in self.syncstagedict:
+                self.generateSyncStage(self.syncstagedict[s])
+            for s in self.syncaccessdict:
+                self.generateSyncAccess(self.syncaccessdict[s])
+            for s in self.syncpipelinedict:
+                self.generateSyncPipeline(self.syncpipelinedict[s])
+            self.gen.endFile()
+        except BaseException:
+            # Wait for files already queued on writer threads and stop
+            # them, rather than leaving them running after the error
+            self.gen.abortFile()
+            raise
+
+    def getEmitEntities(self):
+        """Return the set of entity names selected by the emitEntities and
+        emitScope generator options, or None if neither is set."""
+        entities = getattr(self.genOpts, 'emitEntities', None)
+        scope = getattr(self.genOpts, 'emitScope', None)
+        if entities is None and scope is None:
+            return None
+
+        emitEntities = set(entities or ())
+        for name in scope or ():
+            info = self.extdict.get(name) or self.apidict.get(name)
+            if info is None:
+                self.gen.logMsg('warn', 'emitScope names unknown extension or version', name)
+                continue
+            for require in info.elem.findall('require'):
+                for elem in require:
+                    if elem.tag in ('type', 'enum', 'command'):
+                        emitEntities.update(self.getAliasChain(elem.get('name'), elem.tag))
+                    # Enums added to a group change the group's definition too
+                    if elem.tag == 'enum' and elem.get('extends') is not None:
+                        emitEntities.update(self.getAliasChain(elem.get('extends'), 'type'))
+        self.gen.logMsg('diag', 'Restricting emission to', len(emitEntities), 'entities')
+        return emitEntities
+
+    def getAliasChain(self, name, tag):
+        """Return a list of name and the names it is an alias of, so that
+        an extension promoted to core also selects the core names.
+
+        - name - name of a `<type>`, `<enum>`, or `<command>`
+        - tag - which of those name is"""
+        dictionary = {'type': self.typedict, 'enum': self.enumdict, 'command': self.cmddict}[tag]
+        names = [name]
+        info = self.lookupElementInfo(name, dictionary)
+        while info is not None:
+            alias = info.elem.get('alias')
+            if alias is None or alias in names:
+                break
+            names.append(alias)
+            info = self.lookupElementInfo(alias, dictionary)
+        return names
 
     def apiReset(self):
         """Reset type/enum/command dictionaries before generating another API.
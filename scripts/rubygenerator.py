@@ -57,8 +57,9 @@ class RubyOutputGenerator(ScriptOutputGenerator):
         write('end', file=self.outFile)
 
     def endFile(self):
-        # Creates the inverse mapping of nonexistent APIs to their aliases.
-        super().createInverseMap()
+        # Completes the inverse mapping of nonexistent APIs to their aliases,
+        # and the reverse mapping from APIs to requiring features.
+        self.finishMaps()
 
         # Print out all the dictionaries as Ruby strings.
         # Use a simple container class for namespace control
@@ -92,10 +93,6 @@ class RubyOutputGenerator(ScriptOutputGenerator):
         # List of included feature names
         self.writeList(sorted(self.features), 'features')
 
-        # Generate feature <-> interface mappings
-        for feature in self.features:
-            self.mapInterfaces(feature)
-
         # Write out the reverse map from APIs to requiring features
         write(self.beginDict('requiredBy'), file=self.outFile)
         for api in sorted(self.apimap):
@@ -50,6 +50,10 @@ class ScriptOutputGenerator(OutputGenerator):
         # are supported
         self.nonexistent = {}
 
+        # True once finishMaps() has completed self.apimap and
+        # self.nonexistent
+        self.mapsFinished = False
+
     def beginFile(self, genOpts):
         OutputGenerator.beginFile(self, genOpts)
         #
@@ -137,6 +141,42 @@ class ScriptOutputGenerator(OutputGenerator):
         self.mapInterfaceKeys(feature, 'struct')
         self.mapInterfaceKeys(feature, 'union')
 
+    def finishMaps(self):
+        """Complete the mappings which depend on everything generated:
+           the inverse mapping of nonexistent APIs to their aliases, and
+           the reverse mapping of APIs to the features requiring them.
+           Must be called by language-specific subclasses before emitting
+           those mappings. Only the first call has any effect."""
+
+        if self.mapsFinished:
+            return
+        self.mapsFinished = True
+
+        # Creates the inverse mapping of nonexistent APIs to their aliases.
+        self.createInverseMap()
+
+        # Generate feature <-> interface mappings
+        for feature in self.features:
+            self.mapInterfaces(feature)
+
+    def copyMaps(self, other):
+        """Use the mappings collected by another ScriptOutputGenerator,
+           so they can be written in the language of this generator
+           without traversing the registry again. Called after
+           beginFile().
+
+        - other - ScriptOutputGenerator which has called finishMaps()"""
+
+        for name in self.scriptMaps:
+            setattr(self, name, getattr(other, name))
+
+    # Attributes holding the mappings, copied by copyMaps()
+    scriptMaps = (
+        'basetypes', 'consts', 'enums', 'flags', 'funcpointers', 'protos',
+        'structs', 'handles', 'defines', 'alias', 'typeCategory', 'mapDict',
+        'features', 'apimap', 'nonexistent', 'mapsFinished',
+    )
+
     def endFile(self):
         super().endFile()
 
@@ -415,3 +455,34 @@ class ScriptOutputGenerator(OutputGenerator):
                 else:
                     # Create remapping to an alias
                     self.nonexistent[invkey] = key
+
+
+class ScriptMapsOutputGenerator(ScriptOutputGenerator):
+    """ScriptMapsOutputGenerator - subclass of ScriptOutputGenerator.
+    Collects the mappings once, and writes them in each of several
+    languages by passing them to a ScriptOutputGenerator subclass for
+    each language (PyOutputGenerator, JSOutputGenerator, etc.).
+
+    The generator options are a FusedGeneratorOptions, whose sinks are
+    the (generator class, options) pairs for each language. Its filename
+    should be None, since only the generators for each language write
+    files."""
+
+    def endFile(self):
+        self.finishMaps()
+
+        for (createGenerator, options) in self.genOpts.sinks:
+            gen = createGenerator(errFile=self.errFile,
+                                  warnFile=self.warnFile,
+                                  diagFile=self.diagFile)
+            gen.registry = self.registry
+            gen.featureDictionary = self.featureDictionary
+            gen.beginFile(options)
+            gen.copyMaps(self)
+            gen.endFile()
+
+            # Files written by each language are listed in the manifest
+            # of this generator, which is written last
+            self.outputManifest.update(gen.outputManifest)
+
+        super().endFile()
@@ -5,6 +5,7 @@
 # SPDX-License-Identifier: Apache-2.0
 """Utilities for working with attributes of the XML registry."""
 
+import functools
 import re
 
 _PARAM_REF_NAME_RE = re.compile(
@@ -32,7 +33,25 @@ def _human_readable_deref(val, make_param_name=None):
     return ' '.join(parts)
 
 
-class LengthEntry:
+class _SharedEntry:
+    """Base class for parsed attribute entries.
+
+    Entries returned by the memoized parse functions below are shared
+    between all callers, so they are frozen after parsing."""
+
+    _frozen = False
+
+    def __setattr__(self, name, value):
+        if self._frozen:
+            raise AttributeError(f'{type(self).__name__} is shared and cannot be modified')
+        super().__setattr__(name, value)
+
+    def _freeze(self):
+        object.__setattr__(self, '_frozen', True)
+        return self
+
+
+class LengthEntry(_SharedEntry):
     """An entry in a (comma-separated) len attribute"""
     NULL_TERMINATED_STRING = 'null-terminated'
     MATH_STRING = 'latexmath:'
@@ -73,14 +92,14 @@ class LengthEntry:
 
     @staticmethod
     def parse_len_from_param(param):
-        """Get a list of LengthEntry, or None."""
+        """Get a tuple of shared LengthEntry, or None."""
         len_str = param.get('len')
         if len_str is None:
             return None
-        return [LengthEntry(elt) for elt in len_str.split(',')]
+        return parse_len(len_str)
 
 
-class ExternSyncEntry:
+class ExternSyncEntry(_SharedEntry):
     """An entry in a (comma-separated) externsync attribute"""
 
     def __init__(self, val):
@@ -110,11 +129,11 @@ class ExternSyncEntry:
 
     @staticmethod
     def parse_externsync_from_param(param):
-        """Get a list of ExternSyncEntry."""
+        """Get a tuple of shared ExternSyncEntry, or None."""
         sync_str = param.get('externsync')
         if sync_str is None:
             return None
-        return [ExternSyncEntry(elt) for elt in sync_str.split(',')]
+        return parse_externsync(sync_str)
 
     def __repr__(self):
         "Formats an object for repr(), debugger display, etc."
@@ -131,10 +150,31 @@ def _parse_optional_elt(val):
     return val == _TRUE_STRING
 
 
+# The parse functions below are memoized on the raw attribute string, since
+# the same few strings recur across every command and struct in the registry
+# and are reparsed by each generator and checker. lru_cache is thread-safe.
+
+@functools.lru_cache(maxsize=None)
+def parse_len(len_str):
+    """Get a tuple of shared LengthEntry from a len or altlen attribute value."""
+    return tuple(LengthEntry(elt)._freeze() for elt in len_str.split(','))
+
+
+@functools.lru_cache(maxsize=None)
+def parse_externsync(sync_str):
+    """Get a tuple of shared ExternSyncEntry from an externsync attribute value."""
+    return tuple(ExternSyncEntry(elt)._freeze() for elt in sync_str.split(','))
+
+
+@functools.lru_cache(maxsize=None)
+def parse_optional(optional_str):
+    """Get a tuple of booleans from an optional attribute value."""
+    return tuple(_parse_optional_elt(elt) for elt in optional_str.split(','))
+
+
 def parse_optional_from_param(param):
-    """Get a list of booleans from a param: always returns at least one element."""
-    optional_str = param.get('optional', _FALSE_STRING)
-    return [_parse_optional_elt(elt) for elt in optional_str.split(',')]
+    """Get a tuple of booleans from a param: always returns at least one element."""
+    return parse_optional(param.get('optional', _FALSE_STRING))
 
 
 def has_any_optional_in_param(param):
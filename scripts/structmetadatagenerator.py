@@ -0,0 +1,206 @@
+#!/usr/bin/env python3 -i
+#
+# Copyright 2026 The Khronos Group Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import argparse
+import os
+import sys
+
+from base_generator import BaseGenerator, RunGenerators
+from lookuptables import (bitsetInitializer, bitsetWords, buildValueBlocks, extensionBase,
+                          extensionBlockSize, protected, valueIndex)
+from vulkan_object import Struct, VulkanObject
+
+class StructMetadataTable:
+    """Layout of the structs with an sType in a dense table indexed by
+    VkStructureType value, from which the C header is written.
+
+    - entries - dict of table index to Struct
+    - size - length of the table, including unused entries
+    - coreCount, blockStarts, blockCounts - as returned by
+      buildValueBlocks()
+    - extendable - sorted names of the structs which appear in any
+      'structextends', each with a bit in the extends bitsets
+    - extendsIndex - bit of each name in extendable
+    - extendsWords - number of 32-bit words in each extends bitset"""
+
+    def __init__(self, vk: VulkanObject):
+        values = {}
+        for field in vk.enums['VkStructureType'].fields:
+            for name in [field.name, *field.aliases]:
+                values[name] = field.value
+        structs = [struct for struct in vk.structs.values()
+                   if struct.sType is not None and struct.sType in values]
+
+        (self.coreCount, self.blockStarts, self.blockCounts) = buildValueBlocks([values[struct.sType] for struct in structs])
+        self.size = self.blockStarts[-1] + self.blockCounts[-1] if self.blockStarts else self.coreCount
+        self.entries = {valueIndex(values[struct.sType], self.blockStarts): struct for struct in structs}
+
+        self.extendable = sorted({name for struct in structs for name in struct.extends})
+        self.extendsIndex = {name: index for (index, name) in enumerate(self.extendable)}
+        self.extendsWords = max(1, (len(self.extendable) + 31) // 32)
+
+    def extendsBits(self, struct: Struct) -> list[int]:
+        """Return the words of the bitset of the structs struct can extend."""
+        return bitsetWords({self.extendsIndex[name] for name in struct.extends}, self.extendsWords)
+
+class StructMetadataGenerator(BaseGenerator):
+    """Generates a C header of tables describing every struct with an
+    sType, indexed by its VkStructureType value.
+
+    VkStructureType values are split into the core values, which index
+    the table directly, and the values of each extension block, which
+    are offset by a per-block start index. Looking up a value is
+    therefore two array accesses, and the table has no gaps except for
+    values unused within a block.
+
+    Each entry records the size, alignment, sType and pNext offsets, and
+    returnedOnly of the struct, and the structs it can extend as a bitset
+    with a bit for each struct which appears in any 'structextends'.
+    Entries of structs with a protect macro are only filled in if the
+    macro is defined."""
+
+    def __init__(self):
+        BaseGenerator.__init__(self)
+
+    def generate(self):
+        table = StructMetadataTable(self.vk)
+        blockTotal = len(table.blockStarts)
+
+        out = []
+        out.append(f'''// *** THIS FILE IS GENERATED - DO NOT EDIT ***
+// See {os.path.basename(__file__)} for modifications
+
+/*
+** Copyright 2026 The Khronos Group Inc.
+**
+** SPDX-License-Identifier: Apache-2.0
+*/
+
+#ifndef VK_STRUCT_METADATA_TABLES_H_
+#define VK_STRUCT_METADATA_TABLES_H_ 1
+
+// Metadata of every struct with an sType, looked up by its sType value:
+//   const StructMetadata *GetStructMetadata(VkStructureType sType)
+//     - NULL if sType is unknown, or the struct is protected by a
+//       platform or beta macro which is not defined
+//   bool StructCanExtend(const StructMetadata *ext, const StructMetadata *base)
+//     - true if ext may be included in the pNext chain of base
+// Include the platform headers, or define the VK_USE_PLATFORM_* macros,
+// before this header to enable the entries of platform-specific structs.
+
+#include <stdbool.h>
+#include <stddef.h>
+#include <stdint.h>
+#include <vulkan/vulkan.h>
+
+#if defined(__cplusplus)
+#define STRUCT_METADATA_ALIGNOF(type) alignof(type)
+#elif defined(__STDC_VERSION__) && __STDC_VERSION__ >= 201112L
+#define STRUCT_METADATA_ALIGNOF(type) _Alignof(type)
+#else
+#define STRUCT_METADATA_ALIGNOF(type) offsetof(struct {{ char c; type t; }}, t)
+#endif
+
+#ifdef __cplusplus
+extern "C" {{
+#endif
+
+// Number of structs which can be extended, and of words in each bitset
+#define STRUCT_METADATA_EXTENDABLE_COUNT {len(table.extendable)}
+#define STRUCT_METADATA_EXTENDS_WORDS {table.extendsWords}
+
+typedef struct StructMetadata {{
+    const char *name;             // NULL for unused entries
+    VkStructureType sType;
+    uint32_t size;
+    uint16_t alignment;
+    uint16_t sTypeOffset;
+    uint16_t pNextOffset;
+    int16_t extendsIndex;         // Bit for this struct in extends, or -1 if nothing extends it
+    bool returnedOnly;
+    uint32_t extends[STRUCT_METADATA_EXTENDS_WORDS]; // Bits of the structs this can extend
+}} StructMetadata;
+
+''')
+        out.append(f'static const StructMetadata StructMetadataTable[{max(table.size, 1)}] = {{\n')
+        for index in range(max(table.size, 1)):
+            struct = table.entries.get(index)
+            if struct is None:
+                out.append(self.emptyEntry(table))
+                continue
+            out.extend(self.structEntry(struct, table))
+        out.append('};\n\n')
+
+        out.append(f'static const uint32_t StructMetadataBlockStart[{max(blockTotal, 1)}] = {{\n')
+        out.extend(f'    {start},\n' for start in table.blockStarts or [0])
+        out.append('};\n')
+        out.append(f'static const uint16_t StructMetadataBlockCount[{max(blockTotal, 1)}] = {{\n')
+        out.extend(f'    {count},\n' for count in table.blockCounts or [0])
+        out.append('};\n\n')
+
+        out.append(f'''static inline const StructMetadata *GetStructMetadata(VkStructureType sType) {{
+    const StructMetadata *metadata;
+    uint32_t value = (uint32_t)sType;
+    if (value < {table.coreCount}u) {{
+        metadata = &StructMetadataTable[value];
+    }} else if (value >= {extensionBase}u) {{
+        uint32_t block = (value - {extensionBase}u) / {extensionBlockSize}u;
+        uint32_t offset = (value - {extensionBase}u) % {extensionBlockSize}u;
+        if (block >= {blockTotal}u || offset >= StructMetadataBlockCount[block]) return NULL;
+        metadata = &StructMetadataTable[StructMetadataBlockStart[block] + offset];
+    }} else {{
+        return NULL;
+    }}
+    return metadata->name != NULL ? metadata : NULL;
+}}
+
+static inline bool StructCanExtend(const StructMetadata *ext, const StructMetadata *base) {{
+    if (base->extendsIndex < 0) return false;
+    return (ext->extends[base->extendsIndex / 32] >> (base->extendsIndex % 32)) & 1u;
+}}
+
+#ifdef __cplusplus
+}}
+#endif
+
+#undef STRUCT_METADATA_ALIGNOF
+
+#endif // VK_STRUCT_METADATA_TABLES_H_
+''')
+        self.write(''.join(out))
+
+    def emptyEntry(self, table: StructMetadataTable) -> str:
+        """Return the line initializing an unused table entry. Every member
+        is initialized, so C++ compilers do not warn."""
+        return f'    {{NULL, (VkStructureType)0, 0, 0, 0, 0, -1, false, {bitsetInitializer([0] * table.extendsWords)}}},\n'
+
+    def structEntry(self, struct: Struct, table: StructMetadataTable) -> list[str]:
+        """Return the lines initializing the table entry of struct."""
+        memberNames = {member.name for member in struct.members}
+        pNextOffset = f'offsetof({struct.name}, pNext)' if 'pNext' in memberNames else '0'
+
+        entry = (f'    {{"{struct.name}", {struct.sType}, sizeof({struct.name}), '
+                 f'STRUCT_METADATA_ALIGNOF({struct.name}), offsetof({struct.name}, sType), {pNextOffset}, '
+                 f'{table.extendsIndex.get(struct.name, -1)}, {"true" if struct.returnedOnly else "false"}, '
+                 f'{bitsetInitializer(table.extendsBits(struct))}}},\n')
+        return protected(struct.protect, [entry], [self.emptyEntry(table)])
+
+if __name__ == '__main__':
+    defaultXml = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'xml', 'vk.xml'))
+
+    parser = argparse.ArgumentParser(description='Generate C struct metadata tables indexed by sType')
+    parser.add_argument('-o', default='.', help='directory to write the header to', dest='directory')
+    parser.add_argument('-filename', default='vk_struct_metadata_tables.h', help='name of the header to write')
+    parser.add_argument('-api', default='vulkan', choices=['vulkan', 'vulkansc', 'vulkanbase'],
+                        help='target API (default: vulkan)')
+    parser.add_argument('-xml', default=defaultXml, help='path to XML registry (default: xml/vk.xml)')
+    args = parser.parse_args()
+
+    (result,) = RunGenerators([(StructMetadataGenerator, args.filename)], args.xml, args.directory,
+                              args.api, processes = 1)
+    if result.error is not None:
+        print(result.error, file=sys.stderr)
+        sys.exit(1)
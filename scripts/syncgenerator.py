@@ -5,7 +5,6 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from generator import OutputGenerator, write
-from parse_dependency import evaluateDependency
 import os
 
 class SyncOutputGenerator(OutputGenerator):
@@ -59,10 +58,8 @@ class SyncOutputGenerator(OutputGenerator):
 
         filename = f"{self.genOpts.directory}/{basename}"
         self.logMsg('diag', '# Generating include file:', filename)
-        dirname = os.path.dirname(filename)
-        if not os.path.exists(dirname):
-            os.makedirs(dirname)
-        with open(filename, 'w', encoding='utf-8') as fp:
+        self.makeDir(os.path.dirname(filename))
+        with self.openOutput(filename) as fp:
             write(self.genOpts.conventions.warning_comment, file=fp)
 
             if len(contents) > 0:
@@ -124,63 +121,59 @@ class SyncOutputGenerator(OutputGenerator):
 
     def evaluatePipelineIfdef(self, stage):
         """Evaluate condition under which a pipeline stage should be emitted.
-           Returns (condition, result) where condition is the dependency
-           string, result is a Boolean
+           Returns the Condition from the condition table, or None if the
+           stage has no condition and is always emitted.
 
            - stage - pipeline stage name"""
 
         if stage in self.pipeline_stage_condition:
-            condition = self.pipeline_stage_condition[stage]
-            result = evaluateDependency(condition, lambda name: name in self.registry.genFeatures.keys())
-            return (condition, result)
+            return self.evaluateCondition(self.pipeline_stage_condition[stage])
         else:
             # No condition, so always include this stage
-            return (None, True)
+            return None
 
     def evaluateAccessIfdef(self, flag):
         """Evaluate condition under which an access flag should be emitted.
-           Returns (condition, result) where condition is the dependency
-           string, result is a Boolean
+           Returns the Condition from the condition table, or None if the
+           flag has no condition and is always emitted.
 
            - flag - access flag name"""
 
         if flag in self.access_flag_condition:
-            condition = self.access_flag_condition[flag]
-            result = evaluateDependency(condition, lambda name: name in self.registry.genFeatures.keys())
-            return (condition, result)
+            return self.evaluateCondition(self.access_flag_condition[flag])
         else:
             # No condition, so always include this flag
-            return (None, True)
+            return None
 
     def writeFlagDefinitions(self):
         for name, stages in self.pipeline_stage_equivalent.items():
             output = []
             for stage in stages:
-                (condition, result) = self.evaluatePipelineIfdef(stage)
-                if result:
+                condition = self.evaluatePipelineIfdef(stage)
+                if condition is None or condition.result:
                     output.append(f'  ** ename:{stage}')
                 else:
-                    output.append(f'// {condition} -> {result}, not emitting ** ename:{stage}')
+                    output.append(f'{condition.comment}, not emitting ** ename:{stage}')
 
             self.writeBlock(f'flagDefinitions/{name}{self.file_suffix}', output)
 
         for name, flags in self.access_flag_equivalent.items():
             output = []
             for flag in flags:
-                (condition, result) = self.evaluateAccessIfdef(flag)
-                if result:
+                condition = self.evaluateAccessIfdef(flag)
+                if condition is None or condition.result:
                     output.append(f'  ** ename:{flag}')
                 else:
-                    output.append(f'// {condition} -> {result}, not emitting ** ename:{flag}')
+                    output.append(f'{condition.comment}, not emitting ** ename:{flag}')
 
             self.writeBlock(f'flagDefinitions/{name}{self.file_suffix}', output)
 
     def supportedPipelineStages(self):
         output = []
         for stage in self.pipeline_stages:
-            (condition, result) = self.evaluatePipelineIfdef(stage)
+            condition = self.evaluatePipelineIfdef(stage)
 
-            if result:
+            if condition is None or condition.result:
                 queue_support = ''
                 if stage not in self.pipeline_stage_queue_support:
                     queue_support = 'None required'
@@ -193,15 +186,15 @@ class SyncOutputGenerator(OutputGenerator):
 
                 output.append(f'|ename:{stage} | {queue_support}')
             else:
-                output.append(f'// {condition} -> {result}, not emitting | ename:{stage} | <queue support>')
+                output.append(f'{condition.comment}, not emitting | ename:{stage} | <queue support>')
 
         self.writeBlock(f'supportedPipelineStages{self.file_suffix}', output)
 
     def supportedAccessTypes(self):
         output = []
         for (flag, alias) in self.access_flags:
-            (condition, result) = self.evaluateAccessIfdef(flag)
-            if result:
+            condition = self.evaluateAccessIfdef(flag)
+            if condition is None or condition.result:
                 if alias is None:
                     output.append(f'|ename:{flag} |')
                 else:
@@ -217,16 +210,16 @@ class SyncOutputGenerator(OutputGenerator):
                             end_symbol = ','
 
                         if not self.isSameConditionPipelineAccess(stage, flag):
-                            (condition, result) = self.evaluatePipelineIfdef(stage)
+                            condition = self.evaluatePipelineIfdef(stage)
                         else:
-                            result = True
+                            condition = None
 
-                        if result:
+                        if condition is None or condition.result:
                             output.append(f'\tename:{stage}{end_symbol}')
                         else:
-                            output.append(f'// {condition} -> {result}, not emitting \tename:{stage}{end_symbol}')
+                            output.append(f'{condition.comment}, not emitting \tename:{stage}{end_symbol}')
             else:
-                output.append(f'// {condition} -> {result}, not emitting | ename:{flag} | <flag stage support>')
+                output.append(f'{condition.comment}, not emitting | ename:{flag} | <flag stage support>')
 
         self.writeBlock(f'supportedAccessTypes{self.file_suffix}', output)
 
@@ -246,14 +239,14 @@ class SyncOutputGenerator(OutputGenerator):
                     continue
 
                 if not self.isSameConditionPipeline(depends, stage):
-                    (condition, result) = self.evaluatePipelineIfdef(stage)
+                    condition = self.evaluatePipelineIfdef(stage)
                 else:
-                    result = True
+                    condition = None
 
-                if result:
+                if condition is None or condition.result:
                     output.append(f'  * ename:{stage}')
                 else:
-                    output.append(f'// {condition} -> {result}, not emitting * ename:{stage}')
+                    output.append(f'{condition.comment}, not emitting * ename:{stage}')
 
             file_name = name.replace(' ', '_')
             self.writeBlock(f'pipelineOrders/{file_name}{self.file_suffix}', output)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3 -i
+#
+# Copyright 2026 The Khronos Group Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import sys
+from xml.etree import ElementTree
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+from spec_tools.attributes import (ExternSyncEntry, LengthEntry, parse_externsync,
+                                   parse_len, parse_optional, parse_optional_from_param)
+
+def testParseLen():
+    entries = parse_len('pCreateInfo->count,null-terminated')
+    assert [str(entry) for entry in entries] == ['pCreateInfo->count', 'null-terminated']
+    assert entries[0].other_param_name == 'pCreateInfo'
+    assert entries[1].null_terminated
+    assert parse_len('4')[0].number == 4
+    assert parse_len(r'latexmath:[2 \times count]')[0].math == r'2 \times count'
+
+    # Parsed once, and shared by every caller
+    assert parse_len('pCreateInfo->count,null-terminated') is entries
+    param = ElementTree.fromstring('<param len="pCreateInfo->count,null-terminated"/>')
+    assert LengthEntry.parse_len_from_param(param) is entries
+    assert LengthEntry.parse_len_from_param(ElementTree.fromstring('<param/>')) is None
+
+def testParseExternSync():
+    (entry,) = parse_externsync('true')
+    assert entry.entirely_extern_sync and not entry.conditionally_extern_sync
+    (entry,) = parse_externsync('maybe')
+    assert entry.entirely_extern_sync and entry.conditionally_extern_sync
+    (entry,) = parse_externsync('maybe:pInfo->swapchain')
+    assert not entry.entirely_extern_sync and entry.conditionally_extern_sync
+    assert entry.full_reference == 'pInfo->swapchain'
+    assert entry.member == 'pInfo'
+
+    entries = parse_externsync('pInfo->a,pInfo->b')
+    assert [entry.full_reference for entry in entries] == ['pInfo->a', 'pInfo->b']
+    assert parse_externsync('pInfo->a,pInfo->b') is entries
+    param = ElementTree.fromstring('<param externsync="pInfo->a,pInfo->b"/>')
+    assert ExternSyncEntry.parse_externsync_from_param(param) is entries
+
+def testParseOptional():
+    assert parse_optional('false,true') == (False, True)
+    assert parse_optional('false,true') is parse_optional('false,true')
+    assert parse_optional_from_param(ElementTree.fromstring('<param/>')) == (False,)
+    with pytest.raises(ValueError):
+        parse_optional('maybe')
+
+# Shared entries cannot be modified by one caller under another
+def testSharedEntriesFrozen():
+    (entry,) = parse_len('count')
+    with pytest.raises(AttributeError):
+        entry.other_param_name = 'other'
+    (entry,) = parse_externsync('maybe:pInfo->swapchain')
+    with pytest.raises(AttributeError):
+        entry.full_reference = 'other'
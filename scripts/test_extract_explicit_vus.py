@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+#
+# Copyright 2026 The Khronos Group Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+import extract_explicit_vus
+from extract_explicit_vus import extractFile, extractVUs
+
+drawSource = '''[open,refpage='vkCmdDraw',desc='Draw primitives',type='protos']
+--
+:refpage: vkCmdDraw
+
+.Valid Usage
+****
+include::{chapters}/commonvalidity/draw_common.adoc[]
+  * [[VUID-vkCmdDraw-None-00001]]
+    The first statement
+ifdef::VK_VERSION_1_1[]
+ifndef::VK_KHR_foo[]
+  * [[VUID-vkCmdDraw-None-00002]]
+    A statement with nested conditions
+endif::VK_KHR_foo[]
+endif::VK_VERSION_1_1[]
+  * [[VUID-vkCmdDraw-None-00003]]
+    A statement starting here
+ifdef::VK_KHR_bar[]
+    and continuing with bar
+endif::VK_KHR_bar[]
+    and ending here
+****
+--
+
+.Valid Usage
+****
+  * [[VUID-vkCmdOther-None-00004]]
+    A statement after the refpage block
+****
+'''
+
+drawCommonSource = '''// Common Valid Usage
+// Common to drawing commands
+  * [[VUID-{refpage}-commandBuffer-00005]]
+    pname:commandBuffer must: be in the recording state for {refpage}
+include::{chapters}/commonvalidity/draw_nested_common.adoc[]
+'''
+
+drawNestedCommonSource = '''// Common Valid Usage
+ifdef::VK_KHR_baz[]
+  * [[VUID-{refpage}-None-00006]]
+    A statement included twice over
+endif::VK_KHR_baz[]
+include::{chapters}/commonvalidity/draw_common.adoc[]
+'''
+
+def writeSources(directory):
+    chapters = directory / 'chapters'
+    (chapters / 'commonvalidity').mkdir(parents = True)
+    (chapters / 'draw.adoc').write_text(drawSource, encoding = 'utf-8')
+    (chapters / 'commonvalidity' / 'draw_common.adoc').write_text(drawCommonSource, encoding = 'utf-8')
+    (chapters / 'commonvalidity' / 'draw_nested_common.adoc').write_text(drawNestedCommonSource, encoding = 'utf-8')
+    return chapters
+
+@pytest.fixture
+def warnings(monkeypatch):
+    messages = []
+    monkeypatch.setattr(extract_explicit_vus, 'logWarn', lambda *args: messages.append(' '.join(args)))
+    return messages
+
+def testExtractVUs(tmp_path, warnings):
+    chapters = writeSources(tmp_path)
+    vus = {vu['vuid']: vu for vu in extractVUs([str(chapters)], commonPrefix = str(chapters), processes = 1)}
+    draw = str(chapters / 'draw.adoc')
+
+    assert list(vus) == ['VUID-vkCmdDraw-commandBuffer-00005', 'VUID-vkCmdDraw-None-00006',
+                         'VUID-vkCmdDraw-None-00001', 'VUID-vkCmdDraw-None-00002',
+                         'VUID-vkCmdDraw-None-00003', 'VUID-vkCmdOther-None-00004']
+
+    # Conditions are recorded from the outermost in
+    assert vus['VUID-vkCmdDraw-None-00001']['conditions'] == []
+    assert vus['VUID-vkCmdDraw-None-00001']['line'] == 8
+    assert vus['VUID-vkCmdDraw-None-00002']['conditions'] == [
+        {'directive': 'ifdef', 'attributes': 'VK_VERSION_1_1'},
+        {'directive': 'ifndef', 'attributes': 'VK_KHR_foo'}]
+
+    # A statement continued across a conditional keeps its whole text
+    assert vus['VUID-vkCmdDraw-None-00003']['text'] == '\n'.join([
+        'A statement starting here', 'ifdef::VK_KHR_bar[]', 'and continuing with bar',
+        'endif::VK_KHR_bar[]', 'and ending here'])
+    assert vus['VUID-vkCmdDraw-None-00003']['conditions'] == []
+
+    # Common statements take the attributes and refpage of the include site
+    common = vus['VUID-vkCmdDraw-commandBuffer-00005']
+    assert common['entity'] == 'vkCmdDraw'
+    assert common['refpage'] == 'vkCmdDraw'
+    assert common['text'] == 'pname:commandBuffer must: be in the recording state for vkCmdDraw'
+    assert common['includedFrom'] == [{'file': draw, 'line': 7}]
+
+    nested = vus['VUID-vkCmdDraw-None-00006']
+    assert nested['conditions'] == [{'directive': 'ifdef', 'attributes': 'VK_KHR_baz'}]
+    assert nested['includedFrom'] == [{'file': draw, 'line': 7},
+                                      {'file': str(chapters / 'commonvalidity' / 'draw_common.adoc'), 'line': 5}]
+
+    # The include of draw_common.adoc from within itself is skipped
+    assert len(warnings) == 1
+    assert 'recursive include of' in warnings[0] and warnings[0].endswith('draw_common.adoc')
+
+    # The refpage ends with its open block
+    assert vus['VUID-vkCmdDraw-None-00001']['refpage'] == 'vkCmdDraw'
+    assert vus['VUID-vkCmdOther-None-00004']['refpage'] is None
+
+def testExtractVUsProcesses(tmp_path):
+    chapters = writeSources(tmp_path)
+    assert (extractVUs([str(chapters)], commonPrefix = str(chapters), processes = 1) ==
+            extractVUs([str(chapters)], commonPrefix = str(chapters), processes = 2))
+
+def testUntaggedVU(tmp_path, warnings):
+    source = tmp_path / 'untagged.adoc'
+    source.write_text('''.Valid Usage
+****
+  * A statement without a VUID
+  * [[VUID-vkCmdDraw-None-00001]]
+    A tagged statement
+****
+''', encoding = 'utf-8')
+
+    items = extractFile(str(source))
+    assert [(item['vuid'], item['line']) for (kind, item) in items] == [('VUID-vkCmdDraw-None-00001', 4)]
+    assert warnings == [f'{source}:3: Valid Usage statement without a VUID found']
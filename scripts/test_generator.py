@@ -0,0 +1,216 @@
+#!/usr/bin/env python3 -i
+#
+# Copyright 2026 The Khronos Group Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import subprocess
+import sys
+import xml.etree.ElementTree as etree
+
+import pytest
+
+registry_path = os.path.abspath((os.path.dirname(__file__)))
+sys.path.insert(0, registry_path)
+import generator
+from generator import (AsyncFileWriter, ConditionTable, DeclCache, FileWriterError, GeneratorOptions,
+                       OutputGenerator, replaceFileIfChanged)
+from parse_dependency import compileDependency, evaluateDependency, evaluateStack
+from reg import Registry
+from vkconventions import VulkanConventions
+
+# Identical contents leave the file and its modification time alone
+def testWriteIfChanged(tmp_path):
+    out = tmp_path / 'out.txt'
+    assert replaceFileIfChanged(out, 'first\n', newline='\n')
+    assert out.read_text(encoding='utf-8') == 'first\n'
+
+    os.utime(out, (0, 0))
+    assert not replaceFileIfChanged(out, 'first\n', newline='\n')
+    assert os.stat(out).st_mtime == 0
+
+    assert not replaceFileIfChanged(out, 'first\n', newline='\n', touch=True)
+    assert os.stat(out).st_mtime != 0
+
+    os.utime(out, (0, 0))
+    assert replaceFileIfChanged(out, 'second\n', newline='\n')
+    assert os.stat(out).st_mtime != 0
+    assert out.read_text(encoding='utf-8') == 'second\n'
+
+    # No temporary files are left behind
+    assert [x.name for x in tmp_path.iterdir()] == ['out.txt']
+
+# New files get the permissions open() would give them, and existing files keep theirs
+def testWriteIfChangedMode(tmp_path):
+    umask = os.umask(0)
+    os.umask(umask)
+    out = tmp_path / 'out.txt'
+    replaceFileIfChanged(out, 'first\n')
+    assert os.stat(out).st_mode & 0o777 == 0o666 & ~umask
+
+    os.chmod(out, 0o600)
+    replaceFileIfChanged(out, 'second\n')
+    assert os.stat(out).st_mode & 0o777 == 0o600
+
+# Importing generator.py must not change the umask
+def testImportKeepsUmask():
+    script = 'import os; os.umask(0o077); import generator; print(oct(os.umask(0)))'
+    result = subprocess.run([sys.executable, '-c', script], cwd=registry_path,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '0o77'
+
+# Writes complete in the background, creating directories as needed
+def testAsyncFileWriter(tmp_path):
+    with AsyncFileWriter(maxWorkers=4, maxPending=2) as writer:
+        futures = [writer.submit(tmp_path / f'dir{i % 3}' / f'out{i}.txt', f'{i}\n', newline='\n')
+                   for i in range(20)]
+        writer.flush()
+        assert all(future.result() for future in futures)
+        assert not writer.submit(tmp_path / 'dir0' / 'out0.txt', '0\n', newline='\n').result()
+    for i in range(20):
+        assert (tmp_path / f'dir{i % 3}' / f'out{i}.txt').read_text(encoding='utf-8') == f'{i}\n'
+
+# The last contents submitted for a file are the ones written
+def testAsyncFileWriterOrder(tmp_path):
+    out = tmp_path / 'out.txt'
+    with AsyncFileWriter(maxWorkers=8) as writer:
+        for i in range(100):
+            writer.submit(out, f'{i}\n' * (100 - i), newline='\n')
+    assert out.read_text(encoding='utf-8') == '99\n'
+
+# Failed writes are reported by flush(), in submission order
+def testAsyncFileWriterError(tmp_path):
+    (tmp_path / 'file').write_text('')
+    writer = AsyncFileWriter()
+    writer.submit(tmp_path / 'file' / 'b.txt', 'b')
+    writer.submit(tmp_path / 'ok.txt', 'ok')
+    writer.submit(tmp_path / 'file' / 'a.txt', 'a')
+    with pytest.raises(FileWriterError) as error:
+        writer.shutdown()
+    assert [filename for (filename, _) in error.value.errors] == [
+        os.fspath(tmp_path / 'file' / 'b.txt'), os.fspath(tmp_path / 'file' / 'a.txt')]
+    assert (tmp_path / 'ok.txt').read_text(encoding='utf-8') == 'ok'
+
+    # The writer threads are stopped even though writes failed
+    with pytest.raises(RuntimeError):
+        writer.submit(tmp_path / 'ok.txt', 'ok')
+
+minimalRegistry = """<registry>
+    <feature api="vulkan" name="VK_VERSION_1_0" number="1.0"><require/></feature>
+</registry>"""
+
+class IncludeWriterGenerator(OutputGenerator):
+    """Writes one include file per entry of includes, then raises error if set."""
+
+    def __init__(self, includes, error=None):
+        super().__init__(errFile=None, warnFile=None, diagFile=None)
+        self.includes = includes
+        self.error = error
+        self.writers = []
+
+    def endFile(self):
+        self.writers.append(self.fileWriter)
+        for (filename, contents) in self.includes:
+            with self.openOutput(os.path.join(self.genOpts.directory, filename)) as fp:
+                fp.write(contents)
+        if self.error is not None:
+            raise self.error
+        OutputGenerator.endFile(self)
+
+def runIncludeWriter(directory, gen):
+    options = GeneratorOptions(conventions=VulkanConventions(), filename='main.txt',
+                               directory=os.fspath(directory), apiname='vulkan')
+    registry = Registry(gen, options)
+    registry.loadElementTree(etree.ElementTree(etree.fromstring(minimalRegistry)))
+    registry.apiGen()
+
+# Include files are written by the generator's writer threads before the main file
+def testGeneratorAsyncWrites(tmp_path):
+    gen = IncludeWriterGenerator([('inc/a.txt', 'a\n'), ('inc/b.txt', 'b\n')])
+    runIncludeWriter(tmp_path, gen)
+    assert isinstance(gen.writers[0], AsyncFileWriter)
+    assert gen.fileWriter is None
+    assert (tmp_path / 'inc' / 'a.txt').read_text(encoding='utf-8') == 'a\n'
+    assert (tmp_path / 'inc' / 'b.txt').read_text(encoding='utf-8') == 'b\n'
+    assert (tmp_path / 'main.txt').exists()
+
+# A failed include write is raised from apiGen(), and the main file is not written
+def testGeneratorWriteError(tmp_path):
+    (tmp_path / 'inc').write_text('')
+    with pytest.raises(FileWriterError):
+        runIncludeWriter(tmp_path, IncludeWriterGenerator([('inc/a.txt', 'a\n')]))
+    assert not (tmp_path / 'main.txt').exists()
+
+# When generation raises, queued writes finish and the writer threads are stopped
+def testGeneratorErrorStopsWriter(tmp_path):
+    gen = IncludeWriterGenerator([('inc/a.txt', 'a\n')], error=ValueError('generation failed'))
+    with pytest.raises(ValueError):
+        runIncludeWriter(tmp_path, gen)
+    assert gen.fileWriter is None
+    assert (tmp_path / 'inc' / 'a.txt').read_text(encoding='utf-8') == 'a\n'
+    assert not (tmp_path / 'main.txt').exists()
+    with pytest.raises(RuntimeError):
+        gen.writers[0].submit(tmp_path / 'inc' / 'b.txt', 'b\n')
+
+# A saved cache is only reused with the same fingerprint
+def testDeclCache(tmp_path):
+    filename = tmp_path / 'decls.pickle'
+    cache = DeclCache('one')
+    cache.save(filename)
+    assert not filename.exists()
+
+    cache.set(('struct', 'VkFoo'), 'typedef struct VkFoo {} VkFoo;')
+    cache.save(filename)
+    assert cache.added == {}
+
+    loaded = DeclCache.load(filename, 'one')
+    assert loaded.get(('struct', 'VkFoo')) == 'typedef struct VkFoo {} VkFoo;'
+    assert loaded.added == {}
+    assert DeclCache.load(filename, 'two').get(('struct', 'VkFoo')) is None
+
+    # Entries added in other processes are saved with the cache
+    loaded.update({('struct', 'VkBar'): 'typedef struct VkBar {} VkBar;'})
+    loaded.save(filename)
+    assert DeclCache.load(filename, 'one').get(('struct', 'VkBar')) == 'typedef struct VkBar {} VkBar;'
+
+    # Missing and corrupt files give an empty cache
+    assert DeclCache.load(tmp_path / 'missing', 'one').entries == {}
+    filename.write_bytes(b'not a pickle')
+    assert DeclCache.load(filename, 'one').entries == {}
+
+# A compiled expression stack can be evaluated any number of times
+def testCompileDependency():
+    stack = compileDependency('VK_VERSION_1_1+(VK_KHR_a,VK_KHR_b)')
+    assert isinstance(stack, tuple)
+    for supported in ({'VK_VERSION_1_1', 'VK_KHR_b'}, {'VK_VERSION_1_1'}, {'VK_KHR_a', 'VK_KHR_b'}):
+        expected = evaluateDependency('VK_VERSION_1_1+(VK_KHR_a,VK_KHR_b)', supported.__contains__)
+        assert evaluateStack(list(stack), supported.__contains__) == expected
+        assert evaluateStack(list(stack), supported.__contains__) == expected
+    assert compileDependency('VK_VERSION_1_1+(VK_KHR_a,VK_KHR_b)') == stack
+
+# Each expression is compiled once, and evaluated against the features
+# generated when the table is first used
+def testConditionTable(monkeypatch):
+    compiled = []
+    def countingCompile(condition):
+        compiled.append(condition)
+        return compileDependency(condition)
+    monkeypatch.setattr(generator, 'compileDependency', countingCompile)
+
+    class FakeRegistry:
+        genFeatures = {'VK_VERSION_1_1': None, 'VK_KHR_a': None}
+    registry = FakeRegistry()
+
+    table = ConditionTable()
+    condition = table.lookup('VK_VERSION_1_1+VK_KHR_a', registry)
+    assert condition.result
+    assert condition.comment == '// VK_VERSION_1_1+VK_KHR_a -> True'
+    assert not table.lookup('VK_KHR_b', registry).result
+
+    registry.genFeatures = {}
+    assert table.lookup('VK_VERSION_1_1+VK_KHR_a', registry) is condition
+    assert table.lookup('VK_KHR_a,VK_KHR_b', registry).result
+    assert compiled == ['VK_VERSION_1_1+VK_KHR_a', 'VK_KHR_b', 'VK_KHR_a,VK_KHR_b']
+
+    assert not ConditionTable().lookup('VK_VERSION_1_1+VK_KHR_a', registry).result
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3 -i
+#
+# Copyright 2026 The Khronos Group Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import io
+import json
+import os
+import pickle
+import subprocess
+import sys
+
+registry_path = os.path.abspath((os.path.dirname(__file__)))
+sys.path.insert(0, registry_path)
+
+vkxml = os.path.join(registry_path, '..', 'xml', 'vk.xml')
+
+def runGenvk(directory, target, *arguments):
+    """Run genvk.py to generate target in directory."""
+    subprocess.run([sys.executable, 'genvk.py', '-registry', vkxml, '-quiet',
+                    '-o', os.fspath(directory), *arguments, target],
+                   cwd=registry_path, check=True, capture_output=True)
+
+def readTree(directory, exclude=()):
+    """Return the contents of every file below directory, keyed by path
+    relative to it."""
+    files = {}
+    for (dirpath, _, filenames) in os.walk(directory):
+        for filename in filenames:
+            path = os.path.relpath(os.path.join(dirpath, filename), directory).replace(os.sep, '/')
+            if path not in exclude:
+                with open(os.path.join(dirpath, filename), 'rb') as fp:
+                    files[path] = fp.read()
+    return files
+
+# The manifest lists every generated file with its hash and entities
+def testManifest(tmp_path):
+    runGenvk(tmp_path, 'apiinc', '-manifest')
+    with open(tmp_path / 'apiinc.manifest.json', encoding='utf-8') as fp:
+        manifest = json.load(fp)
+    assert manifest['generator'] == 'DocOutputGenerator'
+    assert manifest['filename'] == 'timeMarker'
+
+    files = readTree(tmp_path, exclude={'apiinc.manifest.json'})
+    assert set(manifest['files']) == set(files)
+    for (path, entry) in manifest['files'].items():
+        assert entry['sha256'] == hashlib.sha256(files[path]).hexdigest(), path
+    assert manifest['files']['protos/vkCreateInstance.adoc']['entities'] == ['vkCreateInstance']
+    assert manifest['files']['structs/VkInstanceCreateInfo.adoc']['entities'] == ['VkInstanceCreateInfo']
+    assert manifest['files']['timeMarker']['entities'] == []
+
+    # No manifest is written unless requested
+    runGenvk(tmp_path / 'plain', 'apiinc')
+    assert not (tmp_path / 'plain' / 'apiinc.manifest.json').exists()
+
+# genTargetInMemory() returns the files genvk.py writes, and writes nothing
+def testGenTargetInMemory(tmp_path):
+    from genvk import genTargetInMemory
+
+    runGenvk(tmp_path / 'disk', 'hostsyncinc')
+    files = genTargetInMemory('hostsyncinc', ['-registry', vkxml, '-o', os.fspath(tmp_path / 'memory')])
+    assert {path: contents.encode('utf-8') for (path, contents) in files.items()} == readTree(tmp_path / 'disk')
+    assert not (tmp_path / 'memory').exists()
+
+# Sinks of fused targets return their files too, under their subdirectories
+def testGenTargetInMemoryFused(tmp_path):
+    from genvk import genTargetInMemory
+
+    files = genTargetInMemory('apimaps', ['-registry', vkxml, '-o', os.fspath(tmp_path)])
+    assert set(files) == {'apimap.py', 'apimap.bin', 'apimap.cjs', 'apimap.rb'}
+    assert 'vkCreateInstance' in files['apimap.py']
+    assert isinstance(files['apimap.bin'], bytes)
+
+    files = genTargetInMemory('docinc', ['-registry', vkxml, '-o', os.fspath(tmp_path)])
+    assert 'api/protos/vkCreateInstance.adoc' in files
+    assert 'validity/protos/vkCreateInstance.adoc' in files
+    assert 'interfaces/VK_VERSION_1_0.adoc' in files
+    assert list(tmp_path.iterdir()) == []
+
+# Parallel validity generation writes the same files as serial generation
+def testValidityProcesses(tmp_path):
+    runGenvk(tmp_path / 'serial', 'validinc')
+    runGenvk(tmp_path / 'parallel', 'validinc', '-processes', '4')
+    serial = readTree(tmp_path / 'serial')
+    assert len(serial) > 500
+    assert readTree(tmp_path / 'parallel') == serial
+
+# Without fork, -processes falls back to serial generation with a warning
+def testValidityProcessesWithoutFork(monkeypatch):
+    import genvk
+    import validitygenerator
+
+    monkeypatch.setattr(validitygenerator.multiprocessing, 'get_all_start_methods', lambda: ['spawn'])
+    warnings = io.StringIO()
+    monkeypatch.setattr(genvk, 'errWarn', warnings)
+    parallel = genvk.genTargetInMemory('validinc', ['-registry', vkxml, '-processes', '2'])
+    assert 'Cannot use 2 processes without fork' in warnings.getvalue()
+
+    monkeypatch.undo()
+    assert genvk.genTargetInMemory('validinc', ['-registry', vkxml]) == parallel
+
+# The implicit valid usage JSON is written to a new directory, and only dated
+# when SOURCE_DATE_EPOCH is set
+def testImplicitValidUsageJson(tmp_path, monkeypatch):
+    monkeypatch.delenv('SOURCE_DATE_EPOCH', raising=False)
+    runGenvk(tmp_path / 'new' / 'dir', 'implicitvalidusage.json')
+    assert os.listdir(tmp_path / 'new' / 'dir') == ['implicitvalidusage.json']
+    with open(tmp_path / 'new' / 'dir' / 'implicitvalidusage.json', encoding='utf-8') as fp:
+        validUsage = json.load(fp)
+    assert 'date' not in validUsage['version info']
+    assert validUsage['version info']['api version'].startswith('1.')
+    assert any(entry['vuid'].startswith('VUID-vkCreateInstance-')
+               for entry in validUsage['validation']['vkCreateInstance']['core'])
+
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', '0')
+    runGenvk(tmp_path, 'implicitvalidusage.json')
+    with open(tmp_path / 'implicitvalidusage.json', encoding='utf-8') as fp:
+        assert json.load(fp)['version info']['date'] == '1970-01-01 00:00:00Z'
+
+# -extensionScope regenerates the entities an extension requires, including
+# the enum groups it extends, exactly as a full build generates them
+def testExtensionScope(tmp_path):
+    runGenvk(tmp_path / 'full', 'apiinc', '-extension', 'VK_KHR_swapchain')
+    runGenvk(tmp_path / 'scope', 'apiinc', '-extension', 'VK_KHR_swapchain',
+             '-extensionScope', 'VK_KHR_swapchain')
+    full = readTree(tmp_path / 'full')
+    scope = readTree(tmp_path / 'scope', exclude={'timeMarker'})
+
+    assert {'protos/vkCreateSwapchainKHR.adoc', 'structs/VkSwapchainCreateInfoKHR.adoc',
+            'enums/VkStructureType.adoc', 'enums/VkImageLayout.adoc', 'enums/VkResult.adoc'} <= set(scope)
+    assert b'VK_STRUCTURE_TYPE_SWAPCHAIN_CREATE_INFO_KHR' in scope['enums/VkStructureType.adoc']
+    assert 'protos/vkCreateInstance.adoc' not in scope
+    for (path, contents) in scope.items():
+        assert full[path] == contents, path
+
+# Targets writing files which cover many entities refuse the emission
+# filters rather than write a truncated file
+def testEmitFilterTargets(tmp_path):
+    for (target, option) in (('vulkan_core.h', '-entities'), ('apimap.py', '-entities'),
+                             ('vulkan_headers', '-extensionScope'), ('docinc', '-extensionScope')):
+        result = subprocess.run([sys.executable, 'genvk.py', '-registry', vkxml, '-quiet',
+                                 '-o', os.fspath(tmp_path), option, 'vkCmdDraw', target],
+                                cwd=registry_path, capture_output=True, text=True)
+        assert result.returncode != 0, target
+        assert '-entities and -extensionScope only apply to the targets' in result.stderr
+        assert not os.listdir(tmp_path)
+
+# A header target set writes the same headers as generating each on its own
+def testHeaderTargetSet(tmp_path):
+    import genvk
+
+    genvk.makeGenOpts(genvk.makeArgParser().parse_args(['vulkan_headers']))
+    targets = genvk.targetSets['vulkan_headers']
+    runGenvk(tmp_path / 'set', 'vulkan_headers')
+    headers = readTree(tmp_path / 'set')
+    assert set(headers) == set(targets)
+
+    for target in ('vulkan_core.h', 'vulkan_win32.h', 'vulkan_beta.h'):
+        runGenvk(tmp_path / target, target)
+        assert readTree(tmp_path / target) == {target: headers[target]}
+
+# The declaration cache is discarded when the registry, or the generator or
+# conventions code, changes
+def testDeclCacheFingerprint(tmp_path):
+    import genvk
+    from vkconventions import VulkanConventions
+
+    def fingerprint(registry, conventions=None):
+        args = genvk.makeArgParser().parse_args(['-registry', os.fspath(registry), 'vulkan_core.h'])
+        genvk.makeGenOpts(args)
+        options = genvk.genOpts['vulkan_core.h'][1]
+        if conventions is not None:
+            options.conventions = conventions
+        return genvk.makeDeclCache(args, options).fingerprint
+
+    other = tmp_path / 'vk.xml'
+    with open(vkxml, 'rb') as fp:
+        other.write_bytes(fp.read() + b'\n')
+    assert fingerprint(vkxml) == fingerprint(vkxml)
+    assert fingerprint(vkxml) != fingerprint(other)
+
+    # A conventions class defined in this file makes the fingerprint depend on it
+    class TestConventions(VulkanConventions):
+        pass
+    assert fingerprint(vkxml, VulkanConventions()) == fingerprint(vkxml)
+    assert fingerprint(vkxml, TestConventions()) != fingerprint(vkxml)
+
+# Headers generated from a saved declaration cache are identical
+def testDeclCacheReuse(tmp_path):
+    cacheFile = tmp_path / 'decls.pickle'
+    runGenvk(tmp_path / 'plain', 'vulkan_core.h')
+    runGenvk(tmp_path / 'first', 'vulkan_core.h', '-declCache', os.fspath(cacheFile))
+    with open(cacheFile, 'rb') as fp:
+        (_, entries) = pickle.load(fp)
+    assert any(key[:2] == ('struct', 'VkInstanceCreateInfo') for key in entries)
+
+    mtime = os.stat(cacheFile).st_mtime_ns
+    runGenvk(tmp_path / 'second', 'vulkan_core.h', '-declCache', os.fspath(cacheFile))
+    assert os.stat(cacheFile).st_mtime_ns == mtime
+    plain = readTree(tmp_path / 'plain')
+    assert readTree(tmp_path / 'first') == plain
+    assert readTree(tmp_path / 'second') == plain
+
+# docinc writes the same files as apiinc, validinc, hostsyncinc and
+# interfaceinc, each in the subdirectory xml/Makefile generates it in
+def testDocincFused(tmp_path):
+    runGenvk(tmp_path / 'fused', 'docinc', '-manifest')
+    fused = readTree(tmp_path / 'fused')
+
+    separate = {}
+    for (target, subdirectory) in (('apiinc', 'api'), ('validinc', 'validity'),
+                                   ('hostsyncinc', 'hostsynctable'), ('interfaceinc', 'interfaces')):
+        runGenvk(tmp_path / subdirectory, target, '-manifest')
+        files = readTree(tmp_path / subdirectory)
+
+        # Each sink writes its own manifest, named after the fused target
+        manifest = json.loads(files.pop(f'{target}.manifest.json'))
+        fusedManifest = json.loads(fused.pop(f'{subdirectory}/docinc.manifest.json'))
+        assert fusedManifest['files'] == manifest['files']
+
+        separate.update((f'{subdirectory}/{path}', contents) for (path, contents) in files.items())
+
+    assert fused == separate
+
+# apimap.bin holds the same maps as apimap.py, and is not used once it no
+# longer matches apimap.py
+def testApiMapRoundTrip(tmp_path):
+    import importlib.util
+    from apimaploader import ApiMap, loadApiMap
+    from genvk import genTargetInMemory
+
+    files = genTargetInMemory('apimap.py', ['-registry', vkxml, '-o', os.fspath(tmp_path)])
+    (tmp_path / 'apimap.py').write_text(files['apimap.py'], encoding='utf-8', newline='\n')
+    (tmp_path / 'apimap.bin').write_bytes(files['apimap.bin'])
+
+    spec = importlib.util.spec_from_file_location('roundtrip_apimap', tmp_path / 'apimap.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    apiMap = loadApiMap(os.fspath(tmp_path))
+    assert isinstance(apiMap, ApiMap)
+    names = [name for name in dir(apiMap) if not name.startswith('_')]
+    assert {'typeCategory', 'alias', 'nonexistent', 'requiredBy', 'features'} <= set(names)
+    for name in names:
+        assert getattr(apiMap, name) == getattr(module, name), name
+
+    # Regenerating apimap.py alone makes apimap.bin stale
+    with open(tmp_path / 'apimap.py', 'a', encoding='utf-8') as fp:
+        fp.write('# regenerated\n')
+    assert not isinstance(loadApiMap(os.fspath(tmp_path)), ApiMap)
+
+# apimaps writes the same files as apimap.py, apimap.cjs and apimap.rb
+def testApiMapsFused(tmp_path):
+    runGenvk(tmp_path / 'fused', 'apimaps')
+    fused = readTree(tmp_path / 'fused')
+
+    separate = {}
+    for target in ('apimap.py', 'apimap.cjs', 'apimap.rb'):
+        runGenvk(tmp_path / target, target)
+        separate.update(readTree(tmp_path / target))
+    assert set(separate) == {'apimap.py', 'apimap.bin', 'apimap.cjs', 'apimap.rb'}
+    assert fused == separate
@@ -3,7 +3,9 @@
 # Copyright 2025-2026 The Khronos Group Inc.
 #
 # SPDX-License-Identifier: Apache-2.0 OR MIT
+import copy
 import os
+import subprocess
 import sys
 import pytest
 from xml.etree import ElementTree
@@ -11,8 +13,10 @@ from xml.etree import ElementTree
 registry_path = os.path.abspath((os.path.dirname(__file__)))
 sys.path.insert(0, registry_path)
 from reg import Registry
+import base_generator
 from base_generator import *
 from vulkan_object import *
+from vulkan_object_diff import *
 
 class MyGenerator(BaseGenerator):
     def __init__(self):
@@ -228,6 +232,35 @@ def testVulkanObjectStructPropertyAliasStore(tmp_path):
     member5 = next(m for m in struct5.members if m.name == "framebufferIntegerColorSampleCounts")
     assert member5.capabilityAlias is None
 
+# Check definingRequirements and that extension lists are kept unique
+def testDefiningRequirements():
+    xml_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'xml', 'vk.xml'))
+    builder = base_generator._VulkanObjectBuilder()
+    options = BaseGeneratorOptions(customApiName = 'vulkan')
+    options.cachingEnabled = False
+    reg = Registry(builder, options)
+    reg.loadElementTree(ElementTree.parse(xml_path))
+    reg.apiGen()
+    vk = builder.vk
+
+    assert vk.commands['vkCreateDevice'].definingRequirements == {'VK_VERSION_1_0': None}
+    assert vk.commands['vkCmdDrawIndirectCountKHR'].definingRequirements == {'VK_KHR_draw_indirect_count': None}
+    assert vk.commands['vkGetDeviceGroupPresentCapabilitiesKHR'].definingRequirements == {
+        'VK_KHR_device_group': 'VK_KHR_surface', 'VK_KHR_swapchain': 'VK_VERSION_1_1'}
+    assert vk.aliasTypeRequirements['VkPhysicalDeviceFeatures2KHR'] == {'VK_KHR_get_physical_device_properties2': None}
+
+    name = 'vkGetDeviceGroupPresentCapabilitiesKHR'
+    assert builder.buildDefiningRequirements(name) == vk.commands[name].definingRequirements
+    assert builder.buildDefiningRequirements(name, ['VK_KHR_swapchain', 'VK_EXT_debug_utils']) == {
+        'VK_EXT_debug_utils': None, 'VK_KHR_swapchain': 'VK_VERSION_1_1'}
+    assert builder.buildDefiningRequirements(name, []) == {}
+
+    for command in vk.commands.values():
+        assert len(set(command.extensions)) == len(command.extensions)
+    for extension in vk.extensions.values():
+        assert len({id(x) for x in extension.commands}) == len(extension.commands)
+    assert not builder.requirements.uniqueCache and not builder.requirements.nameIndexCache
+
 def testVulkanObjectWithVideo(tmp_path):
     SetOutputDirectory(tmp_path)
     SetOutputFileName("test_vulkan_object_with_video_out.txt")
@@ -275,3 +308,296 @@ def testVulkanObjectWithVideoSC(tmp_path):
     tree = ElementTree.parse(xml_path)
     reg.loadElementTree(tree)
     reg.apiGen()
+
+class RunnerCountGenerator(BaseGenerator):
+    def generate(self):
+        self.write(f'{self.targetApiName} {len(self.vk.commands)}')
+
+class RunnerFailingGenerator(BaseGenerator):
+    def generate(self):
+        raise RuntimeError('expected failure')
+
+# Several generators run from one VulkanObject, a failure only affects its own output
+def testRunGenerators(tmp_path):
+    xml_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'xml', 'vk.xml'))
+    vk = BuildVulkanObject(xml_path, 'vulkan')
+
+    generators = [(RunnerCountGenerator, 'count_a.txt'),
+                  (RunnerFailingGenerator, 'failing.txt'),
+                  (RunnerCountGenerator, 'count_b.txt')]
+    for processes in (1, 2):
+        results = RunGenerators(generators, xml_path, str(tmp_path / str(processes)), 'vulkan',
+                                processes = processes, vk = vk)
+        assert [x.filename for x in results] == ['count_a.txt', 'failing.txt', 'count_b.txt']
+        assert results[0].error is None and results[2].error is None
+        assert 'expected failure' in results[1].error
+        for name in ('count_a.txt', 'count_b.txt'):
+            with open(tmp_path / str(processes) / name, encoding='utf-8') as f:
+                assert f.read() == f'vulkan {len(vk.commands)}\n'
+        assert not (tmp_path / str(processes) / 'failing.txt').exists()
+
+class PostProcessPassGenerator(BaseGenerator):
+    def __init__(self):
+        BaseGenerator.__init__(self)
+        self.timedPasses = []
+        self.postProcessTimingHook = lambda name, seconds: self.timedPasses.append(name)
+        self.addPostProcessPass('countBufferUsers', self.countBufferUsers, before = 'maxSync')
+
+    def countBufferUsers(self):
+        self.bufferUsers = self.getTypeUsageGraph().usedBy['VkBuffer']
+
+    def generate(self):
+        return
+
+# Downstream passes run in the pipeline and share the type usage graph
+def testPostProcessPass(tmp_path):
+    SetOutputDirectory(tmp_path)
+    SetOutputFileName("test_post_process_pass.txt")
+    SetTargetApiName('vulkan')
+    SetMergedApiNames(None)
+
+    generator = PostProcessPassGenerator()
+    reg = Registry(generator, BaseGeneratorOptions())
+    xml_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'xml', 'vk.xml'))
+    reg.loadElementTree(ElementTree.parse(xml_path))
+    reg.apiGen()
+
+    assert generator.timedPasses[-2:] == ['countBufferUsers', 'maxSync']
+    assert set(generator.timedPasses) == set(generator.postProcessTimes.keys())
+    assert 'vkCmdCopyBuffer' in generator.bufferUsers
+    assert 'VkBufferCopy' not in generator.bufferUsers
+    assert generator.vk.handles['VkQueue'].device and not generator.vk.handles['VkQueue'].instance
+    assert generator.vk.handles['VkDisplayModeKHR'].instance
+
+    with pytest.raises(ValueError, match = 'before notAPass, which is not one of .*maxSync'):
+        generator.addPostProcessPass('misplaced', generator.countBufferUsers, before = 'notAPass')
+
+def testExternSyncGet():
+    def param(externsync):
+        return ElementTree.fromstring(f'<param externsync="{externsync}"/>' if externsync else '<param/>')
+    assert externSyncGet(param(None)) == (ExternSync.NONE, None)
+    assert externSyncGet(param('true')) == (ExternSync.ALWAYS, None)
+    assert externSyncGet(param('maybe')) == (ExternSync.MAYBE, None)
+    assert externSyncGet(param('pInfo-&gt;swapchain')) == (ExternSync.SUBTYPE, 'pInfo->swapchain')
+    assert externSyncGet(param('maybe:pInfo-&gt;swapchain')) == (ExternSync.SUBTYPE_MAYBE, 'pInfo->swapchain')
+    hits = base_generator._parseExternSync.cache_info().hits
+    assert externSyncGet(param('maybe:pInfo-&gt;swapchain')) == (ExternSync.SUBTYPE_MAYBE, 'pInfo->swapchain')
+    assert base_generator._parseExternSync.cache_info().hits == hits + 1
+
+    # base_generator.py is shipped with Vulkan-Headers, which does not have spec_tools/attributes.py
+    script = "import sys, base_generator; print('spec_tools.attributes' in sys.modules)"
+    result = subprocess.run([sys.executable, '-c', script], cwd=registry_path,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == 'False'
+
+def testVulkanObjectDiff():
+    xml_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'xml', 'vk.xml'))
+    old = BuildVulkanObject(xml_path, 'vulkan')
+    new = BuildVulkanObject(xml_path, 'vulkan')
+
+    assert not diffVulkanObjects(old, new)
+
+    new.fingerprints.clear()
+    del new.commands['vkCmdDraw']
+    new.structs['VkBufferCreateInfo'].members.pop()
+    new.enums['VkFormat'].fields[1].valueStr = '12345'
+    new.structs['VkBufferCopy'] = copy.deepcopy(new.structs['VkBufferCopy'])
+    new.structs['VkMyNewStructEXT'] = new.structs.pop('VkBufferCopy')
+
+    diff = diffVulkanObjects(old, new)
+    assert diff.commands == ItemDiff(removed = ('vkCmdDraw',))
+    assert diff.structs.added == ('VkMyNewStructEXT',)
+    assert diff.structs.removed == ('VkBufferCopy',)
+    assert diff.structs.changed == ('VkBufferCreateInfo',)
+    assert diff.members == (('VkBufferCreateInfo', ItemDiff(removed = (old.structs['VkBufferCreateInfo'].members[-1].name,))),)
+    assert diff.enums.changed == ('VkFormat',)
+    assert diff.enumFields == (('VkFormat', ItemDiff(changed = (old.enums['VkFormat'].fields[1].name,))),)
+    assert not diff.formats and not diff.handles
+    # Usable as a key to decide what to regenerate
+    assert hash(diff) == hash(diffVulkanObjects(old, new))
+
+# The VideoStd is reused from the cache for another API target that has the same Video Std definitions
+def testVideoStdCache(tmp_path):
+    SetOutputDirectory(tmp_path)
+    SetOutputFileName("test_video_std_cache.txt")
+    SetTargetApiName('vulkan')
+    SetMergedApiNames(None)
+    video_xml_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'xml', 'video.xml'))
+
+    def loadVideoStd(api_name, merged_api_names):
+        options = BaseGeneratorOptions(customApiName = api_name, videoXmlPath = video_xml_path,
+                                       videoStdCacheDirectory = str(tmp_path / 'cache'))
+        options.mergeApiNames = merged_api_names
+        return BaseGenerator().loadVideoStd(options)
+
+    base_generator._videoStdCache.clear()
+    videoStd = loadVideoStd('vulkan', None)
+    assert len(list((tmp_path / 'cache').iterdir())) == 1
+
+    # Only the in-memory cache is cleared, so this comes from the file
+    base_generator._videoStdCache.clear()
+    cachedVideoStd = loadVideoStd('vulkansc', 'vulkan')
+    assert cachedVideoStd == videoStd
+    assert cachedVideoStd is not videoStd
+    assert len(list((tmp_path / 'cache').iterdir())) == 1
+
+    # Without vulkan enabled none of the video.xml headers are supported
+    assert loadVideoStd('vulkansc', None).headers == {}
+
+    # A cache written by different code is not used
+    base_generator._videoStdCache.clear()
+    codeDigest = base_generator._videoStdCodeHash()
+    try:
+        cacheFiles = len(list((tmp_path / 'cache').iterdir()))
+        base_generator._videoStdCodeDigest = 'other'
+        assert loadVideoStd('vulkan', None) == videoStd
+        assert len(list((tmp_path / 'cache').iterdir())) == cacheFiles + 1
+    finally:
+        base_generator._videoStdCodeDigest = codeDigest
+
+tables_xml_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'xml', 'vk.xml'))
+
+# VulkanObject shared by the table generator tests, which only read it
+@pytest.fixture(scope='module')
+def vk():
+    return BuildVulkanObject(tables_xml_path, 'vulkan')
+
+def runTableGenerators(tmp_path, vk, generators):
+    """Run (generator, filename) pairs on vk, returning the contents of each file."""
+    results = RunGenerators(generators, tables_xml_path, str(tmp_path), 'vulkan', processes = 1, vk = vk)
+    assert [result.error for result in results] == [None] * len(generators)
+    return [(tmp_path / filename).read_text(encoding='utf-8') for (_, filename) in generators]
+
+# The perfect hash finds every enumerant name, and only those names
+def testEnumStringTables(tmp_path, vk):
+    from enumstringgenerator import EnumStringGenerator, buildRanges
+    from lookuptables import buildPerfectHash, stringHash
+
+    def lookup(displacements, slots, name):
+        displacement = displacements[stringHash(0, name) % len(slots)]
+        if displacement < 0:
+            return slots[-displacement - 1]
+        return slots[stringHash(displacement, name) % len(slots)]
+
+    for names in ([n for f in vk.enums['VkStructureType'].fields for n in [f.name, *f.aliases]],
+                  [f.name for f in vk.enums['VkCommandBufferLevel'].fields],
+                  [f.name for f in vk.bitmasks['VkAccessFlagBits2'].flags]):
+        (displacements, slots) = buildPerfectHash(names)
+        assert sorted(slots) == sorted(names)
+        assert all(lookup(displacements, slots, name) == name for name in names)
+        assert lookup(displacements, slots, 'VK_NOT_A_NAME') != 'VK_NOT_A_NAME'
+
+    assert buildRanges([-2, -1, 0, 1, 3, 1000000000, 1000000002]) == [(-2, 6, 0), (1000000000, 3, 6)]
+
+    (header,) = runTableGenerators(tmp_path, vk, [(EnumStringGenerator, 'vk_enum_string_tables.h')])
+    assert 'EnumToString_VkResult(VkResult value)' in header
+    assert 'FlagBitFromString_VkAccessFlagBits2(const char *name, VkAccessFlagBits2 *value)' in header
+    assert '#ifdef VK_USE_PLATFORM_WIN32_KHR\n// VkFullScreenExclusiveEXT' in header
+
+# Every struct with an sType is found by its value, and the extends bits
+# match its structextends
+def testStructMetadataTables(tmp_path, vk):
+    from lookuptables import extensionBase, extensionBlockSize
+    from structmetadatagenerator import StructMetadataGenerator, StructMetadataTable
+    table = StructMetadataTable(vk)
+
+    # As GetStructMetadata() and StructCanExtend() in the header
+    def lookup(value):
+        if value < table.coreCount:
+            return table.entries.get(value)
+        if value < extensionBase:
+            return None
+        (block, offset) = divmod(value - extensionBase, extensionBlockSize)
+        if block >= len(table.blockStarts) or offset >= table.blockCounts[block]:
+            return None
+        return table.entries.get(table.blockStarts[block] + offset)
+    def canExtend(ext, base):
+        if base.name not in table.extendsIndex:
+            return False
+        bit = table.extendsIndex[base.name]
+        return (table.extendsBits(ext)[bit // 32] >> (bit % 32)) & 1 == 1
+
+    sTypeValues = {name: field.value for field in vk.enums['VkStructureType'].fields
+                   for name in [field.name, *field.aliases]}
+    structs = [struct for struct in vk.structs.values() if struct.sType is not None]
+    assert len(table.entries) == len(structs)
+    for struct in structs:
+        assert lookup(sTypeValues[struct.sType]) is struct
+    assert lookup(table.coreCount) is None
+    assert lookup(extensionBase + len(table.blockStarts) * extensionBlockSize) is None
+
+    extendable = [vk.structs[name] for name in table.extendable]
+    assert {name for struct in structs for name in struct.extends} == set(table.extendable)
+    for ext in structs:
+        assert all(canExtend(ext, base) == (base.name in ext.extends) for base in extendable)
+
+    (header,) = runTableGenerators(tmp_path, vk, [(StructMetadataGenerator, 'vk_struct_metadata_tables.h')])
+    assert '#ifdef VK_USE_PLATFORM_WIN32_KHR\n    {"VkWin32SurfaceCreateInfoKHR"' in header
+    assert '{0}' not in header
+
+# Every command and alias is found by name at the index of the command
+# it aliases, and the feature bits match the commands each feature provides
+def testDispatchIndexTables(tmp_path, vk):
+    from dispatchindexgenerator import DispatchIndexGenerator, DispatchTable, baseVersion
+    from lookuptables import perfectHashSlot
+    table = DispatchTable(vk)
+
+    # As GetDispatchIndex() and GetDispatchFeature() in the header
+    def lookup(hash, name):
+        (displacements, slots) = hash
+        slot = slots[perfectHashSlot(displacements, name)]
+        return slot if slot == name else None
+    def enabled(feature, level):
+        words = table.featureBits(feature, level)
+        return {table.levelCommands[level][index].name
+                for index in range(len(table.levelCommands[level])) if (words[index // 32] >> (index % 32)) & 1}
+
+    assert table.commandIndex['vkCreateInstance'] == ('global', 0)
+    assert table.commandIndex['vkEnumeratePhysicalDevices'][0] == 'instance'
+    assert table.commandIndex['vkCmdDraw'][0] == 'device'
+    assert table.commandIndex['vkGetPhysicalDeviceFeatures2KHR'] == table.commandIndex['vkGetPhysicalDeviceFeatures2']
+    for command in vk.commands.values():
+        assert lookup(table.commandHash, command.name) == command.name
+        (level, index) = table.commandIndex[command.name]
+        assert level == ('device' if command.device else 'instance' if command.instance and command.params
+                         and command.params[0].type in vk.handles else 'global')
+        assert table.levelCommands[level][index].name == (command.alias or command.name)
+    assert lookup(table.commandHash, 'vkNotACommand') is None
+    assert sum(len(commands) for commands in table.levelCommands.values()) == len(vk.commands) - len(
+        [command for command in vk.commands.values() if command.alias])
+
+    providers = {feature: set() for feature in table.features}
+    for command in vk.commands.values():
+        feature = command.version.name if command.version is not None else baseVersion
+        if not command.extensions:
+            providers[feature].add(command.alias or command.name)
+        for extension in command.extensions:
+            providers[extension].add(command.alias or command.name)
+    for feature in table.features:
+        assert lookup(table.featureHash, feature) == feature
+        assert set().union(*(enabled(feature, level) for level in ('global', 'instance', 'device'))) == providers[feature]
+    assert lookup(table.featureHash, 'VK_KHR_not_an_extension') is None
+
+    (header,) = runTableGenerators(tmp_path, vk, [(DispatchIndexGenerator, 'vk_dispatch_index_tables.h')])
+    assert 'INSTANCE_DISPATCH_vkGetPhysicalDeviceFeatures2KHR = INSTANCE_DISPATCH_vkGetPhysicalDeviceFeatures2,' in header
+    assert '#ifdef VK_USE_PLATFORM_WIN32_KHR\n        {"vkCreateWin32SurfaceKHR", DISPATCH_LEVEL_INSTANCE' in header
+
+def testFormatTables(tmp_path, vk):
+    import json
+    from formattablegenerator import FormatJsonGenerator, FormatTableGenerator
+
+    (header, tableJson) = runTableGenerators(tmp_path, vk, [(FormatTableGenerator, 'vk_format_tables.h'),
+                                                           (FormatJsonGenerator, 'vk_format_tables.json')])
+    assert '{"VK_FORMAT_R8G8B8A8_UNORM", "32-bit", ' in header
+    assert '{0}' not in header and '{VK_FORMAT_UNDEFINED}' not in header
+
+    table = json.loads(tableJson)
+    def lookup(value):
+        if value < table['extensionBase']:
+            return table['formats'][value]
+        (block, offset) = divmod(value - table['extensionBase'], table['extensionBlockSize'])
+        return table['formats'][table['blockStarts'][block] + offset]
+    for field in vk.enums['VkFormat'].fields:
+        assert lookup(field.value)['value'] == field.value
+    format = lookup(vk.enums['VkFormat'].fields[-1].value)
+    assert format['className'] == vk.formats[format['name']].className
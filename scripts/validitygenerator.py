@@ -4,8 +4,13 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import datetime
+import json
+import multiprocessing
+import os
 import re
 from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from functools import reduce
 from pathlib import Path
 
@@ -65,6 +70,20 @@ _WCHAR = "wchar_t"
 _CHAR = "char"
 _CHARACTER_TYPES = {_CHAR, _WCHAR}
 
+# Matches one implicit valid usage statement with its VUID anchor
+_VALID_USAGE_RE = re.compile(r'^\* \[\[(?P<vuid>VUID-[^\]]+)\]\] *(?P<text>.*)$', re.MULTILINE)
+
+# Schema version of validusage.json, see config/vu-to-json/vu_schema.json
+_VALID_USAGE_SCHEMA_VERSION = 3
+
+
+# ValidityOutputGenerator building deferred include files, inherited by
+# worker processes through fork
+_workerGenerator = None
+
+def _makeIncludeArgsChunk(pending):
+    return [_workerGenerator.makeIncludeArgs(kind, name) for (kind, name) in pending]
+
 
 class ValidityOutputGenerator(OutputGenerator):
     """ValidityOutputGenerator - subclass of OutputGenerator.
@@ -95,6 +114,14 @@ class ValidityOutputGenerator(OutputGenerator):
         # Tracks whether we are tracing operations
         self.trace = False
 
+        # In parallel mode, ('cmd' | 'struct', name) for each include file
+        # still to be generated, in generation order. None in serial mode.
+        self.pendingIncludes = None
+
+        # When generating JSON, dictionary of valid usage entries, keyed
+        # by command or structure name
+        self.validUsage = {}
+
     @property
     def null(self):
         """Preferred spelling of NULL.
@@ -170,6 +197,15 @@ class ValidityOutputGenerator(OutputGenerator):
             raise RuntimeError(
                 'Must specify conventions object to generator options')
         self.conventions = genOpts.conventions
+        self.validUsage = {}
+        processes = getattr(genOpts, 'processes', 1)
+        if processes > 1 and 'fork' in multiprocessing.get_all_start_methods():
+            self.pendingIncludes = []
+        else:
+            if processes > 1:
+                self.logMsg('warn', f'Cannot use {processes} processes without fork,',
+                            'generating validity includes serially')
+            self.pendingIncludes = None
         # Vulkan says 'must: be a valid pointer' a lot, OpenXR just says
         # 'must: be a pointer'.
         self.valid_pointer_text = ' '.join(
@@ -177,6 +213,19 @@ class ValidityOutputGenerator(OutputGenerator):
         OutputGenerator.beginFile(self, genOpts)
 
     def endFile(self):
+        if self.pendingIncludes is not None:
+            self.writePendingIncludes()
+
+        if getattr(self.genOpts, 'validUsageJson', False):
+            self.writeValidUsageJson()
+            OutputGenerator.endFile(self)
+            return
+
+        if self.isEmitFiltered():
+            self.logMsg('diag', '# Not generating summary file, only some entities were emitted')
+            OutputGenerator.endFile(self)
+            return
+
         # Write summary of commands affected by conditional rendering for
         # inclusion in that section of the spec.
         # This appears in the 'validity' directory; changing it would
@@ -186,7 +235,7 @@ class ValidityOutputGenerator(OutputGenerator):
 
         self.logMsg('diag', '# Generating summary file:', filename)
 
-        with open(filename, 'w', encoding='utf-8') as fp:
+        with self.openOutput(filename, entities=self.conditionalRenderingCommands) as fp:
             # No need to protect with VK_EXT_conditional_rendering, since
             # this is included from a protected section of the specification
             write('.Commands Affected by Conditional Rendering', file=fp)
@@ -269,6 +318,10 @@ class ValidityOutputGenerator(OutputGenerator):
         errorcodes - List of error codes (joined) or None
         structextends - List of extended structures (not joined, may be [])
         """
+        if getattr(self.genOpts, 'validUsageJson', False):
+            self.addValidUsage(basename, validity)
+            return
+
         # Create subdirectory, if needed
         directory = Path(directory)
         if not directory.is_absolute():
@@ -279,7 +332,7 @@ class ValidityOutputGenerator(OutputGenerator):
         filename = str(directory / f'{basename}{self.file_suffix}')
         self.logMsg('diag', '# Generating include file:', filename)
 
-        with open(filename, 'w', encoding='utf-8') as fp:
+        with self.openOutput(filename, entities=[basename]) as fp:
             write(self.conventions.warning_comment, file=fp)
 
             # Valid Usage
@@ -377,6 +430,60 @@ class ValidityOutputGenerator(OutputGenerator):
                 write('****', file=fp)
                 write('', file=fp)
 
+    def addValidUsage(self, basename, validity):
+        """Record the implicit valid usage statements of a command or
+        structure for writeValidUsageJson().
+
+        basename - name of the command or structure
+        validity - ValidityCollection or its text"""
+        entries = [{'vuid': match.group('vuid'),
+                    'text': match.group('text'),
+                    'page': 'vkspec'}
+                   for match in _VALID_USAGE_RE.finditer(str(validity))]
+        if entries:
+            self.validUsage[basename] = {'core': entries}
+
+    def getApiVersion(self):
+        """Return the 'major.minor.patch' API version of the generated
+        headers, from VK_HEADER_VERSION_COMPLETE and VK_HEADER_VERSION."""
+        def defineText(name):
+            info = self.registry.typedict.get(name)
+            return ''.join(info.elem.itertext()) if info is not None else ''
+
+        version = re.search(r'\(\s*\d+\s*,\s*(\d+)\s*,\s*(\d+)',
+                            defineText(f'{self.conventions.api_prefix}HEADER_VERSION_COMPLETE'))
+        patch = re.search(r'HEADER_VERSION\s+(\d+)',
+                          defineText(f'{self.conventions.api_prefix}HEADER_VERSION'))
+        if version is None or patch is None:
+            return ''
+        return f'{version.group(1)}.{version.group(2)}.{patch.group(1)}'
+
+    def writeValidUsageJson(self):
+        """Write the recorded implicit valid usage to the main output file.
+
+        This follows the schema of the validusage.json produced by the
+        vu-to-json asciidoctor extension, except that statement text is
+        AsciiDoc markup as written in the generated includes, rather than
+        HTML."""
+        versionInfo = {
+            'schema version': _VALID_USAGE_SCHEMA_VERSION,
+            'api version': self.getApiVersion(),
+            'comment': 'Implicit valid usage generated from the API registry',
+        }
+
+        # The output only depends on the registry, so it is only dated if
+        # SOURCE_DATE_EPOCH says when, keeping regenerated files identical
+        timestamp = os.environ.get('SOURCE_DATE_EPOCH')
+        if timestamp is not None:
+            date = datetime.datetime.fromtimestamp(int(timestamp), datetime.timezone.utc)
+            versionInfo['date'] = date.strftime('%Y-%m-%d %H:%M:%SZ')
+
+        validUsage = {
+            'version info': versionInfo,
+            'validation': self.validUsage,
+        }
+        write(json.dumps(validUsage, indent=2), file=self.outFile)
+
     def paramIsStaticArray(self, param):
         """Check if the parameter passed in is a static array."""
         tail = param.find('name').tail
@@ -396,23 +503,22 @@ class ValidityOutputGenerator(OutputGenerator):
 
     def getHandleDispatchableAncestors(self, typename):
         """Get the ancestors of a handle object."""
-        ancestors = []
-        current = typename
-        while True:
-            current = self.getHandleParent(current)
-            if current is None:
-                return ancestors
-            if self.isHandleTypeDispatchable(current):
-                ancestors.append(current)
+        return [ancestor for ancestor in self.iterateHandleAncestors(typename)
+                if self.isHandleTypeDispatchable(ancestor)]
+
+    def clearRegistryCaches(self):
+        OutputGenerator.clearRegistryCaches(self)
+        self.handleDispatchableCache = {}
 
     def isHandleTypeDispatchable(self, handlename):
         """Check if a parent object is dispatchable or not."""
-        handle = self.registry.tree.find(
-            f"types/type/[name='{handlename}'][@category='handle']")
-        if handle is not None and getElemType(handle) == 'VK_DEFINE_HANDLE':
-            return True
-        else:
-            return False
+        dispatchable = self.handleDispatchableCache.get(handlename)
+        if dispatchable is None:
+            handle = self.registry.tree.find(
+                f"types/type/[name='{handlename}'][@category='handle']")
+            dispatchable = handle is not None and getElemType(handle) == 'VK_DEFINE_HANDLE'
+            self.handleDispatchableCache[handlename] = dispatchable
+        return dispatchable
 
     def isHandleOptional(self, param, params):
         # Simple, if it is optional, return true
@@ -444,7 +550,7 @@ class ValidityOutputGenerator(OutputGenerator):
         param_name = getElemName(param)
         paramtype = getElemType(param)
         type_category = self.getTypeCategory(paramtype)
-        is_optional = param.get('optional').split(',')[0] == 'true'
+        is_optional = parse_optional_from_param(param)[0]
         if type_category != 'bitmask' and is_optional:
             if self.paramIsArray(param) or self.paramIsPointer(param):
                 optional_val = self.null
@@ -1639,10 +1745,66 @@ endif::VK_KHR_internally_synchronized_queues[]"""
 
         return lines
 
+    def writePendingIncludes(self):
+        """Build the include files deferred in parallel mode.
+
+        Registry tagging is complete by the time this is called, so the
+        validity text for each command and structure is computed
+        independently in worker processes. The files are then written
+        here in the original order, so the output (including the
+        conditional rendering summary) is identical to serial mode."""
+        global _workerGenerator
+
+        pending = self.pendingIncludes
+        self.pendingIncludes = None
+
+        # Do not fork while include files are being written by threads
+        if self.fileWriter is not None:
+            self.fileWriter.flush()
+
+        processes = self.genOpts.processes
+        chunks = [pending[i::processes * 4] for i in range(processes * 4)]
+        _workerGenerator = self
+        try:
+            with ProcessPoolExecutor(max_workers=processes,
+                                     mp_context=multiprocessing.get_context('fork')) as executor:
+                results = list(executor.map(_makeIncludeArgsChunk, chunks))
+        finally:
+            _workerGenerator = None
+
+        # Undo the striping of pending into chunks
+        includeArgs = [None] * len(pending)
+        for (start, chunkResults) in enumerate(results):
+            includeArgs[start::processes * 4] = chunkResults
+        for (args, kwargs) in includeArgs:
+            self.writeInclude(*args, **kwargs)
+
+    def makeIncludeArgs(self, kind, name):
+        """Return (args, kwargs) for writeInclude() for a deferred command
+        or structure, with validity collections converted to text so they
+        can be returned from a worker process."""
+        if kind == 'cmd':
+            (args, kwargs) = self.makeCmdIncludeArgs(self.registry.cmddict[name], name)
+        else:
+            (args, kwargs) = self.makeStructIncludeArgs(self.registry.typedict[name], name)
+        (directory, basename, validity, threadsafety) = args[0:4]
+        args = (directory, basename,
+                str(validity) if validity else '',
+                str(threadsafety) if threadsafety else '') + args[4:]
+        return (args, kwargs)
+
     def genCmd(self, cmdinfo, name, alias):
         """Command generation."""
         OutputGenerator.genCmd(self, cmdinfo, name, alias)
 
+        if self.pendingIncludes is not None:
+            self.pendingIncludes.append(('cmd', name))
+        else:
+            (args, kwargs) = self.makeCmdIncludeArgs(cmdinfo, name)
+            self.writeInclude(*args, **kwargs)
+
+    def makeCmdIncludeArgs(self, cmdinfo, name):
+        """Return (args, kwargs) for writeInclude() for a command."""
         # @@@ (Jon) something needs to be done here to handle aliases, probably
 
         validity = self.makeValidityCollection(name)
@@ -1666,17 +1828,25 @@ endif::VK_KHR_internally_synchronized_queues[]"""
         # OpenXR-specific
         # self.generateStateValidity(validity, name)
 
-        self.writeInclude('protos', name, validity,
-                          threadsafety,
-                          commandpropertiesentry,
-                          conditionalrendering,
-                          successcodes,
-                          errorcodes)
+        return (('protos', name, validity,
+                 threadsafety,
+                 commandpropertiesentry,
+                 conditionalrendering,
+                 successcodes,
+                 errorcodes), {})
 
     def genStruct(self, typeinfo, typeName, alias):
         """Struct Generation."""
         OutputGenerator.genStruct(self, typeinfo, typeName, alias)
 
+        if self.pendingIncludes is not None:
+            self.pendingIncludes.append(('struct', typeName))
+        else:
+            (args, kwargs) = self.makeStructIncludeArgs(typeinfo, typeName)
+            self.writeInclude(*args, **kwargs)
+
+    def makeStructIncludeArgs(self, typeinfo, typeName):
+        """Return (args, kwargs) for writeInclude() for a structure."""
         # @@@ (Jon) something needs to be done here to handle aliases, probably
 
         # Anything that is only ever returned cannot be set by the user, so
@@ -1701,13 +1871,12 @@ endif::VK_KHR_internally_synchronized_queues[]"""
         # Structures extended by this structure
         structextends = self.makeStructExtendsList(typeinfo.elem)
 
-        self.writeInclude('structs', typeName, validity,
-                          threadsafety,
-                          commandpropertiesentry = None,
-                          conditionalrendering = None,
-                          successcodes = None,
-                          errorcodes = None,
-                          structextends = structextends)
+        return (('structs', typeName, validity, threadsafety),
+                dict(commandpropertiesentry = None,
+                     conditionalrendering = None,
+                     successcodes = None,
+                     errorcodes = None,
+                     structextends = structextends))
 
     def genGroup(self, groupinfo, groupName, alias):
         """Group (e.g. C "enum" type) generation.
@@ -712,3 +712,7 @@ class VulkanObject():
 
     # Video Std header information from the video.xml
     videoStd: (VideoStd | None) = None
+
+    # Stable per-item fingerprints, filled on demand by vulkan_object_diff.fingerprintVulkanObject()
+    # ex) { 'commands' : { 'vkCmdDraw' : '6f1c...' }, 'members' : { 'VkBufferCreateInfo' : { 'size' : '09ab...' } } }
+    fingerprints: dict[str, dict] = field(default_factory=dict, init=False, repr=False, compare=False)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3 -i
+#
+# Copyright 2026 The Khronos Group Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# Structural diff between two VulkanObjects, for example from two registry revisions or two API variants
+#
+# Every item gets a stable fingerprint (a hash of its contents), so the diff is just a comparison of
+# the fingerprints by name. Downstream generators can use the result to only regenerate the outputs
+# whose inputs changed.
+
+import hashlib
+from dataclasses import dataclass, fields, is_dataclass
+from enum import Enum as PyEnum
+from vulkan_object import (VulkanObject, Extension, Version, Handle, Command, Struct, Enum, Bitmask, Flags)
+
+# Items that are only referenced by name when they appear inside another item, so that changing
+# a command does not also change every extension that enables it
+_referenceTypes = (Extension, Version, Handle, Command, Struct, Enum, Bitmask, Flags)
+
+# Name of the VulkanObject dict for each category in the diff
+_categories = ('commands', 'structs', 'enums', 'bitmasks', 'flags', 'handles', 'formats', 'extensions')
+
+# Field names to compare for each dataclass type
+_fieldNames: dict[type, tuple[str, ...]] = dict()
+
+_scalarTypes = frozenset((str, int, float, bool, type(None)))
+
+def _canonical(value, memo: dict):
+    valueType = type(value)
+    if valueType in _scalarTypes:
+        return value
+    if valueType is list or valueType is tuple:
+        return tuple(_canonical(x, memo) for x in value)
+    if is_dataclass(value):
+        # Nested items are represented by their own fingerprint, which also lets structs reuse
+        # the fingerprints of their members
+        if isinstance(value, _referenceTypes):
+            return f'{type(value).__name__}:{value.name}'
+        return _fingerprint(value, memo)
+    if isinstance(value, dict):
+        return tuple((key, _canonical(x, memo)) for key, x in value.items())
+    if isinstance(value, PyEnum):
+        return str(value)
+    return value
+
+def _fingerprint(item, memo: dict) -> str:
+    result = memo.get(id(item))
+    if result is None:
+        itemType = type(item)
+        names = _fieldNames.get(itemType)
+        if names is None:
+            names = tuple(x.name for x in fields(item) if x.compare)
+            _fieldNames[itemType] = names
+        canonical = (itemType.__name__,) + tuple((x, _canonical(getattr(item, x), memo)) for x in names)
+        result = hashlib.blake2b(repr(canonical).encode('utf-8'), digest_size = 16).hexdigest()
+        memo[id(item)] = result
+    return result
+
+def fingerprint(item) -> str:
+    """Return a fingerprint of an item of the VulkanObject (Command, Struct, Member, ...)
+    that stays the same between runs as long as the item does not change"""
+    return _fingerprint(item, dict())
+
+def fingerprintVulkanObject(vk: VulkanObject) -> dict[str, dict]:
+    """Fill in vk.fingerprints if needed and return it.
+
+    The fingerprints are only computed once, so this needs to be called after the VulkanObject
+    is complete and not modified afterwards."""
+    if not vk.fingerprints:
+        # Shared between all items so nested items are only hashed once
+        memo = dict()
+        for category in _categories:
+            vk.fingerprints[category] = {name : _fingerprint(item, memo) for name, item in getattr(vk, category).items()}
+        vk.fingerprints['members'] = {x.name : {m.name : _fingerprint(m, memo) for m in x.members} for x in vk.structs.values()}
+        vk.fingerprints['enumFields'] = {x.name : {f.name : _fingerprint(f, memo) for f in x.fields} for x in vk.enums.values()}
+        vk.fingerprints['flagBits'] = {x.name : {f.name : _fingerprint(f, memo) for f in x.flags} for x in vk.bitmasks.values()}
+    return vk.fingerprints
+
+@dataclass(frozen=True)
+class ItemDiff:
+    """Names of the items only in the new object, only in the old one, and in both but different.
+    Each is sorted by name."""
+    added: tuple[str, ...] = ()
+    removed: tuple[str, ...] = ()
+    changed: tuple[str, ...] = ()
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+def _diffFingerprints(old: dict[str, str], new: dict[str, str]) -> ItemDiff:
+    added = tuple(sorted(x for x in new if x not in old))
+    removed = tuple(sorted(x for x in old if x not in new))
+    changed = tuple(sorted(x for x, value in new.items() if x in old and old[x] != value))
+    return ItemDiff(added, removed, changed)
+
+@dataclass(frozen=True)
+class VulkanObjectDiff:
+    commands:   ItemDiff = ItemDiff()
+    structs:    ItemDiff = ItemDiff()
+    enums:      ItemDiff = ItemDiff()
+    bitmasks:   ItemDiff = ItemDiff()
+    flags:      ItemDiff = ItemDiff()
+    handles:    ItemDiff = ItemDiff()
+    formats:    ItemDiff = ItemDiff()
+    extensions: ItemDiff = ItemDiff()
+
+    # Only for items that are in both objects
+    # ex) (('VkBufferCreateInfo', ItemDiff(added=('newMember',))),)
+    members:    tuple[tuple[str, ItemDiff], ...] = ()
+    enumFields: tuple[tuple[str, ItemDiff], ...] = ()
+    flagBits:   tuple[tuple[str, ItemDiff], ...] = ()
+
+    def __bool__(self) -> bool:
+        return any(bool(getattr(self, x.name)) for x in fields(self))
+
+def diffVulkanObjects(old: VulkanObject, new: VulkanObject) -> VulkanObjectDiff:
+    """Return what changed going from old to new"""
+    oldPrints = fingerprintVulkanObject(old)
+    newPrints = fingerprintVulkanObject(new)
+
+    diffs = {x : _diffFingerprints(oldPrints[x], newPrints[x]) for x in _categories}
+    for (category, parent) in (('members', 'structs'), ('enumFields', 'enums'), ('flagBits', 'bitmasks')):
+        itemDiffs = [(x, _diffFingerprints(oldPrints[category][x], newPrints[category][x])) for x in diffs[parent].changed]
+        diffs[category] = tuple((x, itemDiff) for x, itemDiff in itemDiffs if itemDiff)
+    return VulkanObjectDiff(**diffs)